@@ -0,0 +1 @@
+"""Shared tooling for the FlappyPi variants (replays, simulation, profiling)."""
@@ -0,0 +1,290 @@
+"""Allocations per frame by call site, from ``tracemalloc``.
+
+A tracemalloc snapshot only holds blocks that are still alive, and most of
+what a frame allocates is gone a statement later: the tuples
+``move_pipes`` rebuilds, the Rects a collision check makes, the score
+string. So while a variant runs, a trace and a profile function see every
+line it runs and every C call it makes, and at each of those points the
+blocks allocated since the last one are read out of a snapshot and the
+traces cleared. A block counts once, at the innermost line of the variant
+or of a ``flappybench`` helper it calls, if it lives to the next line or
+call boundary. Objects served from CPython's free lists (small tuples,
+floats) never reach the allocator and aren't counted.
+
+The hooks are installed with ``PyEval_SetTrace``/``PyEval_SetProfile``
+through ctypes rather than ``sys.settrace``: the Python-level trampolines
+build and grow a locals dict for every traced frame, which would show up
+as allocations on the game's lines. What tracing still allocates on the
+game's behalf is left out: the int ctypes makes for each event's argument,
+the temporary bound method CPython makes to report a C method call, and
+the frame object built at a function's first event (on its ``def`` line).
+
+The autopilot plays each variant on the soak test's virtual clock; frames
+before ``--warmup`` (sprite caches, fonts) are left out. The report ranks
+call sites by blocks allocated per frame:
+
+    python -m flappybench.allocs [variant ...] --frames 600 --top 10
+    python -m flappybench.allocs all --budgets tests/allocations.json --update
+
+``--budgets`` compares each variant's blocks and bytes per frame against a
+JSON file, and ``--update`` writes them; ``tests/test_allocations.py``
+holds the variants to those budgets. Tracing slows a variant down by a few
+times, so this is a profiling mode, not something to leave on.
+"""
+
+import argparse
+import ctypes
+import json
+import linecache
+import os
+import random
+import sys
+import tracemalloc
+import types
+from collections import Counter
+
+from . import probe
+from .autopilot import Autopilot
+from .harness import ROOT, Harness
+from .soak import VirtualClock, accelerated
+from .variants import VARIANTS
+
+PACKAGE = os.path.dirname(os.path.abspath(__file__))
+# Our own tooling; what it allocates isn't the game's
+TOOLS = {"allocs.py", "autopilot.py", "harness.py", "hotpaths.py", "pacing.py", "probe.py", "soak.py"}
+WARMUP = 30
+RESTART_AFTER = 45
+NFRAME = 8  # traceback depth, to find the game's line under library code
+SLACK = 1.25  # budgets allow this much growth, plus SLACK_BLOCKS
+SLACK_BLOCKS = 2
+
+# PyTrace_* event numbers
+CALL, LINE, C_CALL = 0, 2, 4
+_Hook = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.py_object, ctypes.py_object, ctypes.c_int, ctypes.c_void_p)
+_set_trace, _set_profile = ctypes.pythonapi.PyEval_SetTrace, ctypes.pythonapi.PyEval_SetProfile
+_set_trace.argtypes = _set_profile.argtypes = [_Hook, ctypes.py_object]
+_set_trace.restype = _set_profile.restype = None
+_NO_HOOK = ctypes.cast(None, _Hook)
+
+
+def _traced_files(name):
+    """The files whose lines count: the variant and the helpers it uses."""
+    files = {os.path.join(ROOT, name, "main.py")}
+    for entry in os.listdir(PACKAGE):
+        if entry.endswith(".py") and entry not in TOOLS:
+            files.add(os.path.join(PACKAGE, entry))
+    return files
+
+
+class AllocationProfile:
+    """Counts a harnessed variant's allocations per frame, by file and line."""
+
+    def __init__(self, harness, warmup=WARMUP):
+        self.harness = harness
+        self.warmup = warmup
+        self.files = _traced_files(harness.name)
+        self.tools = {os.path.join(PACKAGE, t) for t in TOOLS}
+        self.blocks = Counter()  # (file, line) -> blocks, over the counted frames
+        self.bytes = Counter()
+        self.frames = []  # (blocks, bytes) per counted frame
+        self._blocks = Counter()  # the current frame's
+        self._bytes = Counter()
+        self._hook = _Hook(self._event)
+        harness.frame_hooks.append(self.on_frame)
+
+    # --- Tracing ---
+    def _site(self, frames):
+        for where in frames:  # innermost first
+            if where[0] in self.tools:
+                return None
+            if where[0] in self.files:
+                return where
+        return None
+
+    def _flush(self, skips=(), skip_line=None):
+        """Counts the blocks allocated since the last flush, less ``skips`` ((file, line, size), once each)."""
+        skips = list(skips)
+        # The raw (domain, size, frames, nframe) tuples take_snapshot() wraps;
+        # building a Snapshot's Trace and Frame objects costs far more than
+        # reading them, at some hundreds of flushes a frame
+        for _, size, frames, _ in tracemalloc._get_traces():
+            site = self._site(frames)
+            if site is None or site == skip_line:
+                continue
+            if site + (size,) in skips:
+                skips.remove(site + (size,))
+                continue
+            self._blocks[site] += 1
+            self._bytes[site] += size
+        tracemalloc.clear_traces()  # also drops whatever counting allocated
+
+    def _event(self, profile, frame, what, arg):
+        code = frame.f_code
+        if code.co_filename not in self.files:
+            return 0
+        if what != C_CALL and what != CALL and tracemalloc.get_traced_memory()[0] <= sys.getsizeof(arg):
+            tracemalloc.clear_traces()  # nothing new but the event's own argument
+            return 0
+        here = code.co_filename, frame.f_lineno
+        skips = [here + (sys.getsizeof(arg),)] if arg is not None else []
+        if what == C_CALL:
+            func = ctypes.cast(arg, ctypes.py_object).value
+            if type(func) is types.BuiltinMethodType and not isinstance(func.__self__, (types.ModuleType, type)):
+                skips.append(here + (sys.getsizeof(func),))
+            del func
+        self._flush(skips, (code.co_filename, code.co_firstlineno) if what == CALL else None)
+        return 0
+
+    def on_frame(self, frame):
+        self._flush()
+        if frame.index >= self.warmup:
+            self.blocks.update(self._blocks)
+            self.bytes.update(self._bytes)
+            self.frames.append((sum(self._blocks.values()), sum(self._bytes.values())))
+        self._blocks.clear()
+        self._bytes.clear()
+        tracemalloc.clear_traces()
+
+    def run(self):
+        tracemalloc.start(NFRAME)
+        _set_trace(self._hook, self)
+        _set_profile(self._hook, self)
+        try:
+            self.harness.run()
+        finally:
+            _set_profile(_NO_HOOK, None)
+            _set_trace(_NO_HOOK, None)
+            tracemalloc.stop()
+
+    # --- Results ---
+    def per_frame(self):
+        """Mean (blocks, bytes) allocated per counted frame."""
+        n = len(self.frames) or 1
+        return sum(b for b, _ in self.frames) / n, sum(s for _, s in self.frames) / n
+
+    def hotspots(self, top=10):
+        """[(blocks per frame, bytes per frame, file, line)] for the busiest sites."""
+        n = len(self.frames) or 1
+        return [(count / n, self.bytes[site] / n) + site for site, count in self.blocks.most_common(top)]
+
+
+def profile(name, frames=600, warmup=WARMUP, seed=0):
+    """Plays ``name`` with the autopilot for ``frames`` frames under an AllocationProfile."""
+    variant = VARIANTS[name]
+    harness = Harness(name)
+    allocs = AllocationProfile(harness, warmup)
+    pilot = Autopilot(variant)
+    half = variant.hitboxes["square"][3] / 2
+    waited = [0]
+
+    def on_frame(frame):
+        state = frame.state
+        if state is not None:
+            if state.playing:
+                waited[0] = 0
+                ahead = state.ahead(1)
+                gap = ahead[0][1:] if ahead else (None, None)
+                if pilot.decide(state.y, state.vel, half, *gap):
+                    harness.press()
+            else:
+                waited[0] += 1
+                if waited[0] >= RESTART_AFTER:
+                    harness.press()
+                    waited[0] = 0
+        if frame.index == 0:
+            harness.press()  # o1 and gemini-2.5 wait for SPACE
+        if frame.index >= warmup + frames and not harness.stopping:
+            harness.stop()
+
+    harness.frame_hooks.append(on_frame)
+    random.seed(seed)
+    with accelerated(VirtualClock()):
+        allocs.run()
+    return allocs
+
+
+# --- Reporting ---
+def site_label(filename, lineno):
+    where = os.path.relpath(filename, ROOT)
+    line = linecache.getline(filename, lineno).strip()
+    return f"{where}:{lineno}  {line[:70]}"
+
+
+def report(name, allocs, top=10):
+    blocks, size = allocs.per_frame()
+    print(f"{name}: {len(allocs.frames)} frames, {blocks:.1f} blocks / {size / 1024:.2f} KB allocated per frame")
+    print("  rank  blocks/frame  bytes/frame  site")
+    for rank, (count, nbytes, filename, lineno) in enumerate(allocs.hotspots(top), 1):
+        print(f"  {rank:4d}  {count:12.2f}  {nbytes:11.0f}  {site_label(filename, lineno)}")
+
+
+def budget(allocs, top=5):
+    """What a budget file keeps for one variant."""
+    blocks, size = allocs.per_frame()
+    return {"blocks": round(blocks, 2), "bytes": round(size), "frames": len(allocs.frames),
+            "hotspots": [f"{os.path.relpath(f, ROOT)}:{line} {count:.2f}"
+                         for count, _, f, line in allocs.hotspots(top)]}
+
+
+def over_budget(allocs, limits):
+    """Lines describing how ``allocs`` exceeds ``limits``; empty when within budget."""
+    blocks, size = allocs.per_frame()
+    problems = []
+    if blocks > limits["blocks"] * SLACK + SLACK_BLOCKS:
+        problems.append(f"{blocks:.1f} blocks per frame against a budget of {limits['blocks']:.1f}")
+    if size > limits["bytes"] * SLACK + 256:
+        problems.append(f"{size:.0f} bytes per frame against a budget of {limits['bytes']}")
+    return problems
+
+
+def load(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path, budgets):
+    with open(path, "w") as f:
+        json.dump(budgets, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", default=["all"], help="variant names, or all")
+    parser.add_argument("--frames", type=int, default=600, help="frames to count after the warmup")
+    parser.add_argument("--warmup", type=int, default=WARMUP, help="frames to leave out at the start")
+    parser.add_argument("--top", type=int, default=10, help="call sites to list per variant")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budgets", help="JSON file of per-frame budgets to check against")
+    parser.add_argument("--update", action="store_true", help="write the results to --budgets")
+    args = parser.parse_args()
+    names = list(probe.PROBES) if args.variants == ["all"] else args.variants
+    for name in names:
+        if name not in probe.PROBES:
+            parser.error(f"unknown variant {name!r}, pick from: {', '.join(probe.PROBES)}")
+    if args.update and not args.budgets:
+        parser.error("--update needs --budgets")
+    budgets = load(args.budgets) if args.budgets else {}
+    over = 0
+    for name in names:
+        allocs = profile(name, args.frames, args.warmup, args.seed)
+        report(name, allocs, args.top)
+        if args.update:
+            budgets[name] = budget(allocs)
+        elif name in budgets:
+            problems = over_budget(allocs, budgets[name])
+            over += bool(problems)
+            for line in problems or ["within budget"]:
+                print(f"  BUDGET {line}")
+        print()
+    if args.update:
+        save(args.budgets, budgets)
+        print(f"wrote {args.budgets}")
+    if over and not args.update:
+        raise SystemExit(f"{over} variant(s) over their allocation budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Autopilot for demo screens and assisted play.
+
+Flap arcs are deterministic, so for every velocity on the variant's
+velocity lattice two numbers are worked out once: how much further the bird
+sinks if it starts flapping every frame now (``sink``), and how much further
+it rises if it stops flapping now (``rise``). A decision is then a couple of
+table lookups against the next gap: flap when waiting one more frame would
+carry the bird's lowest point past the gap floor.
+
+Tables are filled a slice at a time inside the per-frame budget, and until a
+row is ready the autopilot falls back to a plain threshold rule. Every
+decision is timed so the game can show what the autopilot costs.
+"""
+
+import math
+import time
+
+
+class Autopilot:
+    def __init__(self, variant, margin=10, budget_ms=1.0):
+        v = variant
+        self.variant = v
+        self.margin = margin
+        self.budget = budget_ms / 1000
+        g = v.gravity
+        k = 1
+        while k < 100 and abs(v.flap / (g / k) - round(v.flap / (g / k))) > 1e-6:
+            k += 1
+        self.dv = g / k
+        lo = v.max_up if v.flap_mode == "clamp" else min(v.flap, 0)
+        self.v0 = lo
+        self.size = int(math.ceil((math.sqrt(2 * g * v.height) + g - lo) / self.dv)) + 1
+        self.sink = [None] * self.size
+        self.rise = [None] * self.size
+        self.built = 0
+        self.row_cost = 0.0
+        # Cost accounting, in seconds
+        self.last = 0.0
+        self.worst = 0.0
+        self.total = 0.0
+        self.decisions = 0
+        self.over_budget = 0
+
+    @property
+    def ready(self):
+        return self.built == self.size
+
+    @property
+    def mean_ms(self):
+        return self.total / self.decisions * 1000 if self.decisions else 0.0
+
+    def stats(self):
+        return (f"autopilot {self.mean_ms:.3f} ms/frame mean, {self.worst * 1000:.3f} worst,"
+                f" budget {self.budget * 1000:.1f}, {self.over_budget} over")
+
+    # --- Tables ---
+    def _flapped(self, vel):
+        v = self.variant
+        if v.flap_mode == "set":
+            return v.flap
+        vel += v.flap
+        return max(vel, v.max_up) if v.flap_mode == "clamp" else vel
+
+    def _arcs(self, vel):
+        """(sink, rise) in px from ``vel``, the velocity entering the next frame."""
+        g = self.variant.gravity
+        sink = y = 0.0
+        u = vel
+        for _ in range(1000):
+            u = self._flapped(u) + g
+            if u >= 0:
+                y += u
+                sink = max(sink, y)
+            else:
+                break
+        rise = y = 0.0
+        u = vel
+        while u + g < 0:
+            u += g
+            y += u
+            rise = max(rise, -y)
+        return sink, rise
+
+    def build(self, deadline):
+        """Fills table rows until ``deadline`` (perf_counter seconds)."""
+        now = time.perf_counter()
+        while self.built < self.size and now + self.row_cost < deadline:
+            i = self.built
+            self.sink[i], self.rise[i] = self._arcs(self.v0 + i * self.dv)
+            self.built += 1
+            done = time.perf_counter()
+            self.row_cost = max(self.row_cost, done - now)
+            now = done
+
+    def _row(self, vel):
+        i = int(round((vel - self.v0) / self.dv))
+        return min(max(i, 0), self.size - 1)
+
+    # --- Decisions ---
+    def decide(self, y, velocity, half, gap_top=None, gap_bottom=None):
+        """Whether to flap this frame; ``half`` is half the bird's hitbox height.
+
+        Without a gap ahead the bird holds the middle of the playfield.
+        """
+        start = time.perf_counter()
+        v = self.variant
+        if gap_bottom is None:
+            gap_top = gap_bottom = v.land_y // 2
+            gap_top -= 2 * half + self.margin
+            gap_bottom += 2 * half + self.margin
+        nxt = velocity + v.gravity
+        floor = gap_bottom - self.margin
+        i = self._row(nxt)
+        if i < self.built:
+            # Lowest the bird gets if it waits a frame and then flaps hard
+            flap = y + nxt + self.sink[i] + half > floor
+            if flap:
+                # Don't flap into the top pipe unless the floor is closer
+                after = self._flapped(velocity) + v.gravity
+                j = self._row(after)
+                if j < self.built:
+                    peak = y + after - self.rise[j] - half
+                    flap = peak > gap_top + self.margin or y + nxt + half > floor
+        else:
+            flap = y + nxt + half > floor
+        self.build(start + self.budget)
+
+        elapsed = time.perf_counter() - start
+        self.last = elapsed
+        self.worst = max(self.worst, elapsed)
+        self.total += elapsed
+        self.decisions += 1
+        if elapsed > self.budget:
+            self.over_budget += 1
+        return flap
@@ -0,0 +1,48 @@
+"""Content-addressed on-disk cache for batch results.
+
+Entries are JSON files named by the SHA-256 of everything that went into
+them, so changing a parameter changes the key and old results stay valid
+for the inputs that produced them. Set ``FLAPPYBENCH_CACHE`` to move it.
+"""
+
+import hashlib
+import json
+import os
+
+CACHE_DIR = os.environ.get(
+    "FLAPPYBENCH_CACHE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+
+# Bump when the simulation changes in a way that invalidates old results
+SIM_VERSION = 1
+
+
+def digest(obj):
+    blob = json.dumps([SIM_VERSION, obj], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class Cache:
+    """One namespace of cached results, e.g. ``Cache("difficulty")``."""
+
+    def __init__(self, namespace, root=None):
+        self.dir = os.path.join(root or CACHE_DIR, namespace)
+
+    def path(self, key):
+        return os.path.join(self.dir, key[:2], key + ".json")
+
+    def load(self, key, default=None):
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return default
+
+    def save(self, key, value):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
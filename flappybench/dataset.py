@@ -0,0 +1,186 @@
+"""Per-frame training data in chunked columnar shards.
+
+A dataset is a directory of ``shard-NNNNN.npz`` files, one uncompressed
+array per column and ``chunk`` rows per shard, plus ``meta.json``. The game
+loop only copies a row into preallocated column buffers; full buffers go to
+a writer thread through a bounded queue. When the disk falls behind, the
+queue fills and ``append`` waits for room rather than dropping frames; the
+time spent waiting is reported as ``stalled``.
+
+Shards are stored uncompressed so ``Dataset`` can memory-map every column
+straight out of the zip file, which makes random access over millions of
+frames cheap without loading them.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+import zipfile
+
+import numpy as np
+
+COLUMNS = (
+    ("episode", "<i4"),
+    ("frame", "<i4"),  # frame within the episode
+    ("y", "<f4"),
+    ("vel", "<f4"),
+    ("pipe1_x", "<f4"),  # next two pipes not yet cleared; NaN if there isn't one
+    ("pipe1_top", "<f4"),
+    ("pipe1_bottom", "<f4"),
+    ("pipe2_x", "<f4"),
+    ("pipe2_top", "<f4"),
+    ("pipe2_bottom", "<f4"),
+    ("action", "u1"),  # 1 if SPACE was pressed in this state
+    ("score", "<i4"),
+    ("done", "u1"),  # 1 if the bird died after this action
+)
+NAMES = [name for name, _ in COLUMNS]
+
+
+class Recorder:
+    """Appends rows and writes shards from a background thread."""
+
+    def __init__(self, out, meta=None, chunk=4096, queue_size=8):
+        os.makedirs(out, exist_ok=True)
+        self.out = out
+        self.meta = dict(meta or {})
+        self.chunk = chunk
+        self.rows = 0
+        self.shards = []  # (file, rows), in order
+        self.stalled = 0.0  # seconds append() waited on a full queue
+        self.error = None
+        self._queue = queue.Queue(queue_size)
+        self._fresh()
+        self._writer = threading.Thread(target=self._write, name="dataset-writer", daemon=True)
+        self._writer.start()
+
+    def _fresh(self):
+        self._cols = [np.empty(self.chunk, dtype) for _, dtype in COLUMNS]
+        self._n = 0
+
+    def append(self, *row):
+        """One frame, with values in ``COLUMNS`` order."""
+        i = self._n
+        for col, value in zip(self._cols, row):
+            col[i] = value
+        self._n = i + 1
+        self.rows += 1
+        if self._n == self.chunk:
+            self._flush()
+
+    def _flush(self):
+        if not self._n:
+            return
+        job = (len(self.shards), [c[:self._n] for c in self._cols])
+        self.shards.append((f"shard-{job[0]:05d}.npz", self._n))
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            start = time.perf_counter()
+            self._queue.put(job)
+            self.stalled += time.perf_counter() - start
+        self._fresh()
+
+    def _write(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            index, cols = job
+            name = os.path.join(self.out, f"shard-{index:05d}")
+            try:
+                np.savez(name + ".tmp.npz", **dict(zip(NAMES, cols)))
+                os.replace(name + ".tmp.npz", name + ".npz")
+            except OSError as e:
+                self.error = e
+
+    def close(self):
+        """Writes the last partial shard and meta.json; waits for the writer."""
+        self._flush()
+        self._queue.put(None)
+        self._writer.join()
+        if self.error:
+            raise self.error
+        meta = dict(self.meta, columns=dict(COLUMNS), rows=self.rows,
+                    shards=[{"file": f, "rows": n} for f, n in self.shards])
+        with open(os.path.join(self.out, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_npz(path):
+    """Memory-maps every array of an uncompressed .npz; returns {name: memmap}."""
+    out = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: {info.filename} is compressed, can't map it")
+            # Skip the local file header to reach the .npy bytes
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(f.read(4), "<u2")
+            f.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if not shape or 0 in shape:
+                out[name] = np.empty(shape, dtype)
+                continue
+            out[name] = np.memmap(path, dtype, "r", f.tell(), shape,
+                                  order="F" if fortran else "C")
+    return out
+
+
+class Dataset:
+    """Read-only view over a recorded directory, or several of them."""
+
+    def __init__(self, *paths):
+        self.meta = []
+        self.shards = []
+        for path in paths:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            self.meta.append(meta)
+            self.shards += [load_npz(os.path.join(path, s["file"])) for s in meta["shards"]]
+        sizes = [len(s["episode"]) for s in self.shards]
+        self.starts = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    def column(self, name):
+        """The whole column as one array (copied out of the shards)."""
+        if not self.shards:
+            return np.empty(0, dict(COLUMNS)[name])
+        return np.concatenate([s[name] for s in self.shards])
+
+    def __getitem__(self, i):
+        """Row ``i`` as a dict."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        k = int(np.searchsorted(self.starts, i, "right")) - 1
+        shard = self.shards[k]
+        return {name: shard[name][i - self.starts[k]].item() for name in NAMES}
+
+    def take(self, rows, names=NAMES):
+        """Columns at arbitrary row indices, e.g. a shuffled minibatch."""
+        rows = np.asarray(rows, np.int64)
+        which = np.searchsorted(self.starts, rows, "right") - 1
+        out = {name: np.empty(len(rows), dict(COLUMNS)[name]) for name in names}
+        for k in np.unique(which):
+            sel = which == k
+            local = rows[sel] - self.starts[k]
+            for name in names:
+                out[name][sel] = self.shards[k][name][local]
+        return out
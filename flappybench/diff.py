@@ -0,0 +1,172 @@
+"""Lockstep differential runs of two variants on one course and input stream.
+
+Both sims are stepped together and their state is hashed every frame; only
+when the hashes differ is the state compared field by field to say what
+diverged and which parameters explain it:
+
+    python -m flappybench.diff gemini-2.5 o3-mini --seed 3
+    python -m flappybench.diff gemini-2.5 gemini-2.5:gravity=0.5
+    python -m flappybench.diff --suite --seeds 50
+"""
+
+import argparse
+import itertools
+import random
+import time
+from collections import Counter
+
+from .sim import Sim
+from .variants import VARIANTS, parse
+
+# Parameters that can explain a difference in each compared field
+CAUSES = {
+    "y": ("bird_y", "height", "gravity", "flap", "flap_mode", "max_up", "ceiling", "land",
+          "land_y", "bird_size"),
+    "vel": ("gravity", "flap", "flap_mode", "max_up", "ceiling", "land", "land_y"),
+    "alive": ("hitboxes", "ceiling", "land", "land_y", "pipe_width", "pipe_gap",
+              "pipe_bottom", "bird_x", "pipes_first"),
+    "over": ("hitboxes", "ceiling", "land", "land_y", "pipe_width", "pipe_gap",
+             "pipe_bottom", "bird_x", "pipes_first", "quirks"),
+    "score": ("score_at", "pipe_width", "bird_x", "best_before_score", "quirks"),
+    "best": ("best_before_score", "quirks"),
+    "pipes": ("spawn", "spawn_every", "spawn_distance", "spawn_x", "initial_pipes",
+              "pipe_speed", "pipe_width", "pipe_gap", "gap_lo", "gap_hi", "width"),
+}
+FIELDS = tuple(CAUSES)
+FLAP_PARAMS = ("flap", "flap_mode", "max_up")
+
+
+def fields(sim):
+    return {
+        "y": sim.y,
+        "vel": sim.vel,
+        "alive": sim.alive,
+        "over": sim.over,
+        "score": sim.score,
+        "best": sim.best,
+        "pipes": tuple((p.x, p.gap_top, p.gap_bottom) for p in sim.pipes),
+    }
+
+
+def fingerprint(sim):
+    """A hash of exactly what ``fields`` compares, without building the dict."""
+    return hash((
+        sim.y, sim.vel, sim.alive, sim.over, sim.score, sim.best,
+        tuple([(p.x, p.gap_top, p.gap_bottom) for p in sim.pipes]),
+    ))
+
+
+def input_stream(seed, rate, frames):
+    rng = random.Random(f"{seed}:input")
+    return [rng.random() < rate for _ in range(frames)]
+
+
+class Divergence:
+    """First differing field; ``frame`` is -1 when the runs differ right after reset."""
+
+    def __init__(self, frame, flapped, field, a, b, reasons):
+        self.frame = frame
+        self.flapped = flapped
+        self.field = field
+        self.a = a
+        self.b = b
+        self.reasons = reasons
+
+    def __str__(self):
+        why = "; ".join(self.reasons) or "no parameter differs"
+        if self.frame < 0:
+            when = "at reset"
+        else:
+            when = f"frame {self.frame} ({'SPACE' if self.flapped else 'no input'})"
+        return f"{when}: {self.field} {self.a!r} vs {self.b!r} <- {why}"
+
+
+def explain(va, vb, field, frame, flapped):
+    params = CAUSES[field]
+    if frame < 0 and field in ("y", "vel"):
+        params = ("bird_y",)
+    elif not flapped:
+        params = [p for p in params if p not in FLAP_PARAMS]
+    reasons = []
+    for param in params:
+        a, b = getattr(va, param), getattr(vb, param)
+        if a != b:
+            if isinstance(a, frozenset):
+                a, b = sorted(a) or "none", sorted(b) or "none"
+            reasons.append(f"{param} {a} vs {b}")
+    return reasons
+
+
+def lockstep(va, vb, seed=0, inputs=(), frames=3600):
+    """Returns the first Divergence, or None if the runs agree throughout."""
+    a = Sim(va, seed)
+    b = Sim(vb, seed)
+    inputs = list(inputs) + [False] * (frames - len(inputs))
+    for frame in range(-1, frames):
+        flapped = frame >= 0 and inputs[frame]
+        if frame >= 0:
+            a.step(flapped)
+            b.step(flapped)
+        if fingerprint(a) == fingerprint(b):
+            continue
+        fa, fb = fields(a), fields(b)
+        for field in FIELDS:
+            if fa[field] != fb[field]:
+                return Divergence(frame, flapped, field, fa[field], fb[field],
+                                  explain(va, vb, field, frame, flapped))
+    return None
+
+
+def suite(names, seeds, rate, frames):
+    start = time.perf_counter()
+    rows = []
+    for x, y in itertools.combinations(names, 2):
+        va, vb = parse(x), parse(y)
+        found = []
+        for seed in range(seeds):
+            d = lockstep(va, vb, seed, input_stream(seed, rate, frames), frames)
+            if d is not None:
+                found.append(d)
+        rows.append((x, y, found))
+    elapsed = time.perf_counter() - start
+    for x, y, found in rows:
+        if not found:
+            print(f"{x} == {y}: identical on all {seeds} seeds")
+            continue
+        first = min(found, key=lambda d: d.frame)
+        fields_hit = Counter(d.field for d in found).most_common(1)[0][0]
+        print(f"{x} != {y}: {len(found)}/{seeds} seeds diverge, mostly on {fields_hit};"
+              f" earliest {first}")
+    print(f"{len(rows)} pairs x {seeds} seeds in {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*",
+                        help="two variants, optionally with overrides like name:gravity=0.5")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--rate", type=float, default=0.06,
+                        help="chance of SPACE on each frame of the input stream")
+    parser.add_argument("--suite", action="store_true",
+                        help="compare every pair of the given variants (default: all)")
+    parser.add_argument("--seeds", type=int, default=20, help="courses per pair with --suite")
+    args = parser.parse_args()
+
+    try:
+        variants = [parse(v) for v in args.variants]
+    except KeyError as e:
+        parser.error(e.args[0])
+    if args.suite:
+        suite(args.variants or list(VARIANTS), args.seeds, args.rate, args.frames)
+        return
+    if len(variants) != 2:
+        parser.error("give exactly two variants, or --suite")
+    va, vb = variants
+    d = lockstep(va, vb, args.seed, input_stream(args.seed, args.rate, args.frames),
+                 args.frames)
+    print(d if d else f"no divergence in {args.frames} frames")
+
+
+if __name__ == "__main__":
+    main()
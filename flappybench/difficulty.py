@@ -0,0 +1,144 @@
+"""Monte Carlo difficulty profile of each variant.
+
+Plays every reference policy against thousands of seeded courses per
+variant on a process pool and reports survival curves, score distributions
+and what killed the bird. Each (variant parameters, policy, frame limit)
+keeps its per-seed results in the on-disk cache, so reruns only play the
+seeds that are new:
+
+    python -m flappybench.difficulty --courses 2000
+    python -m flappybench.difficulty o3-mini gemini-2.5:gravity=0.35 --policy planner
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter
+
+from . import policies
+from .cache import Cache, digest
+from .sim import CAUSES, Sim
+from .variants import VARIANTS, parse
+
+SURVIVED = "survived"
+CHECKPOINTS = (1, 2, 5, 10, 20, 30, 60)  # seconds, for the survival curve
+CHUNK = 50
+
+
+def play(variant, policy, seed, max_frames):
+    """One run of ``policy`` on course ``seed``: (frames alive, score, cause)."""
+    sim = Sim(variant, seed)
+    policy.reset(seed)
+    for _ in range(max_frames):
+        if sim.step(policy(sim)) or not sim.alive:
+            return sim.tick, sim.score, sim.cause
+    return sim.tick, sim.score, SURVIVED
+
+
+def play_chunk(job):
+    variant_spec, policy_spec, max_frames, seeds = job
+    variant = parse(variant_spec)
+    policy = policies.make(policy_spec)
+    return [(seed, *play(variant, policy, seed, max_frames)) for seed in seeds]
+
+
+def profile(pool, variant_spec, policy_spec, courses, max_frames, cache):
+    """Per-seed results for seeds 0..courses-1, playing only uncached ones."""
+    key = digest({
+        "variant": parse(variant_spec).params(),
+        "policy": policy_spec,
+        "max_frames": max_frames,
+    })
+    results = cache.load(key, {})
+    missing = [s for s in range(courses) if str(s) not in results]
+    jobs = [(variant_spec, policy_spec, max_frames, missing[i:i + CHUNK])
+            for i in range(0, len(missing), CHUNK)]
+    for chunk in pool.imap_unordered(play_chunk, jobs):
+        for seed, frames, score, cause in chunk:
+            results[str(seed)] = [frames, score, cause]
+    if missing:
+        cache.save(key, results)
+    return [results[str(s)] for s in range(courses)], len(missing)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def summarize(runs, max_frames, fps=60):
+    frames = [r[0] for r in runs]
+    scores = [r[1] for r in runs]
+    causes = Counter(r[2] for r in runs)
+    n = len(runs)
+    return {
+        "courses": n,
+        "survival": {t: sum(f >= t * fps for f in frames) / n
+                     for t in CHECKPOINTS if t * fps <= max_frames},
+        "score": {
+            "mean": sum(scores) / n,
+            "p50": percentile(scores, 0.5),
+            "p90": percentile(scores, 0.9),
+            "max": max(scores),
+            "histogram": dict(sorted(Counter(scores).items())),
+        },
+        "causes": {c: causes[c] / n for c in CAUSES + (SURVIVED,) if causes[c]},
+    }
+
+
+def print_summary(variant_spec, policy_spec, s):
+    curve = "  ".join(f"{t}s:{p:4.0%}" for t, p in s["survival"].items())
+    sc = s["score"]
+    causes = ", ".join(f"{c} {p:.0%}" for c, p in s["causes"].items())
+    print(f"{variant_spec:24s} {policy_spec:12s} score mean {sc['mean']:6.1f} "
+          f"p50 {sc['p50']:4d} p90 {sc['p90']:4d} max {sc['max']:4d}")
+    print(f"{'':37s} alive  {curve}")
+    print(f"{'':37s} deaths {causes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", help="variants to profile (default: all)")
+    parser.add_argument("--policy", action="append",
+                        help=f"policy spec, repeatable (default: {' '.join(policies.DEFAULT_SPECS)})")
+    parser.add_argument("--courses", type=int, default=1000, help="seeded courses per variant")
+    parser.add_argument("--seconds", type=float, default=60, help="longest run to play")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--json", metavar="PATH", help="also write the summaries here")
+    args = parser.parse_args()
+
+    specs = args.variants or list(VARIANTS)
+    policy_specs = args.policy or list(policies.DEFAULT_SPECS)
+    try:
+        for spec in specs:
+            parse(spec)
+        for spec in policy_specs:
+            policies.make(spec)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    cache = Cache("difficulty")
+    max_frames = int(args.seconds * 60)
+    report = {}
+    start = time.perf_counter()
+    played = 0
+    with multiprocessing.Pool(args.jobs) as pool:
+        for variant_spec in specs:
+            for policy_spec in policy_specs:
+                runs, new = profile(pool, variant_spec, policy_spec, args.courses,
+                                    max_frames, cache)
+                played += new
+                summary = summarize(runs, max_frames)
+                report.setdefault(variant_spec, {})[policy_spec] = summary
+                print_summary(variant_spec, policy_spec, summary)
+    print(f"played {played} new runs ({len(specs) * len(policy_specs) * args.courses - played}"
+          f" cached) in {time.perf_counter() - start:.1f}s")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""A small input layer: a filtered event queue and table dispatch.
+
+The variants drain every event SDL produces (mouse motion, window and text
+events they never look at) and walk a chain of ``if event.type == ...`` for
+each one. ``Input`` blocks every type but the ones it has handlers for, with
+``pygame.event.set_blocked``/``set_allowed``, so unused events are dropped
+before they reach the queue; the rest are dispatched by a dict lookup on the
+type, and on the key for KEYDOWN.
+
+    inputs = Input()
+    inputs.on(pygame.QUIT, quit_game)
+    inputs.on_key(pygame.K_SPACE, flap)
+    inputs.on(PIPE_EVENT, spawn_pipe)
+    inputs.allow()
+    ...
+    inputs.dispatch()  # once a frame
+
+``press()`` and ``quit()`` post real events, so bots and tests drive a game
+through its own queue. The cost under a flood of unwanted events is measured
+against the variants' way with:
+
+    python -m flappybench.events --spam 0,10,100,1000
+"""
+
+import argparse
+import time
+
+import pygame
+
+
+class Input:
+    def __init__(self):
+        self.handlers = {}  # event type -> handler(event)
+        self.keys = {}  # KEYDOWN key -> handler(event)
+        self.handled = 0
+
+    def on(self, type, handler):
+        self.handlers[type] = handler
+
+    def on_key(self, key, handler):
+        self.keys[key] = handler
+        self.handlers.setdefault(pygame.KEYDOWN, self._key)
+
+    def _key(self, event):
+        handler = self.keys.get(event.key)
+        if handler is not None:
+            handler(event)
+
+    def allow(self):
+        """Lets only the handled event types into the queue."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(self.handlers))
+
+    def dispatch(self):
+        """Drains the queue, calling each event's handler; returns the number drained."""
+        events = pygame.event.get()
+        handlers = self.handlers
+        for event in events:
+            handler = handlers.get(event.type)
+            if handler is not None:
+                handler(event)
+        self.handled += len(events)
+        return len(events)
+
+    # --- Synthetic input ---
+    def press(self, key=pygame.K_SPACE):
+        """Posts a key press; False if KEYDOWN isn't allowed."""
+        return pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=""))
+
+    def quit(self):
+        return pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+# --- Benchmark ---
+SPAM = (
+    (pygame.MOUSEMOTION, {"pos": (10, 10), "rel": (1, 0), "buttons": (0, 0, 0)}),
+    (pygame.TEXTINPUT, {"text": "x"}),
+    (pygame.WINDOWMOVED, {"x": 0, "y": 0}),
+    (pygame.KEYUP, {"key": pygame.K_a, "mod": 0}),
+)
+
+
+def spam(n):
+    for i in range(n):
+        kind, attrs = SPAM[i % len(SPAM)]
+        pygame.event.post(pygame.event.Event(kind, attrs))
+
+
+def chain(state, timer):
+    """The variants' way: drain everything, test each event in turn."""
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            state["quit"] += 1
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                state["flaps"] += 1
+            if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
+                state["quit"] += 1
+        if event.type == timer:
+            state["pipes"] += 1
+
+
+def bench(levels, frames):
+    timer = pygame.USEREVENT + 1
+    print(f"{frames} frames per level, 2 SPACE presses and a timer event each frame")
+    for n in levels:
+        results = {}
+        for mode in ("chain", "table"):
+            state = {"quit": 0, "flaps": 0, "pipes": 0}
+            inputs = Input()
+            if mode == "table":
+                inputs.on(pygame.QUIT, lambda e: state.__setitem__("quit", state["quit"] + 1))
+                inputs.on_key(pygame.K_SPACE, lambda e: state.__setitem__("flaps", state["flaps"] + 1))
+                inputs.on(timer, lambda e: state.__setitem__("pipes", state["pipes"] + 1))
+                inputs.allow()
+            else:
+                pygame.event.set_allowed(None)
+            pygame.event.clear()
+            took = 0.0
+            for _ in range(frames):
+                spam(n)  # posting is paid by SDL either way, so it isn't timed
+                inputs.press()
+                inputs.press()
+                pygame.event.post(pygame.event.Event(timer))
+                start = time.perf_counter()
+                if mode == "table":
+                    inputs.dispatch()
+                else:
+                    chain(state, timer)
+                took += time.perf_counter() - start
+            results[mode] = (took * 1e6 / frames, state)
+        pygame.event.set_allowed(None)
+        (c, cs), (t, ts) = results["chain"], results["table"]
+        same = "same handling" if cs == ts else f"DIFFERENT: {cs} vs {ts}"
+        print(f"  {n:5d} unwanted/frame  if-chain {c:8.1f} us  filtered table {t:6.1f} us"
+              f"  {c / t:6.1f}x  ({same})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--spam", default="0,10,100,1000", help="unwanted events posted per frame")
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+    pygame.init()
+    pygame.display.set_mode((100, 100))
+    bench([int(n) for n in args.spam.split(",")], args.frames)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
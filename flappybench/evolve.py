@@ -0,0 +1,282 @@
+"""Evolves small flap policies with CMA-ES.
+
+A policy is a 5-6-1 tanh network over where the bird is relative to the
+next gap; it flaps when the output is positive. Every generation the whole
+population plays the same seeded courses together in one ``VecSim``, so a
+frame of play for all genomes x courses is one vectorized step plus two
+batched matrix products. Fitness is the mean number of frames survived.
+
+    python -m flappybench.evolve o3-mini --generations 50
+    python -m flappybench.evolve o3-mini --generations 100 --resume
+    python -m flappybench.evolve o3-mini --play
+
+Each generation is checkpointed to ``evolve-out/<variant>/``; ``--resume``
+continues from the latest one and ``--play`` lets the best genome so far
+play the real game, pressing SPACE through the game's own flap code.
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from .variants import parse
+from .vecsim import VecSim
+
+INPUTS = 5
+HIDDEN = 6
+GENES = INPUTS * HIDDEN + HIDDEN + HIDDEN + 1
+OUT_DIR = "evolve-out"
+RESTART_AFTER = 45  # frames to wait on a game over screen when playing live
+
+
+# --- Policy ---
+def features(y, vel, dx, gap_top, gap_bottom, land_y):
+    """Network inputs; arrays of any matching shape. NaN gaps mean no pipe ahead."""
+    no_pipe = np.isnan(gap_top)
+    center = np.where(no_pipe, land_y / 2, (gap_top + gap_bottom) / 2)
+    top = np.where(no_pipe, center - 75, gap_top)
+    bottom = np.where(no_pipe, center + 75, gap_bottom)
+    dx = np.where(no_pipe, 400, dx)
+    return np.stack(np.broadcast_arrays(
+        (center - y) / 100,
+        vel / 10,
+        dx / 300,
+        (bottom - y) / 100,
+        (y - top) / 100,
+    ), -1)
+
+
+def unpack(genomes):
+    """Genomes (P, GENES) -> W1 (P, INPUTS, HIDDEN), b1, w2, b2."""
+    p = len(genomes)
+    i = INPUTS * HIDDEN
+    w1 = genomes[:, :i].reshape(p, INPUTS, HIDDEN)
+    b1 = genomes[:, i:i + HIDDEN]
+    w2 = genomes[:, i + HIDDEN:i + 2 * HIDDEN]
+    b2 = genomes[:, -1]
+    return w1, b1, w2, b2
+
+
+def decide(genomes, x):
+    """Flap decisions for inputs ``x`` of shape (P, games, INPUTS)."""
+    w1, b1, w2, b2 = unpack(genomes)
+    h = np.tanh(np.einsum("pgi,pih->pgh", x, w1) + b1[:, None])
+    return np.einsum("pgh,ph->pg", h, w2) + b2[:, None] > 0
+
+
+def evaluate(variant, genomes, seeds, max_frames):
+    """Every genome on every seed at once; returns (frames, score), each (P, S)."""
+    p, s = len(genomes), len(seeds)
+    vs = VecSim(variant, np.tile(seeds, p), max_frames)
+    land_y = variant.land_y
+    for _ in range(max_frames):
+        if not vs.alive.any():
+            break
+        x, top, bottom = vs.next_pipe()
+        inputs = features(vs.y, vs.vel, x - vs.bird_x, top, bottom, land_y)
+        vs.step(decide(genomes, inputs.reshape(p, s, INPUTS)).ravel())
+    return vs.ticks.reshape(p, s), vs.score.reshape(p, s)
+
+
+# --- CMA-ES ---
+class CMAES:
+    """Standard (mu/mu_w, lambda)-CMA-ES maximizing fitness."""
+
+    def __init__(self, n, sigma=0.5, popsize=None, seed=0):
+        self.n = n
+        self.lam = popsize or 4 + int(3 * math.log(n))
+        self.mu = self.lam // 2
+        w = math.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = w / w.sum()
+        self.mueff = 1 / (self.weights ** 2).sum()
+        mueff = self.mueff
+        self.cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        self.cs = (mueff + 2) / (n + mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + mueff)
+        self.cmu = min(1 - self.c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+        self.damps = 1 + 2 * max(0, math.sqrt((mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+        self.rng = np.random.default_rng(seed)
+        self.mean = np.zeros(n)
+        self.sigma = sigma
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.C = np.eye(n)
+        self.generation = 0
+        self._eigen()
+
+    def _eigen(self):
+        self.C = (self.C + self.C.T) / 2
+        d2, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(d2, 1e-20))
+
+    def ask(self):
+        z = self.rng.standard_normal((self.lam, self.n))
+        return self.mean + self.sigma * (z * self.D) @ self.B.T
+
+    def tell(self, x, fitness):
+        n = self.n
+        best = np.argsort(-np.asarray(fitness))[:self.mu]
+        y = (x[best] - self.mean) / self.sigma
+        yw = self.weights @ y
+        self.mean = self.mean + self.sigma * yw
+        inv_sqrt_c = self.B @ np.diag(1 / self.D) @ self.B.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * inv_sqrt_c @ yw
+        norm = np.linalg.norm(self.ps)
+        hsig = norm / math.sqrt(1 - (1 - self.cs) ** (2 * (self.generation + 1))) / self.chi_n < 1.4 + 2 / (n + 1)
+        self.pc = (1 - self.cc) * self.pc + hsig * math.sqrt(self.cc * (2 - self.cc) * self.mueff) * yw
+        rank_mu = (y.T * self.weights) @ y
+        self.C = ((1 - self.c1 - self.cmu) * self.C
+                  + self.c1 * (np.outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.C)
+                  + self.cmu * rank_mu)
+        self.sigma *= math.exp(self.cs / self.damps * (norm / self.chi_n - 1))
+        self._eigen()
+        self.generation += 1
+
+    def state(self):
+        return {"mean": self.mean, "sigma": self.sigma, "pc": self.pc, "ps": self.ps,
+                "C": self.C, "generation": self.generation, "lam": self.lam,
+                "rng": json.dumps(self.rng.bit_generator.state)}
+
+    @classmethod
+    def restore(cls, state):
+        es = cls(len(state["mean"]), float(state["sigma"]), int(state["lam"]))
+        es.mean = state["mean"]
+        es.pc = state["pc"]
+        es.ps = state["ps"]
+        es.C = state["C"]
+        es.generation = int(state["generation"])
+        es.rng.bit_generator.state = json.loads(str(state["rng"]))
+        es._eigen()
+        return es
+
+
+# --- Checkpoints ---
+def run_dir(out, spec):
+    return os.path.join(out, spec.replace(":", "_").replace(",", "_").replace("=", "-"))
+
+
+def save(directory, es, best, best_fitness, history):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"gen-{es.generation:05d}.npz")
+    # Through a file object savez keeps the name; a .tmp.npz would match latest()'s glob
+    with open(path + ".tmp", "wb") as f:
+        np.savez(f, best=best, best_fitness=best_fitness,
+                 history=np.array(history, np.float64).reshape(-1, 4), **es.state())
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def latest(directory):
+    paths = sorted(glob.glob(os.path.join(directory, "gen-*.npz")))
+    if not paths:
+        return None
+    with np.load(paths[-1]) as data:
+        return dict(data)
+
+
+# --- Training ---
+def train(spec, generations, popsize, courses, seconds, out, resume=False, sigma=0.5):
+    variant = parse(spec)
+    directory = run_dir(out, spec)
+    max_frames = int(seconds * 60)
+    state = latest(directory) if resume else None
+    if state is not None:
+        es = CMAES.restore(state)
+        best, best_fitness = state["best"], float(state["best_fitness"])
+        history = [list(row) for row in state["history"]]
+        print(f"resuming {spec} at generation {es.generation}, best {best_fitness:.0f} frames")
+    else:
+        es = CMAES(GENES, sigma, popsize)
+        best, best_fitness, history = es.mean.copy(), -1.0, []
+    stop = es.generation + generations
+    while es.generation < stop:
+        start = time.perf_counter()
+        genomes = es.ask()
+        seeds = np.arange(courses) + es.generation * courses  # fresh courses every generation
+        frames, score = evaluate(variant, genomes, seeds, max_frames)
+        fitness = frames.mean(1)
+        es.tell(genomes, fitness)
+        took = time.perf_counter() - start
+        top = int(fitness.argmax())
+        if fitness[top] >= best_fitness:
+            best, best_fitness = genomes[top].copy(), float(fitness[top])
+        history.append([fitness.mean(), fitness[top], score[top].mean(), took])
+        save(directory, es, best, best_fitness, history)
+        evals = len(genomes) * courses
+        print(f"gen {es.generation:4d}  best {fitness[top]:7.1f} frames  score {score[top].mean():6.1f}"
+              f"  mean {fitness.mean():7.1f}  sigma {es.sigma:.3f}"
+              f"  {evals / took:7.0f} evals/s  {frames.sum() / took:9.0f} frames/s")
+    return best, best_fitness
+
+
+# --- Live play ---
+def play(spec, out):
+    """Lets the best checkpointed genome play the real game."""
+    from .harness import Harness
+
+    state = latest(run_dir(out, spec))
+    if state is None:
+        raise SystemExit(f"no checkpoints for {spec} in {out}; train first")
+    genome = state["best"][None]
+    variant = parse(spec)
+    name = spec.partition(":")[0]
+    harness = Harness(name)
+    left = variant.hitboxes["square"][0]
+    waited = [0]
+
+    def on_frame(frame):
+        s = frame.state
+        if s is None:
+            return
+        if not s.playing:
+            waited[0] += 1
+            if waited[0] >= RESTART_AFTER:
+                harness.press()
+                waited[0] = 0
+            return
+        waited[0] = 0
+        ahead = [p for p in s.pipes if p[0] + s.pipe_width >= s.bird_x + left]
+        x, top, bottom = ahead[0] if ahead else (math.nan,) * 3
+        inputs = features(np.array([s.y]), np.array([s.vel]), np.array([x - s.bird_x]),
+                          np.array([top]), np.array([bottom]), variant.land_y)
+        if decide(genome, inputs[None])[0, 0]:
+            harness.press()
+
+    print(f"playing {name} with the best genome ({float(state['best_fitness']):.0f} frames"
+          f" at generation {int(state['generation'])})")
+    harness.frame_hooks.append(on_frame)
+    harness.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variant", help="variant to train on, e.g. o3-mini or gemini-2.5:gravity=0.5")
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--population", type=int, default=32, help="genomes per generation")
+    parser.add_argument("--courses", type=int, default=16, help="seeded courses per genome")
+    parser.add_argument("--seconds", type=float, default=30, help="longest run per course")
+    parser.add_argument("--sigma", type=float, default=0.5, help="initial step size")
+    parser.add_argument("--out", default=OUT_DIR, help="checkpoint directory")
+    parser.add_argument("--resume", action="store_true", help="continue from the latest checkpoint")
+    parser.add_argument("--play", action="store_true", help="play the best genome live")
+    args = parser.parse_args()
+    try:
+        parse(args.variant)
+    except KeyError as e:
+        parser.error(e.args[0])
+    if args.play:
+        play(args.variant, args.out)
+        return
+    best, fitness = train(args.variant, args.generations, args.population, args.courses,
+                          args.seconds, args.out, args.resume, args.sigma)
+    print(f"best genome survives {fitness:.0f} frames on average; play it with --play")
+
+
+if __name__ == "__main__":
+    main()
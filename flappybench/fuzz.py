@@ -0,0 +1,285 @@
+"""Input fuzzer for the variants' game logic.
+
+Drives ``flappybench.sim`` with random and coverage-guided flap sequences on
+every core, checks bookkeeping invariants after each frame and shrinks any
+failing sequence to a small input log that replays the bug:
+
+    python -m flappybench.fuzz --seconds 20
+    python -m flappybench.fuzz --replay fuzz-out/o1-passed-pipe-not-scored.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from .replay import InputLog
+from .sim import Sim
+from .variants import VARIANTS
+
+MIN_LENGTH = 300
+MAX_LENGTH = 4000
+
+
+class Checker:
+    """Invariants every variant should hold, checked after each frame."""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.restarts = sim.restarts
+        self.best = sim.best
+        self._new_run()
+
+    def _new_run(self):
+        self.score = 0
+        self.scored = set()  # pipe ids the bird has passed while alive
+
+    def check(self, pressed, was_over, was_alive):
+        """Returns the name of the broken invariant, or None."""
+        sim = self.sim
+        v = sim.variant
+        if sim.restarts != self.restarts:
+            self.restarts = sim.restarts
+            self._new_run()
+        elif pressed and was_over:
+            return "restart kept the old run"
+
+        if sim.score < self.score:
+            return "score went down"
+        if sim.best < self.best:
+            return "best score went down"
+        if sim.over and sim.best < sim.score:
+            return "best below score after game over"
+        self.score = sim.score
+        self.best = sim.best
+
+        for p in sim.pipes:
+            if was_alive and p.id not in self.scored and sim.score_line(p) < v.bird_x:
+                self.scored.add(p.id)
+        if sim.score > len(self.scored):
+            return "scored without passing a pipe alive"
+        if sim.score < len(self.scored):
+            return "passed pipe not scored"
+        return None
+
+
+def features(sim):
+    """Coarse coverage signature of the current frame."""
+    return (
+        min(sim.score, 15) << 12
+        | (int(sim.y) // 40 & 31) << 7
+        | (sim.vel > 0) << 6
+        | min(len(sim.pipes), 7) << 3
+        | sim.over << 2
+        | sim.alive << 1
+        | (sim.restarts > 0)
+    )
+
+
+def execute(variant, seed, inputs, coverage=None):
+    """Runs one input sequence. Returns (violation, frame) or (None, len)."""
+    sim = Sim(variant, seed)
+    checker = Checker(sim)
+    for frame, flap in enumerate(inputs):
+        was_over = sim.over
+        was_alive = sim.alive
+        sim.step(flap)
+        problem = checker.check(flap, was_over, was_alive)
+        if coverage is not None:
+            coverage.add(features(sim) | (sim.cause is not None) << 17)
+        if problem:
+            return problem, frame
+    return None, len(inputs)
+
+
+# --- Input generation ---
+def random_inputs(rng):
+    length = rng.randint(MIN_LENGTH, MAX_LENGTH)
+    rate = rng.choice((0.01, 0.03, 0.05, 0.1, 0.2, 0.4))
+    burst = rng.random() < 0.3
+    out = bytearray(length)
+    t = 0
+    while t < length:
+        if rng.random() < rate:
+            run = rng.randint(2, 8) if burst else 1
+            for i in range(t, min(t + run, length)):
+                out[i] = 1
+            t += run
+        t += 1
+    return out
+
+
+def mutate(rng, inputs, corpus):
+    out = bytearray(inputs)
+    kind = rng.randrange(5)
+    if kind == 0:  # flip a few frames
+        for _ in range(rng.randint(1, 8)):
+            out[rng.randrange(len(out))] ^= 1
+    elif kind == 1:  # burst of presses
+        start = rng.randrange(len(out))
+        for i in range(start, min(start + rng.randint(2, 12), len(out))):
+            out[i] = 1
+    elif kind == 2:  # cut a segment
+        start = rng.randrange(len(out))
+        del out[start:start + rng.randint(1, 60)]
+    elif kind == 3:  # silence a segment
+        start = rng.randrange(len(out))
+        for i in range(start, min(start + rng.randint(5, 60), len(out))):
+            out[i] = 0
+    else:  # splice with another corpus entry
+        _, other = rng.choice(corpus)
+        cut = rng.randrange(min(len(out), len(other)) or 1)
+        out = out[:cut] + other[cut:]
+    if len(out) < MIN_LENGTH:
+        out.extend(bytes(MIN_LENGTH - len(out)))
+    return out
+
+
+def fuzz_worker(job):
+    """Fuzzes one variant for ``seconds``; returns counts and failing inputs."""
+    name, seconds, worker_seed = job
+    variant = VARIANTS[name]
+    rng = random.Random(worker_seed)
+    coverage = set()
+    corpus = []  # (course seed, inputs) that reached new coverage
+    failures = {}  # violation -> (course seed, inputs up to the failing frame)
+    frames = runs = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if corpus and rng.random() < 0.6:
+            seed, parent = rng.choice(corpus)
+            inputs = mutate(rng, parent, corpus)
+        else:
+            seed, inputs = rng.randrange(1000), random_inputs(rng)
+        seen = set()
+        problem, frame = execute(variant, seed, inputs, seen)
+        frames += frame + 1 if problem else frame
+        runs += 1
+        if not seen <= coverage:
+            coverage |= seen
+            corpus.append((seed, inputs))
+        if problem:
+            failing = bytes(inputs[:frame + 1])
+            if problem not in failures or len(failing) < len(failures[problem][1]):
+                failures[problem] = (seed, failing)
+    return {
+        "variant": name,
+        "frames": frames,
+        "runs": runs,
+        "coverage": len(coverage),
+        "failures": failures,
+    }
+
+
+# --- Minimisation ---
+def fails(variant, seed, flaps, length, problem):
+    inputs = bytearray(length)
+    for t in flaps:
+        inputs[t] = 1
+    found, frame = execute(variant, seed, inputs)
+    return frame if found == problem else None
+
+
+def minimize(variant, seed, inputs, problem):
+    """Delta-debugs the flap ticks, then trims the run to the failing frame."""
+    flaps = [t for t, f in enumerate(inputs) if f]
+    length = len(inputs)
+    chunks = 2
+    while len(flaps) >= 1:
+        size = max(1, len(flaps) // chunks)
+        for start in range(0, len(flaps), size):
+            candidate = flaps[:start] + flaps[start + size:]
+            if fails(variant, seed, candidate, length, problem) is not None:
+                flaps = candidate
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            chunks = min(chunks * 2, len(flaps))
+    frame = fails(variant, seed, flaps, length, problem)
+    return flaps, frame + 1
+
+
+def save_repro(out_dir, name, seed, flaps, length, problem):
+    log = InputLog(seed)
+    log.flaps = flaps
+    log.length = length
+    data = log.to_dict()
+    data["variant"] = name
+    data["violation"] = problem
+    path = os.path.join(out_dir, f"{name}-{problem.replace(' ', '-')}.json")
+    os.makedirs(out_dir, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+    return path
+
+
+def replay(path):
+    with open(path) as f:
+        data = json.load(f)
+    sim = Sim(VARIANTS[data["variant"]], data["seed"])
+    checker = Checker(sim)
+    flaps = set(data["flaps"])
+    for t in range(data["length"]):
+        was_over, was_alive = sim.over, sim.alive
+        sim.step(t in flaps)
+        problem = checker.check(t in flaps, was_over, was_alive)
+        print(
+            f"{t:5d} {'F' if t in flaps else ' '} y={sim.y:7.2f} vel={sim.vel:6.2f} "
+            f"score={sim.score} best={sim.best} over={sim.over} alive={sim.alive}"
+            + (f"  <-- {problem}" if problem else "")
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", help="variants to fuzz (default: all)")
+    parser.add_argument("--seconds", type=float, default=10,
+                        help="fuzzing time per variant")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="fuzz-out", help="where repro logs go")
+    parser.add_argument("--replay", metavar="LOG", help="replay a saved repro and exit")
+    args = parser.parse_args()
+    if args.replay:
+        replay(args.replay)
+        return
+    unknown = set(args.variants) - set(VARIANTS)
+    if unknown:
+        parser.error(f"unknown variant(s): {', '.join(sorted(unknown))}")
+
+    names = args.variants or list(VARIANTS)
+    jobs = [(name, args.seconds, args.seed * 1000 + i)
+            for name in names for i in range(args.jobs)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.jobs) as pool:
+        results = pool.map(fuzz_worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    merged = {}
+    total = 0
+    for r in results:
+        total += r["frames"]
+        m = merged.setdefault(r["variant"], {"frames": 0, "failures": {}})
+        m["frames"] += r["frames"]
+        for problem, (seed, inputs) in r["failures"].items():
+            best = m["failures"].get(problem)
+            if best is None or len(inputs) < len(best[1]):
+                m["failures"][problem] = (seed, inputs)
+
+    print(f"{total:,} frames in {elapsed:.1f}s on {args.jobs} cores "
+          f"({total / elapsed:,.0f} frames/s)")
+    for name in names:
+        m = merged[name]
+        print(f"{name}: {m['frames']:,} frames, {len(m['failures'])} invariant(s) broken")
+        for problem, (seed, inputs) in sorted(m["failures"].items()):
+            flaps, length = minimize(VARIANTS[name], seed, inputs, problem)
+            path = save_repro(args.out, name, seed, flaps, length, problem)
+            print(f"  {problem}: {len(flaps)} flap(s) over {length} frames -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Runs a variant's own main.py with per-frame hooks.
+
+The variants are left as they are. ``pygame.event.get`` and
+``pygame.display.flip``/``update`` are wrapped for the length of the run:
+the event wrapper lets tools press keys and see what the player pressed,
+and the flip wrapper reads the frame's game state (see ``probe``) from the
+loop that called it and hands a ``Frame`` to every hook.
+``FLAPPY_PROFILE``/``FLAPPY_SAMPLE`` attach the profilers in ``profiling``
+to any harness run. A variant started as ``python <variant>/main.py`` has
+no harness around it, so they do nothing there.
+"""
+
+import os
+import runpy
+import sys
+import time
+
+import pygame
+
+from . import probe
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Frame:
+    """One presented frame: when, what was pressed since the last one, state."""
+
+    __slots__ = ("index", "time", "flip", "events", "presses", "state")
+
+    def __init__(self, index, time, flip, events, presses, state):
+        self.index = index
+        self.time = time  # perf_counter() when the flip returned
+        self.flip = flip  # seconds the flip itself took
+        self.events = events
+        self.presses = presses  # SPACE presses since the previous frame
+        self.state = state  # probe.State, or None if the loop isn't readable
+
+
+class Harness:
+    def __init__(self, name):
+        if name not in probe.PROBES:
+            raise KeyError(f"unknown variant {name!r}, pick one of: {', '.join(probe.PROBES)}")
+        self.name = name
+        self.path = os.path.join(ROOT, name, "main.py")
+        self.frame_hooks = []  # called with each Frame
+        self.event_hooks = []  # called with each event.get() result, may edit it
+        self.frames = 0
+        self.stopping = False
+        self.caller = None  # the variant's frame that called flip, while hooks run
+        self._pending = []
+        self._events = []
+        self._presses = 0
+
+    # --- Input ---
+    def press(self, key=pygame.K_SPACE):
+        """Queues a key press for the variant's next event.get()."""
+        self._pending.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=" "))
+
+    def stop(self):
+        """Asks the variant to quit as if its window was closed."""
+        self.stopping = True
+        self._pending.append(pygame.event.Event(pygame.QUIT))
+
+    def _get(self, real):
+        def get(*args, **kwargs):
+            events = real(*args, **kwargs)
+            if self._pending:
+                events = list(events) + self._pending
+                self._pending = []
+            for hook in self.event_hooks:
+                events = hook(events)
+            for e in events:
+                if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
+                    self._presses += 1
+            self._events.extend(events)
+            return events
+        return get
+
+    # --- Frames ---
+    def _present(self, real):
+        def present(*args, **kwargs):
+            caller = sys._getframe(1)
+            state = probe.read(self.name, caller.f_locals, caller.f_globals)
+            start = time.perf_counter()
+            result = real(*args, **kwargs)
+            now = time.perf_counter()
+            frame = Frame(self.frames, now, now - start, self._events, self._presses, state)
+            self._events = []
+            self._presses = 0
+            self.frames += 1
+            self.caller = caller
+            try:
+                for hook in self.frame_hooks:
+                    hook(frame)
+            finally:
+                self.caller = None
+            return result
+        return present
+
+    def run(self):
+        """Plays the variant until it quits; returns the number of frames shown."""
+        from . import profiling
+
+        display, event = pygame.display, pygame.event
+        saved = display.flip, display.update, event.get
+        cwd, argv = os.getcwd(), sys.argv
+        display.flip = self._present(display.flip)
+        display.update = self._present(display.update)
+        event.get = self._get(event.get)
+        attached = profiling.attach(self)
+        os.chdir(os.path.dirname(self.path))
+        sys.argv = [self.path]
+        try:
+            runpy.run_path(self.path, run_name="__main__")
+        except SystemExit:
+            pass
+        finally:
+            display.flip, display.update, event.get = saved
+            os.chdir(cwd)
+            sys.argv = argv
+            for tool in attached:
+                tool.close()
+        return self.frames
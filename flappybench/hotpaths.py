@@ -0,0 +1,518 @@
+"""Micro-benchmarks of each variant's per-frame hot paths.
+
+Each variant is started through the harness with the soak test's virtual
+clock, so it runs unpaced, and is stopped a few frames into a game. Its loop
+(the locals and globals of whatever called ``display.flip``) is kept, and an
+adapter per variant turns the variant's own objects and functions into
+zero-argument calls, one per path:
+
+    physics    one step of the bird
+    pipes      ``move_pipes``/``Pipe.update`` and the off-screen filter
+    collision  the bird against every pipe, the way the variant checks it
+    draw       a whole playing frame into an offscreen surface
+    text       rendering and blitting the score
+    startup    from running main.py to its first flip (best of two runs)
+
+Every path calls code in the variant's main.py; steps a loop used to do
+inline live in functions there (``move_pipes``, ``draw_game`` and the like)
+so they can be timed. A few paths are short loops over the variant's own
+methods, written the way its loop writes them: the pipes and collision
+paths of o3-mini-high, o4-mini and gemini-2-flash-thinking, and the text
+path wherever the score isn't drawn by a function of its own. Every call
+starts from the same three pipes and the same bird, so the numbers don't
+drift with game state.
+
+    python -m flappybench.hotpaths [variant ...]
+    python -m flappybench.hotpaths --baselines tests/hotpaths.json --update
+
+Times are the best of several batches, in microseconds. ``calibrate()`` times
+a fixed mix of Python and pygame work, and stored baselines are scaled by
+how it compares on this machine, so one baseline file serves machines of
+different speeds. ``tests/test_hotpaths.py`` fails on regressions past
+``THRESHOLD``.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+import pygame
+
+from . import probe
+from .harness import Harness
+from .soak import VirtualClock, accelerated
+
+PATHS = ("physics", "pipes", "collision", "draw", "text")
+THRESHOLD = 1.5  # allowed slowdown against the scaled baseline
+THRESHOLDS = {"text": 2.0, "startup": 2.0}  # per-path overrides: font rendering and startup swing more
+FLOOR_US = 0.5  # below this much the difference is timer noise
+SCORE = 12
+CAPTURE_FRAMES = 5  # playing frames before the loop is taken
+
+
+class _Captured(Exception):
+    pass
+
+
+# --- Capture ---
+def capture(name, runs=2):
+    """Runs ``name`` into a game; returns (locals, globals, startup seconds).
+
+    The variant's pygame window stays open so the objects it made stay usable.
+    """
+    startup = None
+    for _ in range(runs):
+        harness = Harness(name)
+        taken = {}
+
+        def on_frame(frame):
+            if frame.index == 0:
+                taken["first"] = frame.time
+                harness.press()  # starts o1 and gemini-2.5, a flap elsewhere
+            state = frame.state
+            taken["playing"] = taken.get("playing", 0) + 1 if state is not None and state.playing else 0
+            if taken["playing"] >= CAPTURE_FRAMES:
+                taken["ns"] = harness.caller.f_locals, harness.caller.f_globals
+                raise _Captured
+            if frame.index > 300:
+                raise RuntimeError(f"{name} never started playing")
+
+        harness.frame_hooks.append(on_frame)
+        random.seed(0)
+        start = time.perf_counter()
+        try:
+            with accelerated(VirtualClock()):
+                harness.run()
+        except _Captured:
+            pass
+        if "ns" not in taken:
+            raise RuntimeError(f"{name} quit before it could be captured")
+        took = taken["first"] - start
+        startup = took if startup is None else min(startup, took)
+    local, glob = taken["ns"]
+    return local, glob, startup
+
+
+def offscreen():
+    """A surface like the window, to draw into without presenting."""
+    return pygame.display.get_surface().copy()
+
+
+def _restore(items, get_x, set_x):
+    """A function that puts every item back at the x it has now."""
+    saved = [(item, get_x(item)) for item in items]
+
+    def restore():
+        for item, x in saved:
+            set_x(item, x)
+    return restore
+
+
+def _xs(width):
+    return (width // 3, 2 * width // 3, width)
+
+
+def _setattr_x(item, x):
+    item.x = x
+
+
+# --- Adapters: (locals, globals, surface) -> {path: call} ---
+def _gemini_2_flash_thinking(local, g, surface):
+    bird, font = g["bird"], g["font"]
+    bird.y, bird.velocity = g["HEIGHT"] // 2, 0
+    y0 = bird.y
+    pipes = [g["Pipe"](x) for x in _xs(g["WIDTH"])]
+    restore = _restore(pipes, lambda p: p.x, _setattr_x)
+    width, black = g["WIDTH"], g["BLACK"]
+    g["pipes"], g["score"], g["screen"] = pipes, SCORE, surface  # display_game_screen draws from the globals
+
+    def physics():
+        bird.y, bird.velocity = y0, 0
+        bird.update()
+
+    def move():
+        restore()
+        for pipe in list(pipes):
+            pipe.update()
+            pipe.is_off_screen()
+
+    def collision():
+        for pipe in pipes:
+            pipe.check_collision(bird)
+
+    def text():
+        score_text = font.render(f"Score: {SCORE}", True, black)
+        surface.blit(score_text, score_text.get_rect(topright=(width - 10, 10)))
+
+    return dict(physics=physics, pipes=move, collision=collision, draw=g["display_game_screen"], text=text)
+
+
+def _gemini_2_5(local, g, surface):
+    bird, font, land_rect = g["bird"], g["score_font"], g["land_rect"]
+    bird.reset()
+    y0 = bird.y
+    pipes = []
+    for x in _xs(g["SCREEN_WIDTH"]):
+        bottom, top, color = g["create_pipe"]()
+        bottom.x = top.x = x
+        pipes.append((bottom, top, color, False))
+    restore = _restore(pipes, lambda p: p[0].x, lambda p, x: (setattr(p[0], "x", x), setattr(p[1], "x", x)))
+    move_pipes, check_collision = g["move_pipes"], g["check_collision"]
+    draw_score, draw_frame = g["draw_score"], g["draw_frame"]
+    g.update(pipes=pipes, score=SCORE, game_active=True, demo_mode=False, assist=False)
+
+    def physics():
+        bird.y, bird.velocity = y0, 0
+        bird.update()
+
+    def move():
+        restore()
+        move_pipes(pipes)
+
+    def collision():
+        check_collision(bird, pipes, land_rect)
+
+    def text():
+        draw_score(surface, SCORE, font)
+
+    def draw():
+        draw_frame(surface)
+
+    return dict(physics=physics, pipes=move, collision=collision, draw=draw, text=text)
+
+
+def _grok3(local, g, surface):
+    game = local["self"]
+    bird, font = game.bird, g["font"]
+    bird.y, bird.velocity = g["SCREEN_HEIGHT"] // 2, 0
+    y0 = bird.y
+    game.pipes = pipes = [g["Pipe"](x) for x in _xs(g["SCREEN_WIDTH"])]
+    restore = _restore(pipes, lambda p: p.x, _setattr_x)
+    game.score, game.game_over = SCORE, False
+    game.screen = surface  # Game.draw still ends with its own display.flip()
+    width = g["SCREEN_WIDTH"]
+
+    def physics():
+        bird.y, bird.velocity = y0, 0
+        bird.update()
+
+    def move():
+        restore()
+        game.pipes = pipes
+        game.move_pipes()
+
+    def text():
+        score_text = font.render(f"Score: {game.score}", True, (0, 0, 0))
+        surface.blit(score_text, (width - score_text.get_width() - 10, 10))
+
+    return dict(physics=physics, pipes=move, collision=game.collided, draw=game.draw, text=text)
+
+
+def _o1(local, g, surface):
+    gravity, size = local["gravity"], local["bird_size"]
+    bird_x, y0 = local["bird_x"], g["HEIGHT"] // 2
+    shape, color = local["bird_shape"], local["bird_color"]
+    pipes = [g["generate_pipe_pair"](x) for x in _xs(g["WIDTH"])]
+    restore = _restore(pipes, lambda p: p[0].x, lambda p, x: (setattr(p[0], "x", x), setattr(p[1], "x", x)))
+    update_bird, move_pipes, check_collision = g["update_bird"], g["move_pipes"], g["check_collision"]
+    draw_frame, draw_text = g["draw_frame"], g["draw_text"]
+    background_color, land_color, width = local["background_color"], local["land_color"], g["WIDTH"]
+
+    def physics():
+        update_bird(y0, 0, gravity)
+
+    def move():
+        restore()
+        move_pipes(pipes)
+
+    def collision():
+        bird_rect = pygame.Rect(bird_x - size // 2, y0 - size // 2, size, size)
+        check_collision(bird_rect, pipes)
+
+    def text():
+        draw_text(surface, f"Score: {SCORE}", 30, (0, 0, 0), width - 10, 10, align_right=True)
+
+    def draw():
+        draw_frame(surface, background_color, land_color, pipes, shape, color, bird_x, y0, size, SCORE)
+
+    return dict(physics=physics, pipes=move, collision=collision, draw=draw, text=text)
+
+
+def _o3_mini(local, g, surface):
+    bird = local["bird"]
+    y0 = g["SCREEN_HEIGHT"] // 2
+    pipes = []
+    for x in _xs(g["SCREEN_WIDTH"]):
+        pipe = g["create_pipe_pair"]()
+        pipe["x"] = x
+        pipes.append(pipe)
+    restore = _restore(pipes, lambda p: p["x"], lambda p, x: p.__setitem__("x", x))
+    update_bird, move_pipes, check_pipe_collision = g["update_bird"], g["move_pipes"], g["check_pipe_collision"]
+    draw_game, display_score = g["draw_game"], g["display_score"]
+    background_color = local["background_color"]
+    g["screen"] = surface  # its draw functions all use the global screen
+
+    def physics():
+        bird["y"], bird["vel"] = y0, 0
+        update_bird(bird)
+
+    def move():
+        restore()
+        move_pipes(pipes, 3)
+
+    def collision():
+        for pipe in pipes:
+            check_pipe_collision(bird, pipe)
+
+    def text():
+        display_score(SCORE)
+
+    def draw():
+        draw_game(background_color, bird, pipes, SCORE)
+
+    return dict(physics=physics, pipes=move, collision=collision, draw=draw, text=text)
+
+
+def _o3_mini_high(local, g, surface):
+    bird, font = local["bird"], local["font"]
+    bird.y, bird.vel = g["HEIGHT"] // 2, 0
+    y0 = bird.y
+    pipes = [g["Pipe"](x) for x in _xs(g["WIDTH"])]
+    restore = _restore(pipes, lambda p: p.x, _setattr_x)
+    draw_game = g["draw_game"]
+    background_color, land_color, width = local["background_color"], local["land_color"], g["WIDTH"]
+
+    def physics():
+        bird.y, bird.vel = y0, 0
+        bird.update()
+
+    def move():
+        restore()
+        for pipe in pipes:
+            pipe.update()
+        [pipe for pipe in pipes if pipe.x + pipe.width > 0]
+
+    def collision():
+        bird_rect = bird.rect
+        for pipe in pipes:
+            for prect in pipe.get_rects():
+                bird_rect.colliderect(prect)
+
+    def text():
+        score_text = font.render(f"Score: {SCORE}", True, (0, 0, 0))
+        surface.blit(score_text, score_text.get_rect(topright=(width - 10, 10)))
+
+    def draw():
+        draw_game(surface, font, bird, pipes, SCORE, background_color, land_color)
+
+    return dict(physics=physics, pipes=move, collision=collision, draw=draw, text=text)
+
+
+def _o4_mini(local, g, surface):
+    bird, font = local["bird"], local["font"]
+    bird.y, bird.vel = g["HEIGHT"] // 2, 0
+    y0 = bird.y
+    pipes = []
+    for x in _xs(g["WIDTH"]):
+        pipe = g["Pipe"]()
+        pipe.x = pipe.top.x = pipe.bot.x = x
+        pipes.append(pipe)
+    restore = _restore(pipes, lambda p: p.x, _setattr_x)
+    draw_game, width = g["draw_game"], g["WIDTH"]
+    bg_color, land_color = local["bg_color"], local["land_color"]
+
+    def physics():
+        bird.y, bird.vel = y0, 0
+        bird.update()
+
+    def move():
+        restore()
+        for p in pipes:
+            p.update()
+        [p for p in pipes if p.x + 50 > 0]
+
+    def collision():
+        for p in pipes:
+            bird.rect.colliderect(p.top) or bird.rect.colliderect(p.bot)
+
+    def text():
+        score_surf = font.render(f"Score: {SCORE}", True, (0, 0, 0))
+        surface.blit(score_surf, (width - score_surf.get_width() - 10, 10))
+
+    def draw():
+        draw_game(surface, font, bird, pipes, SCORE, bg_color, land_color)
+
+    return dict(physics=physics, pipes=move, collision=collision, draw=draw, text=text)
+
+
+def _sonnet_3_7(local, g, surface):
+    game = local["game"]
+    bird, font = game.bird, g["FONT"]
+    bird.reset()
+    y0 = bird.y
+    game.pipes = []
+    for x in _xs(g["WIDTH"]):
+        game.add_pipe()
+        game.pipes[-1]["x"] = x
+    pipes = game.pipes
+    restore = _restore(pipes, lambda p: p["x"], lambda p, x: p.__setitem__("x", x))
+    game.score, game.game_active = SCORE, True
+    width = g["WIDTH"]
+    g["screen"] = surface  # Game.draw and Bird.draw use the global screen
+
+    def physics():
+        bird.y, bird.velocity, bird.alive = y0, 0, True
+        bird.update()
+
+    def move():
+        restore()
+        game.pipes = pipes
+        game.move_pipes()
+
+    def collision():
+        bird.check_collision(pipes)
+
+    def text():
+        score_text = font.render(f"Score: {game.score}", True, g["BLACK"])
+        surface.blit(score_text, (width - score_text.get_width() - 20, 20))
+
+    return dict(physics=physics, pipes=move, collision=collision, draw=game.draw, text=text)
+
+
+ADAPTERS = {
+    "gemini-2-flash-thinking": _gemini_2_flash_thinking,
+    "gemini-2.5": _gemini_2_5,
+    "grok3": _grok3,
+    "o1": _o1,
+    "o3-mini": _o3_mini,
+    "o3-mini-high": _o3_mini_high,
+    "o4-mini": _o4_mini,
+    "o4-mini-high": _o4_mini,
+    "sonnet-3.7": _sonnet_3_7,
+}
+
+
+def hot_paths(name):
+    """(``{path: call}``, startup seconds) for a freshly captured ``name``."""
+    local, glob, startup = capture(name)
+    random.seed(0)
+    return ADAPTERS[name](local, glob, offscreen()), startup
+
+
+# --- Timing ---
+def best(call, batch=0.02, repeat=5):
+    """Best time per call in microseconds, over ``repeat`` batches of about ``batch`` seconds."""
+    n = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(n):
+            call()
+        took = time.perf_counter() - start
+        if took >= batch:
+            break
+        n = max(n * 2, int(n * batch / max(took, 1e-9)))
+    times = [took]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(n):
+            call()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e6 / n
+
+
+def _reference(surface, rects):
+    total = 0.0
+    for i in range(2000):
+        total += i * 0.5
+    for r in rects:
+        r.colliderect(rects[0])
+    surface.fill((120, 160, 200))
+    pygame.draw.rect(surface, (0, 100, 0), (40, 0, 60, 300))
+    return total
+
+
+def calibrate():
+    """Microseconds for a fixed mix of Python, Rect and fill work: this machine's speed."""
+    surface = pygame.Surface((200, 300))
+    rects = [pygame.Rect(i, i, 30, 30) for i in range(20)]
+    return best(lambda: _reference(surface, rects), batch=0.02)
+
+
+def measure(name):
+    """``{path: us}`` for ``name``, startup included, and the calls for re-timing."""
+    calls, startup = hot_paths(name)
+    results = {path: best(calls[path]) for path in PATHS}
+    results["startup"] = startup * 1e6
+    return results, calls
+
+
+# --- Baselines ---
+def load(path):
+    if not os.path.exists(path):
+        return {"calibration_us": None, "variants": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path, baselines):
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def allowed(baseline_us, path, scale=1.0, threshold=None):
+    """Slowest time that still passes against ``baseline_us`` on a machine ``scale`` times slower."""
+    limit = THRESHOLDS.get(path, THRESHOLD) if threshold is None else threshold
+    return baseline_us * scale * limit + FLOOR_US
+
+
+def fmt(us):
+    return f"{us / 1000:8.2f} ms" if us >= 1000 else f"{us:8.2f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", default=["all"], help="variant names, or all")
+    parser.add_argument("--baselines", help="JSON file to compare against")
+    parser.add_argument("--update", action="store_true", help="write the results to --baselines")
+    args = parser.parse_args()
+    names = list(ADAPTERS) if args.variants == ["all"] else args.variants
+    for name in names:
+        if name not in ADAPTERS:
+            parser.error(f"unknown variant {name!r}, pick from: {', '.join(probe.PROBES)}")
+    if args.update and not args.baselines:
+        parser.error("--update needs --baselines")
+    baselines = load(args.baselines) if args.baselines else None
+    calibration = calibrate()
+    scale = calibration / baselines["calibration_us"] if baselines and baselines["calibration_us"] else 1.0
+    print(f"calibration {calibration:.2f} us" + (f", {scale:.2f}x the baseline machine" if baselines else ""))
+    regressions = 0
+    for name in names:
+        results, calls = measure(name)
+        print(name)
+        for path in PATHS + ("startup",):
+            line = f"  {path:>9s} {fmt(results[path])}"
+            old = baselines["variants"].get(name, {}).get(path) if baselines else None
+            if old is not None:
+                line += f"  baseline {fmt(old * scale)}  {results[path] / (old * scale):5.2f}x"
+                if results[path] > allowed(old, path, scale) and path in calls:
+                    results[path] = min(results[path], best(calls[path]))  # confirm before flagging
+                if results[path] > allowed(old, path, scale):
+                    line += "  REGRESSION"
+                    regressions += 1
+            print(line)
+        if args.update:
+            baselines["variants"][name] = results
+    if args.update:
+        baselines["calibration_us"] = calibration
+        save(args.baselines, baselines)
+        print(f"wrote {args.baselines}")
+    pygame.quit()
+    if regressions and not args.update:
+        raise SystemExit(f"{regressions} hot path(s) regressed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""A performance HUD the variants draw over their frame.
+
+F3 toggles it (``FLAPPY_HUD=1`` starts with it shown). It shows FPS, a
+sparkline of the last 120 frame times against the 60 fps budget, where the
+frame went (update, draw, flip), the pipe count, the net change in allocated
+blocks per second, GC collections per generation with the last pause, and
+what the HUD itself cost.
+
+A variant marks its phases and draws the HUD last, over everything else:
+
+    hud.mark("update")      # after the events
+    hud.mark("draw")
+    ...                     # the variant's own drawing
+    hud.draw(screen, len(pipes))
+    pygame.display.flip()
+    hud.presented()
+
+The HUD is one cached surface blitted each frame. Its sparkline scrolls a
+pixel a frame, and its text is refreshed four times a second, one line a
+frame and only lines whose text changed, so it stays under 0.1 ms
+(``python -m flappybench.hud --bench``). Rendering a changed line whole
+measured cheaper than blitting it together from per-character glyphs.
+
+``FLAPPY_HUD_STATS=hud.csv`` streams the same numbers, one row per frame,
+to a CSV file for plotting, whether the HUD is shown or not. Hidden and
+without a stats file, ``mark``, ``draw`` and ``presented`` return at once.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+from collections import deque
+
+import pygame
+
+KEY = pygame.K_F3
+HISTORY = 120  # frames in the sparkline
+REFRESH = 15  # frames between text redraws
+BUDGET_MS = 1000 / 60
+GRAPH_MS = 2 * BUDGET_MS  # top of the sparkline
+LINE = 14
+TEXT_HEIGHT = 4 * LINE + 6
+WIDTH = HISTORY + 52
+GRAPH = 32
+BACK = (0, 0, 0, 170)
+TEXT = (235, 235, 235)
+GOOD, SLOW, BAD = (80, 220, 90), (240, 200, 60), (240, 70, 60)
+COLUMNS = ("frame", "time", "frame_ms", "update_ms", "draw_ms", "flip_ms", "hud_ms",
+           "pipes", "net_blocks", "gc0", "gc1", "gc2", "gc_ms")
+
+
+class PerfHud:
+    def __init__(self, visible=None, stats=None, pos=(8, 8)):
+        if visible is None:
+            visible = os.environ.get("FLAPPY_HUD") == "1"
+        stats = stats or os.environ.get("FLAPPY_HUD_STATS")
+        self.visible = visible
+        self.pos = pos
+        self.frames = 0
+        self.times = deque(maxlen=HISTORY)  # frame times, ms
+        self.split = [0.0, 0.0, 0.0]  # update, draw, flip, ms, summed since the last redraw
+        self.hud_ms = 0.0
+        self.pipes = 0
+        self.gc = [0, 0, 0]  # collections per generation
+        self.gc_ms = 0.0  # the last collection's pause
+        self._gc_start = None
+        self._marks = {}
+        self._draw_end = self._hud_end = None
+        self._last = None  # when the previous frame was presented
+        self._blocks = sys.getallocatedblocks()
+        self._block_rate = 0.0
+        self._since = time.perf_counter()
+        self._since_blocks = self._blocks
+        self._font = self._panel = self._graph = None
+        self._lines = []
+        self._rendered = []  # the text each line was last rendered with
+        self._stale = []  # lines to redraw, one a frame
+        self._stats = open(stats, "w") if stats else None
+        if self._stats:
+            self._stats.write(",".join(COLUMNS) + "\n")
+        gc.callbacks.append(self._on_gc)
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible and not self._stats:
+            self._restart()
+
+    def _restart(self):
+        """Forgets the marks and counts from before the HUD was hidden."""
+        self._marks.clear()
+        self._draw_end = self._hud_end = self._last = None
+        self._blocks = self._since_blocks = sys.getallocatedblocks()
+        self._since = time.perf_counter()
+        self.split = [0.0, 0.0, 0.0]
+        self.hud_ms = 0.0
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.gc[info["generation"]] += 1
+            self.gc_ms = (time.perf_counter() - self._gc_start) * 1000
+            self._gc_start = None
+
+    # --- Timing ---
+    def mark(self, phase):
+        """The variant starts ``phase`` ("update" or "draw") now."""
+        if not self.visible and not self._stats:
+            return
+        self._marks[phase] = time.perf_counter()
+
+    def presented(self):
+        """The frame is on screen; records its numbers."""
+        if not self.visible and not self._stats:
+            return  # nothing shows them or writes them down
+        now = time.perf_counter()
+        marks = self._marks
+        start, drawing = marks.get("update"), marks.get("draw")
+        update = (drawing - start) * 1000 if start and drawing else 0.0
+        draw = (self._draw_end - drawing) * 1000 if drawing and self._draw_end else 0.0
+        flip = (now - self._hud_end) * 1000 if self._hud_end else 0.0
+        frame = (now - self._last) * 1000 if self._last else 0.0
+        hud = (self._hud_end - self._draw_end) * 1000 if self._draw_end and self._hud_end else 0.0
+        self._last = now
+        self._draw_end = self._hud_end = None
+        marks.clear()
+        self.frames += 1
+        if frame:
+            self.times.append(frame)
+        split = self.split
+        split[0] += update
+        split[1] += draw
+        split[2] += flip
+        self.hud_ms += hud
+        blocks = sys.getallocatedblocks()
+        if self._stats:
+            self._stats.write(
+                f"{self.frames},{now:.6f},{frame:.3f},{update:.3f},{draw:.3f},{flip:.3f},{hud:.3f},"
+                f"{self.pipes},{blocks - self._blocks},{self.gc[0]},{self.gc[1]},{self.gc[2]},{self.gc_ms:.3f}\n")
+        self._blocks = blocks
+        if self._panel is not None:
+            self._column(frame)
+        if self.frames % REFRESH == 0:
+            self._block_rate = (blocks - self._since_blocks) / max(now - self._since, 1e-9)
+            self._since, self._since_blocks = now, blocks
+            self._lines = self._format()
+            self._stale = list(range(len(self._lines)))
+            self.split = [0.0, 0.0, 0.0]
+            self.hud_ms = 0.0
+        if self._stale and self._panel is not None:
+            self._line(self._stale.pop())  # one line a frame keeps every frame cheap
+
+    # --- Drawing ---
+    def _build(self):
+        self._font = pygame.font.Font(None, 16)
+        self._panel = pygame.Surface((WIDTH, TEXT_HEIGHT + GRAPH + 4), pygame.SRCALPHA).convert_alpha()
+        self._panel.fill(BACK)
+        self._graph = self._panel.subsurface((0, TEXT_HEIGHT, WIDTH, GRAPH + 4))
+        for ms in self.times:
+            self._column(ms)
+        self._lines = self._format()
+        self._rendered = [None] * len(self._lines)
+        self._stale = []
+        for i in range(len(self._lines)):
+            self._line(i)
+
+    def _column(self, ms):
+        """Scrolls the sparkline one pixel and draws ``ms`` at its right edge."""
+        graph = self._graph
+        graph.scroll(-1, 0)
+        x = WIDTH - 5
+        graph.fill(BACK, (x, 0, 1, GRAPH + 4))
+        height = max(1, min(GRAPH, round(ms / GRAPH_MS * GRAPH)))
+        color = GOOD if ms <= BUDGET_MS * 1.1 else SLOW if ms <= GRAPH_MS else BAD
+        graph.fill(color, (x, GRAPH + 2 - height, 1, height))
+        graph.fill(TEXT, (x, GRAPH + 2 - round(BUDGET_MS / GRAPH_MS * GRAPH), 1, 1))
+
+    def _format(self):
+        n = REFRESH if self.frames >= REFRESH else max(self.frames, 1)
+        recent = list(self.times)[-REFRESH:]
+        mean = sum(recent) / len(recent) if recent else 0.0
+        update, draw, flip = (t / n for t in self.split)
+        return [
+            f"{1000 / mean if mean else 0:5.1f} fps {mean:5.2f} ms  max {max(self.times, default=0):5.1f}",
+            f"upd {update:4.2f}  drw {draw:4.2f}  flip {flip:4.2f}",
+            f"pipes {self.pipes}  net blocks {self._block_rate:+.0f}/s",
+            f"gc {self.gc[0]}/{self.gc[1]}/{self.gc[2]} {self.gc_ms:.2f}  hud {self.hud_ms / n:.3f}",
+        ]
+
+    def _line(self, i):
+        text = self._lines[i]
+        if self._rendered[i] == text:
+            return
+        self._rendered[i] = text
+        y = 3 + i * LINE
+        self._panel.fill(BACK, (0, y, WIDTH, LINE))
+        self._panel.blit(self._font.render(text, True, TEXT), (4, y))
+
+    def draw(self, surface, pipes=0):
+        """Draws the HUD over ``surface`` if it's shown; returns the rect it covered."""
+        if not self.visible and not self._stats:
+            return None
+        self._draw_end = time.perf_counter()
+        self.pipes = pipes
+        rect = None
+        if self.visible:
+            if self._panel is None:
+                self._build()
+            rect = surface.blit(self._panel, self.pos)
+        self._hud_end = time.perf_counter()
+        return rect
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._stats:
+            self._stats.close()
+            self._stats = None
+
+
+# --- Benchmark ---
+def bench(frames, size):
+    screen = pygame.display.set_mode(size)
+    hud = PerfHud(visible=True)
+    costs = []
+    for i in range(frames):
+        pygame.event.pump()
+        hud.mark("update")
+        hud.mark("draw")
+        screen.fill((173, 216, 230))
+        start = time.perf_counter()
+        hud.draw(screen, 3)
+        cost = time.perf_counter() - start
+        pygame.display.flip()
+        start = time.perf_counter()
+        hud.presented()
+        costs.append(cost + time.perf_counter() - start)
+    hud.close()
+    costs = sorted(c * 1e6 for c in costs[1:])  # the first frame builds the panel
+    print(f"HUD draw over {len(costs)} frames at {size[0]}x{size[1]}:"
+          f" mean {sum(costs) / len(costs):.1f} us, median {costs[len(costs) // 2]:.1f} us,"
+          f" p99 {costs[int(len(costs) * 0.99)]:.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bench", action="store_true", help="time the HUD's own drawing")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--size", default="400x600", help="window WxH")
+    args = parser.parse_args()
+    if not args.bench:
+        parser.error("the HUD is drawn by the variants (F3 in game); use --bench to time it")
+    pygame.init()
+    w, _, h = args.size.partition("x")
+    bench(args.frames, (int(w), int(h)))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
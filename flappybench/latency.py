@@ -0,0 +1,233 @@
+"""Input-to-photon latency: from a SPACE press to the flip that shows the flap.
+
+Every SPACE ``KEYDOWN`` is timestamped as the variant dequeues it from
+``pygame.event.get()``. The flap is found in the first frame whose probed
+velocity rose by less than half a frame of gravity, and the press counts as shown
+once that frame's ``display.flip()`` returns. Per press that gives:
+
+    queued   posted -> dequeued (synthetic presses only)
+    update   dequeued -> the flip of the frame that applied the flap starts
+    shown    dequeued -> that flip returns
+    total    posted -> that flip returns
+
+The autopilot plays, and each of its presses is posted with
+``pygame.event.post`` from a timer thread at a random point within the next
+frame, the way a real key arrives, so this runs headless:
+
+    python -m flappybench.latency all --seconds 20
+    python -m flappybench.latency sonnet-3.7 grok3 --modes native,sleep,hybrid,busy
+
+``--modes`` replays each variant under the pacing modes of ``pacing``;
+``native`` keeps the variant's own.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+
+import pygame
+
+from . import pacing, probe
+from .autopilot import Autopilot
+from .harness import Harness
+from .variants import VARIANTS
+
+RESTART_AFTER = 45
+GIVE_UP = 10  # frames to wait for a press to show up as a flap
+PARTS = ("queued", "update", "shown", "total")
+
+
+class Press:
+    __slots__ = ("posted", "dequeued", "frame")
+
+    def __init__(self, posted, dequeued, frame):
+        self.posted = posted
+        self.dequeued = dequeued
+        self.frame = frame
+
+
+class LatencyProbe:
+    """Hooks into a Harness and pairs each SPACE press with the flap it caused."""
+
+    def __init__(self, harness, variant):
+        self.harness = harness
+        self.gravity = variant.gravity
+        self.pending = []
+        self.samples = {part: [] for part in PARTS}
+        self.frames = []  # frames from dequeue to shown, per press
+        self.dropped = 0  # presses that never showed up as a flap while playing
+        self._vel = None
+        harness.event_hooks.append(self.on_events)
+        harness.frame_hooks.append(self.on_frame)
+
+    def on_events(self, events):
+        now = time.perf_counter()
+        for e in events:
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
+                self.pending.append(Press(getattr(e, "posted", None), now, self.harness.frames))
+        return events
+
+    def on_frame(self, frame):
+        state = frame.state
+        vel, self._vel = self._vel, state.vel if state is not None and state.playing else None
+        if state is None or not state.playing or vel is None:
+            self.pending = []  # presses that start or restart a game aren't flaps
+            return
+        if state.vel < vel + self.gravity / 2:
+            start = frame.time - frame.flip
+            for press in self.pending:
+                self.samples["update"].append(start - press.dequeued)
+                self.samples["shown"].append(frame.time - press.dequeued)
+                if press.posted is not None:
+                    self.samples["queued"].append(press.dequeued - press.posted)
+                    self.samples["total"].append(frame.time - press.posted)
+                self.frames.append(frame.index - press.frame)
+            self.pending = []
+            return
+        kept = [p for p in self.pending if frame.index - p.frame < GIVE_UP]
+        self.dropped += len(self.pending) - len(kept)
+        self.pending = kept
+
+
+class Poster:
+    """Posts SPACE presses from timer threads, like a keyboard would."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.timers = []
+
+    def press(self, within):
+        timer = threading.Timer(self.rng.uniform(0, within), self._post)
+        timer.daemon = True
+        timer.start()
+        self.timers = [t for t in self.timers if t.is_alive()] + [timer]
+
+    def _post(self):
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=" ",
+                                   posted=time.perf_counter())
+        try:
+            pygame.event.post(event)
+        except pygame.error:
+            pass  # the game already quit
+
+    def cancel(self):
+        for t in self.timers:
+            t.cancel()
+
+
+def measure(name, mode="native", seconds=20, seed=0):
+    """Plays ``name`` with the autopilot for ``seconds``; returns the LatencyProbe."""
+    harness = Harness(name)
+    latency = LatencyProbe(harness, VARIANTS[name])
+    poster = Poster(random.Random(seed))
+    pilot = Autopilot(VARIANTS[name])
+    half = VARIANTS[name].hitboxes["square"][3] / 2
+    waited = [0]
+    last = [None]
+    start = time.perf_counter()
+
+    def on_frame(frame):
+        period = frame.time - last[0] if last[0] else 1 / 60
+        last[0] = frame.time
+        state = frame.state
+        if state is not None:
+            if state.playing:
+                ahead = state.ahead(1)
+                gap = ahead[0][1:] if ahead else (None, None)
+                if pilot.decide(state.y, state.vel, half, *gap):
+                    poster.press(period)
+                waited[0] = 0
+            else:
+                waited[0] += 1
+                if waited[0] >= RESTART_AFTER:
+                    harness.press()
+                    waited[0] = 0
+        if frame.time - start > seconds and not harness.stopping:
+            harness.stop()
+
+    harness.frame_hooks.append(on_frame)
+    try:
+        if mode == "native":
+            harness.run()
+        else:
+            with pacing.install(pacing.make(mode)):
+                harness.run()
+    finally:
+        poster.cancel()
+    return latency
+
+
+# --- Reporting ---
+def percentiles(values):
+    ms = sorted(v * 1000 for v in values)
+    n = len(ms)
+    pick = lambda q: ms[min(int(n * q), n - 1)]
+    return {"n": n, "mean": statistics.fmean(ms), "p50": pick(0.5), "p90": pick(0.9),
+            "p99": pick(0.99), "max": ms[-1]}
+
+
+def histogram(values, width=40, step=2):
+    """Text histogram of ``values`` (seconds) in ``step`` ms buckets."""
+    counts = {}
+    for v in values:
+        b = int(v * 1000 // step)
+        counts[b] = counts.get(b, 0) + 1
+    top = max(counts.values())
+    lines = []
+    for b in range(min(counts), max(counts) + 1):
+        c = counts.get(b, 0)
+        lines.append(f"    {b * step:4d}-{(b + 1) * step:<4d} ms {'#' * round(c * width / top):<{width}s} {c}")
+    return "\n".join(lines)
+
+
+def report(name, mode, latency, show_histogram=True):
+    print(f"{name} [{mode}]: {len(latency.frames)} presses shown as flaps, {latency.dropped} never seen")
+    for part in PARTS:
+        values = latency.samples[part]
+        if values:
+            p = percentiles(values)
+            print(f"  {part:>7s}  mean {p['mean']:6.2f}  p50 {p['p50']:6.2f}  p90 {p['p90']:6.2f}"
+                  f"  p99 {p['p99']:6.2f}  max {p['max']:6.2f} ms")
+    if latency.frames:
+        spread = {f: latency.frames.count(f) for f in sorted(set(latency.frames))}
+        print("  frames from dequeue to shown: " + ", ".join(f"{f}: {n}" for f, n in spread.items()))
+    if show_histogram and latency.samples["total"]:
+        print("  total:")
+        print(histogram(latency.samples["total"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", default=["all"], help="variant names, or all")
+    parser.add_argument("--modes", default="native",
+                        help=f"comma separated: native, {', '.join(pacing.MODES)}")
+    parser.add_argument("--seconds", type=float, default=20, help="play time per variant and mode")
+    parser.add_argument("--seed", type=int, default=0, help="seed for press timing")
+    parser.add_argument("--no-histogram", action="store_true")
+    parser.add_argument("--json", help="write raw samples (seconds) to this file")
+    args = parser.parse_args()
+    names = list(probe.PROBES) if args.variants == ["all"] else args.variants
+    modes = args.modes.split(",")
+    for name in names:
+        if name not in probe.PROBES:
+            parser.error(f"unknown variant {name!r}, pick from: {', '.join(probe.PROBES)}")
+    for mode in modes:
+        if mode != "native" and mode not in pacing.PACERS:
+            parser.error(f"unknown pacing mode {mode!r}")
+    results = {}
+    for name in names:
+        for mode in modes:
+            latency = measure(name, mode, args.seconds, args.seed)
+            report(name, mode, latency, not args.no_histogram)
+            results[f"{name}/{mode}"] = dict(latency.samples, frames=latency.frames,
+                                             dropped=latency.dropped)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Frame pacing modes and how well each one keeps time.
+
+Every variant paces itself differently: most call ``clock.tick(FPS)``
+(o1 at the top of its loop), gemini-2-flash-thinking sleeps a fixed
+``pygame.time.delay(16)`` however long the frame took, and grok3 awaits
+``asyncio.sleep(1 / FPS)``. A ``Pacer`` replaces all of them:
+
+    sleep   ``Clock.tick``: SDL sleeps, cheap but coarse
+    busy    ``Clock.tick_busy_loop``: spins the whole wait, one core at 100%
+    hybrid  sleeps until a margin before the deadline, then spins; the margin
+            follows how late sleeps have been waking up
+    vsync   opens the window with ``vsync=1`` and lets flip block; falls back
+            to hybrid if flips turn out not to block
+
+Each pacer keeps ``PacingStats``: frame intervals, jitter against the
+target period, missed frames and the CPU the process used.
+
+    python -m flappybench.pacing sonnet-3.7 --mode hybrid
+    python -m flappybench.pacing grok3 --mode busy --seconds 10
+    python -m flappybench.pacing --bench
+
+The first runs the real game with its pacing swapped out (``install``)
+and prints the stats on exit; ``--bench`` paces a drawn test scene in
+every mode, one after the other.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import statistics
+import time
+
+import pygame
+
+MODES = ("sleep", "busy", "hybrid", "vsync")
+
+
+class PacingStats:
+    def __init__(self):
+        self.intervals = []  # seconds between consecutive frame ends
+        self.period = None  # target interval, from the last requested fps
+        self.wait_cpu = 0.0  # CPU seconds spent inside waits
+        self._last = None
+        self._start = None
+
+    def add(self, now, cpu_in_wait, fps):
+        if self._last is None:
+            self._start = (now, time.process_time())
+        else:
+            self.intervals.append(now - self._last)
+        self._last = now
+        self.wait_cpu += cpu_in_wait
+        if fps:
+            self.period = 1 / fps
+
+    def fps(self):
+        recent = self.intervals[-30:]
+        return len(recent) / sum(recent) if recent else 0.0
+
+    def summary(self):
+        """Interval stats in ms, missed frame share and CPU use as a share of one core."""
+        n = len(self.intervals)
+        if n < 2:
+            return None
+        ms = sorted(i * 1000 for i in self.intervals)
+        wall = self._last - self._start[0]
+        cpu = time.process_time() - self._start[1]
+        out = {
+            "frames": n,
+            "fps": n / sum(self.intervals),
+            "mean_ms": statistics.fmean(ms),
+            "jitter_ms": statistics.pstdev(ms),
+            "p99_ms": ms[min(int(n * 0.99), n - 1)],
+            "max_ms": ms[-1],
+            "cpu": cpu / wall if wall else 0.0,
+            "wait_cpu_ms": self.wait_cpu * 1000 / n,
+        }
+        if self.period:
+            target = self.period * 1000
+            out["target_ms"] = target
+            out["p99_dev_ms"] = sorted(abs(m - target) for m in ms)[min(int(n * 0.99), n - 1)]
+            out["missed"] = sum(m > target * 1.5 for m in ms) / n
+        return out
+
+    def report(self, label):
+        s = self.summary()
+        if s is None:
+            return f"{label}: too few frames"
+        line = (f"{label:>16s}  {s['fps']:6.1f} fps  interval {s['mean_ms']:6.2f} ms"
+                f"  jitter {s['jitter_ms']:5.2f} ms  p99 {s['p99_ms']:6.2f} ms")
+        if "missed" in s:
+            line += f"  p99 off {s['p99_dev_ms']:5.2f} ms  missed {s['missed']:5.1%}"
+        return line + f"  cpu {s['cpu']:5.1%}  in waits {s['wait_cpu_ms']:5.2f} ms/frame"
+
+
+# --- Pacers ---
+class Pacer:
+    """Waits out the rest of each frame; subclasses pick how."""
+
+    mode = None
+
+    def __init__(self):
+        self.stats = PacingStats()
+        self.last_ms = 0
+
+    def wait(self, fps=0):
+        """Ends a frame at ``fps`` (0 = don't wait); returns ms since the last, like Clock.tick."""
+        cpu = time.process_time()
+        self._wait(fps)
+        now = time.perf_counter()
+        last = self.stats._last
+        self.stats.add(now, time.process_time() - cpu, fps)
+        self.last_ms = int((now - last) * 1000) if last is not None else 0
+        return self.last_ms
+
+    def _wait(self, fps):
+        raise NotImplementedError
+
+    def label(self):
+        return self.mode
+
+
+class SleepPacer(Pacer):
+    mode = "sleep"
+
+    def __init__(self):
+        super().__init__()
+        self.clock = _Clock()
+
+    def _wait(self, fps):
+        self.clock.tick(fps)
+
+
+class BusyPacer(SleepPacer):
+    mode = "busy"
+
+    def _wait(self, fps):
+        self.clock.tick_busy_loop(fps)
+
+
+class HybridPacer(Pacer):
+    mode = "hybrid"
+    MIN_MARGIN = 0.0005
+    MAX_MARGIN = 0.004
+
+    def __init__(self):
+        super().__init__()
+        self.deadline = None
+        self.margin = 0.002  # spin this long before the deadline
+
+    def _wait(self, fps):
+        now = time.perf_counter()
+        if not fps:
+            self.deadline = now
+            return
+        deadline = (self.deadline or now) + 1 / fps
+        if deadline < now:
+            deadline = now  # running late: restart the schedule rather than rush frames
+        sleep = deadline - now - self.margin
+        if sleep > 0:
+            time.sleep(sleep)
+            late = time.perf_counter() - (now + sleep)
+            self.margin = min(self.MAX_MARGIN, max(self.MIN_MARGIN, self.margin * 0.99, late * 1.25))
+        while time.perf_counter() < deadline:
+            pass
+        self.deadline = deadline
+
+
+class VsyncPacer(HybridPacer):
+    """Leaves the waiting to a vsynced flip, once flips are seen to block."""
+
+    mode = "vsync"
+    PROBE_FRAMES = 30
+
+    def __init__(self):
+        super().__init__()
+        self.synced = None  # unknown until PROBE_FRAMES frames have been shown
+        self._busy = []
+
+    def _wait(self, fps):
+        if self.synced is None and fps:
+            # Paced as hybrid, a blocking flip shows up as frames that take
+            # most of the period before they ever reach the wait
+            last = self.stats._last
+            if last is not None:
+                self._busy.append(time.perf_counter() - last)
+            if len(self._busy) == self.PROBE_FRAMES:
+                self.synced = statistics.median(self._busy) > 0.5 / fps
+        if not self.synced:
+            super()._wait(fps)
+
+    def label(self):
+        return "vsync (as hybrid)" if self.synced is False else "vsync"
+
+
+PACERS = {p.mode: p for p in (SleepPacer, BusyPacer, HybridPacer, VsyncPacer)}
+
+
+def make(mode):
+    if mode not in PACERS:
+        raise KeyError(f"unknown pacing mode {mode!r}, pick one of: {', '.join(MODES)}")
+    return PACERS[mode]()
+
+
+# --- Installing into a variant ---
+_Clock = pygame.time.Clock
+
+
+class PacedClock:
+    """Stands in for pygame.time.Clock, handing every tick to a pacer."""
+
+    pacer = None
+
+    def tick(self, framerate=0):
+        return self.pacer.wait(framerate)
+
+    tick_busy_loop = tick
+
+    def get_fps(self):
+        return self.pacer.stats.fps()
+
+    def get_time(self):
+        return self.pacer.last_ms
+
+    get_rawtime = get_time
+
+
+@contextlib.contextmanager
+def install(pacer):
+    """Routes Clock.tick, pygame.time.delay and asyncio.sleep through ``pacer``.
+
+    A fixed ``delay(ms)`` becomes a frame at 1000 / ms fps, and
+    ``asyncio.sleep(s)`` one at 1 / s fps, so the frame period stays what the
+    variant asked for but the time its own work took is counted in it.
+    """
+    display, ptime = pygame.display, pygame.time
+    saved = ptime.Clock, ptime.delay, asyncio.sleep, display.set_mode
+    real_sleep, real_set_mode = asyncio.sleep, display.set_mode
+    clock = type("PacedClock", (PacedClock,), {"pacer": pacer})
+
+    def delay(ms):
+        pacer.wait(1000 / ms if ms > 0 else 0)
+        return ms
+
+    async def sleep(seconds, result=None):
+        pacer.wait(1 / seconds if seconds > 0 else 0)
+        return await real_sleep(0, result)
+
+    def set_mode(size=(0, 0), flags=0, depth=0, display=0, vsync=0):
+        return real_set_mode(size, flags | pygame.SCALED, depth, display, 1)
+
+    ptime.Clock, ptime.delay, asyncio.sleep = clock, delay, sleep
+    if pacer.mode == "vsync":
+        display.set_mode = set_mode
+    try:
+        yield pacer
+    finally:
+        ptime.Clock, ptime.delay, asyncio.sleep, display.set_mode = saved
+
+
+def run_variant(name, mode, seconds=None):
+    from .harness import Harness
+
+    pacer = make(mode)
+    harness = Harness(name)
+    if seconds:
+        def on_frame(frame):
+            if not harness.stopping and frame.time - start >= seconds:
+                harness.stop()
+        harness.frame_hooks.append(on_frame)
+    start = time.perf_counter()
+    with install(pacer):
+        harness.run()
+    print(pacer.stats.report(f"{name} {pacer.label()}"))
+
+
+# --- Benchmark ---
+def bench(modes, frames, fps, size):
+    from .scroll import Scene
+
+    print(f"{frames} frames at {fps} fps, {size[0]}x{size[1]} test scene,"
+          f" driver {pygame.display.get_driver()}")
+    for mode in modes:
+        pacer = make(mode)
+        pygame.display.quit()  # SDL won't switch an open window to SCALED
+        pygame.display.init()
+        flags, vsync = (pygame.SCALED, 1) if mode == "vsync" else (0, 0)
+        screen = pygame.display.set_mode(size, flags, vsync=vsync)
+        scene = Scene(*size)
+        for _ in range(frames + 1):
+            pygame.event.pump()
+            scene.update()
+            scene.paint(screen)
+            scene.overlay(screen)
+            pygame.display.flip()
+            pacer.wait(fps)
+        print(pacer.stats.report(pacer.label()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variant", nargs="?", help="variant to play with its pacing replaced")
+    parser.add_argument("--mode", default="hybrid", help=f"one of: {', '.join(MODES)}")
+    parser.add_argument("--seconds", type=float, help="quit the variant after this long")
+    parser.add_argument("--bench", action="store_true", help="compare every mode on a test scene")
+    parser.add_argument("--modes", default=",".join(MODES), help="modes to benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="frames per benchmarked mode")
+    parser.add_argument("--fps", type=float, default=60)
+    parser.add_argument("--size", default="800x600", help="benchmark window WxH")
+    args = parser.parse_args()
+    modes = args.modes.split(",") if args.bench else [args.mode]
+    for mode in modes:
+        if mode not in PACERS:
+            parser.error(f"unknown pacing mode {mode!r}, pick one of: {', '.join(MODES)}")
+    if args.bench:
+        pygame.init()
+        w, _, h = args.size.partition("x")
+        bench(modes, args.frames, args.fps, (int(w), int(h)))
+        pygame.quit()
+    elif args.variant:
+        try:
+            run_variant(args.variant, args.mode, args.seconds)
+        except KeyError as e:
+            parser.error(e.args[0])
+    else:
+        parser.error("give a variant to play, or --bench")
+
+
+if __name__ == "__main__":
+    main()
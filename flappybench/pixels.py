@@ -0,0 +1,264 @@
+"""Game frames at any internal resolution, scaled only when presented.
+
+The variants draw in window pixels, so running dozens of them side by side
+or feeding frames to a learner pays for full-size fills every frame.
+``PixelRenderer`` draws a game's state (a ``Sim``, or anything with a bird
+y, shape and pipes) into a surface of whatever internal size is asked for,
+and it is scaled to the window at present time, every frame: by SDL's
+renderer (``pygame.SCALED``) or with ``scale``/``smoothscale`` straight
+into the window. A CPU scale up to full size can cost more than drawing
+there did, so the draw only pays off when many small frames share one
+window or nothing is scaled at all. For one game window, ``view.View``
+draws a variant at a lower resolution and leaves the scaling to SDL.
+
+    python -m flappybench.pixels o3-mini --instances 24 --internal 100x150
+    python -m flappybench.pixels sonnet-3.7 --instances 1 --internal 200x150 --scaled
+    python -m flappybench.pixels sonnet-3.7 --bench
+
+``observe()`` returns a frame as a numpy array, for pixel observations.
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pygame
+
+from . import policies
+from .sim import Sim
+from .variants import parse
+
+SKY = (135, 206, 235)
+PIPE = (34, 139, 34)
+LAND = (222, 184, 135)
+BIRD = (40, 40, 40)
+
+
+def parse_size(text):
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+
+
+class PixelRenderer:
+    """Draws one variant's frames at ``size`` internal pixels."""
+
+    def __init__(self, variant, size):
+        v = variant
+        self.variant = v
+        self.size = size
+        self.sx = size[0] / v.width
+        self.sy = size[1] / v.height
+        self.surface = pygame.Surface(size)
+        self.land = self.rect(0, v.land_y, v.width, v.height - v.land_y)
+
+    def rect(self, x, y, w, h):
+        """Game-pixel rect scaled to internal pixels, at least 1px each way."""
+        left, top = round(x * self.sx), round(y * self.sy)
+        right, bottom = round((x + w) * self.sx), round((y + h) * self.sy)
+        return pygame.Rect(left, top, max(right - left, 1), max(bottom - top, 1))
+
+    def draw(self, y, pipes, shape="square", surface=None):
+        """Draws a frame; ``pipes`` holds (x, gap_top, gap_bottom) in game pixels."""
+        v = self.variant
+        surface = surface or self.surface
+        surface.fill(SKY)
+        for x, gap_top, gap_bottom in pipes:
+            surface.fill(PIPE, self.rect(x, 0, v.pipe_width, gap_top))
+            surface.fill(PIPE, self.rect(x, gap_bottom, v.pipe_width, v.bottom_end - gap_bottom))
+        surface.fill(LAND, self.land)
+        half = v.bird_size / 2
+        box = self.rect(v.bird_x - half, y - half, v.bird_size, v.bird_size)
+        if shape == "circle" and box.width > 2:
+            pygame.draw.ellipse(surface, BIRD, box)
+        elif shape == "triangle" and box.width > 2:
+            pygame.draw.polygon(surface, BIRD, [box.midtop, box.bottomleft, box.bottomright])
+        else:
+            surface.fill(BIRD, box)
+        return surface
+
+    def draw_sim(self, sim, surface=None):
+        pipes = [(p.x, p.gap_top, p.gap_bottom) for p in sim.pipes]
+        return self.draw(sim.y, pipes, sim.shape, surface)
+
+    def observe(self, sim, gray=False):
+        """The frame as a (height, width, 3) uint8 array, or (height, width) if ``gray``."""
+        frame = pygame.surfarray.array3d(self.draw_sim(sim)).swapaxes(0, 1)
+        if gray:
+            return (frame @ np.array([0.299, 0.587, 0.114])).astype(np.uint8)
+        return frame
+
+
+def present(surface, window, rect=None, smooth=True):
+    """Scales ``surface`` into ``rect`` of the window (all of it by default)."""
+    rect = pygame.Rect(rect or window.get_rect())
+    if surface.get_size() == rect.size:
+        window.blit(surface, rect)
+    elif smooth:
+        pygame.transform.smoothscale(surface, rect.size, window.subsurface(rect))
+    else:
+        pygame.transform.scale(surface, rect.size, window.subsurface(rect))
+
+
+# --- Instances ---
+class Instance:
+    """One self-restarting bot game."""
+
+    def __init__(self, variant, seed, policy_spec):
+        self.variant = variant
+        self.seed = seed
+        self.policy = policies.make(policy_spec)
+        self.restart()
+
+    def restart(self):
+        self.sim = Sim(self.variant, self.seed)
+        self.policy.reset(self.seed)
+
+    def step(self):
+        sim = self.sim
+        if sim.step(self.policy(sim)) or not sim.alive:
+            self.seed += 1000
+            self.restart()
+
+
+def grid(n, window):
+    """Cell rects for ``n`` instances tiled over the window, keeping the aspect."""
+    cols = math.ceil(math.sqrt(n * window[0] / window[1]))
+    rows = math.ceil(n / cols)
+    w, h = window[0] // cols, window[1] // rows
+    return [pygame.Rect((i % cols) * w, (i // cols) * h, w, h) for i in range(n)]
+
+
+def run(variant, args):
+    n = args.instances
+    internal = parse_size(args.internal) if args.internal else (variant.width // 4, variant.height // 4)
+    if args.scaled:
+        # The GPU scales the internal surface up to the window
+        window = pygame.display.set_mode(internal, pygame.SCALED)
+        cells = grid(n, internal)
+    else:
+        window = pygame.display.set_mode(parse_size(args.window))
+        cells = grid(n, window.get_size())
+    pygame.display.set_caption(f"{variant.name} x{n} at {internal[0]}x{internal[1]}")
+    renderer = PixelRenderer(variant, internal if not args.scaled else cells[0].size)
+    games = [Instance(variant, seed, args.policy) for seed in range(n)]
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 22)
+    draw_ms = flip_ms = 0.0
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN
+                                             and event.key in (pygame.K_ESCAPE, pygame.K_q)):
+                running = False
+        t0 = time.perf_counter()
+        for game in games:
+            game.step()
+        t1 = time.perf_counter()
+        for game, cell in zip(games, cells):
+            frame = renderer.draw_sim(game.sim)
+            present(frame, window, cell, not args.sharp)
+        draw_ms = (time.perf_counter() - t1) * 1000
+        if not args.scaled:
+            text = f"{clock.get_fps():.0f} fps  sim {(t1 - t0) * 1000:.1f} ms  draw+scale {draw_ms:.1f} ms"
+            window.blit(font.render(text, True, (0, 0, 0), (255, 255, 255)), (4, 4))
+        t2 = time.perf_counter()
+        pygame.display.flip()
+        flip_ms = (time.perf_counter() - t2) * 1000
+        clock.tick(60)
+    print(f"last frame: draw+scale {draw_ms:.2f} ms, flip {flip_ms:.2f} ms")
+
+
+def _timed(frames, fn):
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def _reopen(size, flags=0):
+    """A fresh window; SDL can't turn an open window into a SCALED one."""
+    pygame.display.quit()
+    pygame.display.init()
+    return pygame.display.set_mode(size, flags)
+
+
+def bench(variant, frames):
+    """Frame cost of drawing at several internal sizes, and of getting the frame on screen.
+
+    Every frame is drawn and then presented: blitted (at native size),
+    scaled or smoothscaled into the window and flipped, or drawn straight
+    into a ``pygame.SCALED`` window at the internal size and flipped, with
+    SDL doing the scale. The totals are what a frame costs either way.
+    """
+    native = (variant.width, variant.height)
+    sims = []
+    sim = Sim(variant, 0)
+    policy = policies.make("threshold:8")
+    for _ in range(frames):
+        if sim.step(policy(sim)) or not sim.alive:
+            sim = Sim(variant, sim.seed + 1)
+        sims.append(sim.clone())
+    _reopen(native)
+    print(f"{variant.name}: window {native[0]}x{native[1]}, {frames} frames,"
+          f" driver {pygame.display.get_driver()}; ms per frame, draw + present")
+    base = None
+    for scale in (1, 0.5, 0.25, 0.125):
+        size = (max(int(native[0] * scale), 1), max(int(native[1] * scale), 1))
+        renderer = PixelRenderer(variant, size)
+        window = _reopen(native)
+        it = iter(sims * 4)
+        draw = _timed(frames, lambda: renderer.draw_sim(next(it)))
+        base = base or draw
+        frame = renderer.surface
+        flip = pygame.display.flip
+
+        def presented(smooth):
+            present(frame, window, None, smooth)
+            flip()
+        sharp = _timed(frames, lambda: presented(False))
+        smooth = _timed(frames, lambda: presented(True))
+        if size == native:
+            print(f"  native   {size[0]:4d}x{size[1]:<4d}  draw {draw:6.3f}  + blit {sharp:6.3f}"
+                  f"  = {draw + sharp:6.3f}")
+            continue
+        window = _reopen(size, pygame.SCALED)
+
+        def gpu():
+            renderer.draw_sim(next(it), window)
+            flip()
+        scaled = _timed(frames, gpu)
+        print(f"  internal {size[0]:4d}x{size[1]:<4d}  draw {draw:6.3f} ({base / draw:4.1f}x)"
+              f"  + scale {sharp:6.3f} = {draw + sharp:6.3f}"
+              f"  + smoothscale {smooth:6.3f} = {draw + smooth:6.3f}"
+              f"  SCALED draw + flip {scaled:6.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variant", nargs="?", default="o3-mini")
+    parser.add_argument("--instances", type=int, default=16, help="games shown side by side")
+    parser.add_argument("--internal", help="internal resolution WxH (default: a quarter of the game's)")
+    parser.add_argument("--window", default="1200x800", help="window size WxH")
+    parser.add_argument("--policy", default="threshold:8", help="bot policy spec")
+    parser.add_argument("--scaled", action="store_true",
+                        help="open the window at the internal size and let pygame.SCALED upscale it")
+    parser.add_argument("--sharp", action="store_true", help="nearest-neighbour instead of smoothscale")
+    parser.add_argument("--bench", action="store_true", help="measure frame cost by internal resolution")
+    parser.add_argument("--frames", type=int, default=600, help="frames per benchmark size")
+    args = parser.parse_args()
+    try:
+        variant = parse(args.variant)
+        policies.make(args.policy)
+    except KeyError as e:
+        parser.error(e.args[0])
+    pygame.init()
+    if args.bench:
+        bench(variant, args.frames)
+    else:
+        run(variant, args)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
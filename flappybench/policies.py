@@ -0,0 +1,93 @@
+"""Reference flap policies for batch runs.
+
+A policy is called once per frame with the Sim and returns whether to press
+SPACE. Policies are built from short specs so they can be sent to worker
+processes and used as cache keys: ``random:0.05``, ``threshold:8``,
+``planner:30``.
+"""
+
+import random
+
+
+class RandomFlapper:
+    """Presses SPACE on each frame with probability ``rate``."""
+
+    def __init__(self, rate=0.05):
+        self.rate = float(rate)
+        self.rng = random.Random()
+
+    def reset(self, seed):
+        self.rng.seed(f"{seed}:random-policy")
+
+    def __call__(self, sim):
+        return self.rng.random() < self.rate
+
+
+class Threshold:
+    """Flaps whenever the bird would otherwise sink below the next gap."""
+
+    def __init__(self, margin=8):
+        self.margin = float(margin)
+
+    def reset(self, seed):
+        pass
+
+    def __call__(self, sim):
+        v = sim.variant
+        pipe = sim.next_pipe()
+        floor = pipe.gap_bottom if pipe is not None else (v.land_y + v.bird_size) // 2
+        _, dy, _, h = sim.hitbox
+        bottom_next = sim.y + sim.vel + v.gravity + dy + h
+        return bottom_next > floor - self.margin
+
+
+class Planner:
+    """Follows the threshold controller unless look-ahead says that is fatal.
+
+    Decisions are made every ``stride`` frames inside a ``horizon`` frame
+    look-ahead, trying the controller's choice first and stopping at the first
+    surviving branch. That costs one rollout while the bird is safe and at
+    most 2 ** (horizon / stride) branches when it isn't.
+    """
+
+    def __init__(self, horizon=30, stride=3):
+        self.horizon = int(horizon)
+        self.stride = int(stride)
+        self.guide = Threshold()
+
+    def reset(self, seed):
+        pass
+
+    def _survives(self, sim, flap, frames):
+        sim = sim.clone()
+        for i in range(min(self.stride, frames)):
+            if sim.step(flap and i == 0) or not sim.alive:
+                return False
+        frames -= self.stride
+        if frames <= 0:
+            return True
+        first = self.guide(sim)
+        return self._survives(sim, first, frames) or self._survives(sim, not first, frames)
+
+    def __call__(self, sim):
+        first = self.guide(sim)
+        if self._survives(sim, first, self.horizon):
+            return first
+        # Only overrule the controller when the other choice provably lives
+        return not first if self._survives(sim, not first, self.horizon) else first
+
+
+POLICIES = {
+    "random": RandomFlapper,
+    "threshold": Threshold,
+    "planner": Planner,
+}
+DEFAULT_SPECS = ("random:0.05", "threshold", "planner")
+
+
+def make(spec):
+    """Builds a policy from ``name`` or ``name:arg,arg``."""
+    name, _, args = spec.partition(":")
+    if name not in POLICIES:
+        raise KeyError(f"unknown policy {name!r}, pick one of: {', '.join(POLICIES)}")
+    return POLICIES[name](*[a for a in args.split(",") if a])
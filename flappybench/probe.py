@@ -0,0 +1,126 @@
+"""Reads a running variant's game state out of its main loop.
+
+Every variant keeps its bird and pipes differently (attributes, dicts, bare
+locals, rect tuples), so each gets a small reader that is handed the
+locals and globals of the frame that calls ``pygame.display.flip`` (or
+``update``) and returns a ``State``. Nothing in the variants changes.
+"""
+
+
+class State:
+    """Where the bird and pipes are on the frame about to be shown.
+
+    ``pipes`` holds (x, gap_top, gap_bottom) left to right; ``playing`` is
+    False on start, demo and game over screens.
+    """
+
+    __slots__ = ("bird_x", "y", "vel", "playing", "score", "pipes", "pipe_width")
+
+    def __init__(self, bird_x, y, vel, playing, score, pipes, pipe_width):
+        self.bird_x = bird_x
+        self.y = y
+        self.vel = vel
+        self.playing = playing
+        self.score = score
+        self.pipes = pipes
+        self.pipe_width = pipe_width
+
+    def ahead(self, n=2):
+        """The next ``n`` pipes the bird hasn't cleared yet."""
+        return [p for p in self.pipes if p[0] + self.pipe_width >= self.bird_x][:n]
+
+
+def gemini_2_flash_thinking(ns, g):
+    bird, pipes = ns["bird"], ns["pipes"]
+    return State(
+        bird.x, bird.y, bird.velocity, not ns["game_over"], ns["score"],
+        [(p.x, p.gap_y, p.gap_y + p.gap_size) for p in pipes],
+        pipes[0].width if pipes else 60,
+    )
+
+
+def gemini_2_5(ns, g):
+    bird = ns["bird"]
+    return State(
+        bird.x, bird.y, bird.velocity, ns["game_active"] and not ns.get("demo_mode", False),
+        ns["score"], [(bottom.x, top.bottom, bottom.top) for bottom, top, _, _ in ns["pipes"]],
+        g["PIPE_WIDTH"],
+    )
+
+
+def grok3(ns, g):
+    game = ns["self"]
+    bird = game.bird
+    return State(
+        bird.x, bird.y, bird.velocity, not game.game_over, game.score,
+        [(p.x, p.gap_y - p.gap // 2, p.gap_y + p.gap // 2) for p in game.pipes],
+        game.pipes[0].width if game.pipes else 50,
+    )
+
+
+def o1(ns, g):
+    return State(
+        ns["bird_x"], ns["bird_y"], ns["bird_velocity"], ns["game_active"], ns["score"],
+        [(top.x, top.bottom, bottom.top) for top, bottom, _ in ns["pipes"]],
+        g["PIPE_WIDTH"],
+    )
+
+
+def o3_mini(ns, g):
+    bird = ns["bird"]
+    gap = g["PIPE_GAP"]
+    return State(
+        bird["x"], bird["y"], bird["vel"], ns["game_active"], ns["score"],
+        [(p["x"], p["gap_y"], p["gap_y"] + gap) for p in ns["pipes"]],
+        g["PIPE_WIDTH"],
+    )
+
+
+def o3_mini_high(ns, g):
+    bird = ns["bird"]
+    return State(
+        bird.x, bird.y, bird.vel, not ns["game_over"], ns["score"],
+        [(p.x, p.gap_y, p.gap_y + p.gap) for p in ns["pipes"]],
+        g["PIPE_WIDTH"],
+    )
+
+
+def o4_mini(ns, g):
+    bird = ns["bird"]
+    return State(
+        bird.x, bird.y, bird.vel, ns["playing"], ns["score"],
+        [(p.x, p.top.bottom, p.bot.top) for p in ns["pipes"]],
+        50,
+    )
+
+
+def sonnet_3_7(ns, g):
+    game = ns["game"]
+    bird = game.bird
+    gap = g["PIPE_GAP"]
+    return State(
+        bird.x, bird.y, bird.velocity, game.game_active, game.score,
+        [(p["x"], p["height"], p["height"] + gap) for p in game.pipes],
+        g["PIPE_WIDTH"],
+    )
+
+
+PROBES = {
+    "gemini-2-flash-thinking": gemini_2_flash_thinking,
+    "gemini-2.5": gemini_2_5,
+    "grok3": grok3,
+    "o1": o1,
+    "o3-mini": o3_mini,
+    "o3-mini-high": o3_mini_high,
+    "o4-mini": o4_mini,
+    "o4-mini-high": o4_mini,
+    "sonnet-3.7": sonnet_3_7,
+}
+
+
+def read(name, local, glob):
+    """State of variant ``name`` from its flip caller's namespaces, or None."""
+    try:
+        return PROBES[name](local, glob)
+    except (KeyError, AttributeError, TypeError):
+        return None  # not set up yet, e.g. before the first reset
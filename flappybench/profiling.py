@@ -0,0 +1,309 @@
+"""cProfile runs and an always-on sampling profiler for a running variant.
+
+Both hang off the harness, so every variant is profiled the same way
+whatever shape its loop has (``main()``, ``main_game()``, a module-level
+loop, grok3's asyncio task): a profiled stretch starts and ends at a
+``display.flip``, and sampled stacks start at the variant's module.
+
+``FrameProfile`` runs ``cProfile`` for N frames, from a given frame or from
+an F9 press in the game window (F9 again stops early). It writes
+``.pstats`` for ``python -m pstats`` or snakeviz, and ``.collapsed``: one
+``a;b;c <microseconds>`` line per call path, which flamegraph.pl, inferno
+and speedscope read. cProfile only keeps caller/callee pairs, so those
+paths are rebuilt by splitting each function's time among its callers.
+
+``Sampler`` is a daemon thread that reads the game thread's stack with
+``sys._current_frames`` every 10 ms and counts whole stacks, down to the
+line the innermost function is on. There are no trace hooks, so the game
+runs at full speed and pays one stack walk per sample, well under 1% (it
+prints its own share). On exit it writes a ``.collapsed`` file of sample
+counts.
+
+    python -m flappybench.profiling sonnet-3.7               # F9 profiles 300 frames
+    python -m flappybench.profiling grok3 --bot --start 120 --frames 600 --sample 10
+
+Any other harness tool attaches them from the environment:
+``FLAPPY_PROFILE=300`` arms F9 for 300 frames, ``FLAPPY_PROFILE=300@120``
+starts at frame 120, and ``FLAPPY_SAMPLE=10`` samples every 10 ms:
+
+    FLAPPY_SAMPLE=10 python -m flappybench.latency o3-mini
+
+Only the harness reads them. ``python sonnet-3.7/main.py`` runs the game
+on its own and ignores both; to profile a game you play yourself, use
+``python -m flappybench.profiling sonnet-3.7`` instead.
+
+Files go to ``profiles/`` as ``<variant>-<time>``.
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import pygame
+
+from .autopilot import Autopilot
+from .harness import ROOT, Harness
+from .variants import VARIANTS
+
+OUT = "profiles"
+FRAMES = 300
+HOTKEY = pygame.K_F9
+SAMPLE_MS = 10
+RESTART_AFTER = 45
+MIN_US = 1  # collapsed paths below this are dropped
+
+
+# --- Stacks ---
+def _label(filename, lineno, name):
+    """How a function shows up in a collapsed stack."""
+    if filename == "~":  # a builtin, in pstats
+        return name.replace(";", ",")
+    if filename.startswith(ROOT):
+        filename = os.path.relpath(filename, ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{name} ({filename}:{lineno})".replace(";", ",")
+
+
+def _stack(frame, root):
+    """Code objects from ``root``'s module frame in to ``frame``, or None if it isn't running under it."""
+    codes = []
+    while frame is not None:
+        code = frame.f_code
+        codes.append(code)
+        if code.co_name == "<module>" and code.co_filename == root:
+            codes.reverse()
+            return tuple(codes)
+        frame = frame.f_back
+    return None
+
+
+def collapse(stats, root):
+    """{path: seconds} rebuilt from a pstats ``stats`` dict, each path under ``root``.
+
+    A function's own time along one path is its total own time times the
+    share of its calls that came through that path, by cumulative time.
+    """
+    children = defaultdict(list)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children[caller].append((func, edge[3]))
+    paths = Counter()
+
+    def walk(func, path, share, seen):
+        _, _, tt, ct, _ = stats[func]
+        path += (_label(*func),)
+        paths[path] += tt * share
+        for child, edge_ct in children[func]:
+            child_ct = stats[child][3]
+            spent = edge_ct * share
+            if child in seen or not child_ct or spent * 1e6 < MIN_US:
+                continue
+            walk(child, path, spent / child_ct, seen | {child})
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, (root,), 1.0, {func})
+    return paths
+
+
+def write_collapsed(path, counts, scale=1):
+    """Writes ``{stack: count}`` as collapsed-stack lines, counts times ``scale``, rounded."""
+    with open(path, "w") as f:
+        for stack, count in sorted(counts.items()):
+            value = round(count * scale)
+            if value:
+                f.write(f"{';'.join(stack)} {value}\n")
+
+
+def _base(out, name):
+    os.makedirs(out, exist_ok=True)
+    return os.path.join(out, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+
+# --- cProfile ---
+class FrameProfile:
+    """cProfile over ``frames`` frames, from frame ``start`` or an F9 press."""
+
+    def __init__(self, harness, frames=FRAMES, start=None, out=OUT):
+        self.harness = harness
+        self.frames = frames
+        self.start = start
+        self.out = os.path.abspath(out)  # the variant runs from its own directory
+        self.written = []  # base paths of the profiles written
+        self.profile = None
+        self.first = None
+        self.toggled = False
+        harness.event_hooks.append(self.on_events)
+        harness.frame_hooks.append(self.on_frame)
+
+    def on_events(self, events):
+        for e in events:
+            if e.type == pygame.KEYDOWN and e.key == HOTKEY:
+                self.toggled = not self.toggled
+                return [e for e in events if e.type != pygame.KEYDOWN or e.key != HOTKEY]
+        return events
+
+    def on_frame(self, frame):
+        if self.profile is None:
+            if self.toggled or frame.index == self.start:
+                self.toggled = False
+                self.first = frame.index
+                self.profile = cProfile.Profile()
+                self.profile.enable()
+        elif self.toggled or frame.index - self.first >= self.frames:
+            self.toggled = False
+            self.finish(frame.index)
+
+    def finish(self, last):
+        self.profile.disable()
+        base = f"{_base(self.out, self.harness.name)}-f{self.first}"
+        self.profile.dump_stats(base + ".pstats")
+        stats = pstats.Stats(self.profile).stats
+        write_collapsed(base + ".collapsed", collapse(stats, self.harness.name), 1e6)
+        print(f"profiled frames {self.first}-{last} of {self.harness.name}: {base}.pstats, .collapsed")
+        self.written.append(base)
+        self.profile = None
+
+    def close(self):
+        if self.profile is not None:
+            self.finish(self.harness.frames)
+
+
+# --- Sampling ---
+class Sampler:
+    """Counts the game thread's stacks every ``interval`` seconds from a daemon thread."""
+
+    def __init__(self, harness, interval=SAMPLE_MS / 1000, out=OUT):
+        self.harness = harness
+        self.interval = interval
+        self.out = os.path.abspath(out)
+        self.stacks = Counter()  # (code objects, innermost line) -> samples
+        self.samples = 0
+        self.busy = 0.0  # seconds spent taking samples
+        self.started = None
+        self.written = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None  # thread id of the game
+
+    def start(self):
+        """Starts sampling the calling thread."""
+        self._target = threading.get_ident()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="flappybench-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        root = self.harness.path
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            frame = sys._current_frames().get(self._target)
+            stack = _stack(frame, root) if frame is not None else None
+            if stack is not None:
+                self.stacks[stack, frame.f_lineno] += 1
+                self.samples += 1
+            del frame
+            self.busy += time.perf_counter() - start
+
+    def overhead(self):
+        """Share of the run the sampler spent walking stacks."""
+        return self.busy / max(time.perf_counter() - self.started, 1e-9)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        labels = {}
+        counts = Counter()
+        for (stack, line), n in self.stacks.items():
+            for code in stack:
+                if code not in labels:
+                    labels[code] = _label(code.co_filename, code.co_firstlineno, code.co_qualname)
+            leaf = f"line {line}"  # where the innermost function was, e.g. waiting in tick
+            counts[(self.harness.name,) + tuple(labels[code] for code in stack) + (leaf,)] += n
+        self.written = _base(self.out, self.harness.name) + "-samples.collapsed"
+        write_collapsed(self.written, counts)
+        print(f"sampled {self.harness.name} {self.samples} times every {self.interval * 1000:g} ms,"
+              f" {self.overhead():.2%} of the run: {self.written}")
+
+
+def attach(harness):
+    """Starts what FLAPPY_PROFILE and FLAPPY_SAMPLE ask for on ``harness``; returns them to close."""
+    tools = []
+    spec = os.environ.get("FLAPPY_PROFILE")
+    if spec:
+        frames, _, start = spec.partition("@")
+        tools.append(FrameProfile(harness, int(frames), int(start) if start else None))
+    ms = os.environ.get("FLAPPY_SAMPLE")
+    if ms:
+        sampler = Sampler(harness, float(ms) / 1000)
+        sampler.start()
+        tools.append(sampler)
+    return tools
+
+
+# --- Command line ---
+def _autopilot(harness):
+    variant = VARIANTS[harness.name]
+    pilot = Autopilot(variant)
+    half = variant.hitboxes["square"][3] / 2
+    waited = [0]
+
+    def on_frame(frame):
+        state = frame.state
+        if frame.index == 0:
+            harness.press()  # o1 and gemini-2.5 wait for SPACE
+        elif state is not None:
+            if state.playing:
+                waited[0] = 0
+                ahead = state.ahead(1)
+                gap = ahead[0][1:] if ahead else (None, None)
+                if pilot.decide(state.y, state.vel, half, *gap):
+                    harness.press()
+            else:
+                waited[0] += 1
+                if waited[0] >= RESTART_AFTER:
+                    harness.press()
+                    waited[0] = 0
+    harness.frame_hooks.append(on_frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variant")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="frames per cProfile run")
+    parser.add_argument("--start", type=int, help="frame to start cProfile at (otherwise press F9)")
+    parser.add_argument("--sample", type=float, metavar="MS", help="also sample stacks every MS milliseconds")
+    parser.add_argument("--bot", action="store_true", help="let the autopilot play")
+    parser.add_argument("--seconds", type=float, help="quit after this long")
+    parser.add_argument("--out", default=OUT, help="directory for the profiles")
+    args = parser.parse_args()
+    try:
+        harness = Harness(args.variant)
+    except KeyError as e:
+        parser.error(e.args[0])
+    if args.bot:
+        _autopilot(harness)
+    cprofile = FrameProfile(harness, args.frames, args.start, args.out)
+    sampler = Sampler(harness, args.sample / 1000, args.out) if args.sample else None
+    if args.seconds:
+        def on_frame(frame):
+            if not harness.stopping and frame.time - start >= args.seconds:
+                harness.stop()
+        harness.frame_hooks.append(on_frame)
+    start = time.perf_counter()
+    if sampler:
+        sampler.start()
+    harness.run()
+    cprofile.close()
+    if sampler:
+        sampler.close()
+
+
+if __name__ == "__main__":
+    main()
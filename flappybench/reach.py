@@ -0,0 +1,317 @@
+"""Reachability tables: which gap-to-gap moves a bird can physically fly.
+
+Gaps are drawn independently, so nothing stops a generator from putting a
+gap further up or down than the bird can get in the time between pipes.
+For each variant (and bird hitbox) this builds, once, a table of feasible
+``(frames between pipes, next gap top - this gap top)`` pairs from the set of
+(y, velocity) states the physics can reach, after which checking or
+repairing a course costs one lookup per pipe:
+
+    python -m flappybench.reach --courses 1000 --pipes 100
+
+States live on a (velocity, y) lattice measured from the gap top. The table
+is an over-approximation: every state that can leave a pipe alive is assumed
+possible at the next one, and the ceiling and land are ignored between
+pipes. A pair marked infeasible is therefore impossible whatever happened
+before, so the reported share of impossible courses is a lower bound.
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from .cache import Cache, digest
+from .sim import Course, pick
+from .variants import SHAPES, VARIANTS, parse
+
+RES = 0.25  # y lattice step, px
+TABLE_VERSION = 2
+
+
+def _multiple(x, step):
+    return abs(x / step - round(x / step)) < 1e-6
+
+
+def _or_shift(dst, src, k):
+    """dst |= src moved ``k`` cells along the y axis."""
+    n = len(src)
+    if k >= n or -k >= n:
+        return
+    if k >= 0:
+        dst[k:] |= src[:n - k]
+    else:
+        dst[:k] |= src[-k:]
+
+
+class Lattice:
+    """One variant's flight dynamics on a boolean (velocity, y) grid."""
+
+    def __init__(self, variant, hitbox):
+        v = variant
+        g = v.gravity
+        impulses = [v.flap] + ([v.max_up] if v.flap_mode == "clamp" else [])
+        k = 1
+        while k < 100 and not all(_multiple(x, g / k) for x in impulses):
+            k += 1
+        self.dv = dv = g / k
+        if v.flap_mode == "set":
+            lo = v.flap + g
+        elif v.flap_mode == "clamp":
+            lo = v.max_up + g
+        else:
+            lo = 3 * v.flap + g
+        hi = math.sqrt(2 * g * v.land_y) + g  # faster than this means falling off screen
+        j0 = math.floor(lo / dv)
+        self.vel = (j0 + np.arange(math.ceil(hi / dv) - j0 + 1)) * dv
+        self.nv = len(self.vel)
+
+        def row(vel):
+            j = int(round(vel / dv)) - j0
+            return j if 0 <= j < self.nv else -1
+
+        self.fall = [row(u + g) for u in self.vel]
+        if v.flap_mode == "set":
+            self.lift = [row(v.flap + g)] * self.nv
+        elif v.flap_mode == "clamp":
+            self.lift = [row(max(u + v.flap, v.max_up) + g) for u in self.vel]
+        else:
+            self.lift = [row(u + v.flap + g) for u in self.vel]
+        self.shift = [int(round(u / RES)) for u in self.vel]
+
+        _, dy, _, h = hitbox
+        self.y0 = -(v.land_y + v.pipe_gap)
+        self.ny = int(2 * (v.land_y + v.pipe_gap) / RES) + 1
+        r = self.y0 + np.arange(self.ny) * RES
+        # Sim collides on int(y + dy), so being inside the gap is exact here
+        self.band = (r + dy >= 0) & (r + dy < v.pipe_gap - h + 1)
+
+    def empty(self):
+        return np.zeros((self.nv, self.ny), bool)
+
+    def forward(self, states, band=None):
+        """Every state one frame after ``states``, flapping or not."""
+        out = self.empty()
+        for j in np.flatnonzero(states.any(1)):
+            for dest in (self.fall[j], self.lift[j]):
+                if dest >= 0:
+                    _or_shift(out[dest], states[j], self.shift[dest])
+        if band is not None:
+            out &= band
+        return out
+
+    def backward(self, states, band=None):
+        """States from which some action reaches ``states`` next frame."""
+        out = self.empty()
+        for j in range(self.nv):
+            for dest in (self.fall[j], self.lift[j]):
+                if dest >= 0:
+                    _or_shift(out[j], states[dest], -self.shift[dest])
+        if band is not None:
+            out &= band
+        return out
+
+
+def overlap_frames(variant, hitbox):
+    """Frames the bird spends overlapping one pipe (rounded down)."""
+    _, _, w, _ = hitbox
+    return max(int(math.ceil((variant.pipe_width + w) / variant.pipe_speed)) - 1, 1)
+
+
+def periods(variant):
+    """Possible frame counts between consecutive pipes reaching the bird."""
+    v = variant
+    if v.spawn == "timer":
+        # pipes placed before the first frame come one frame closer to the next
+        first = v.spawn_every[0] - 1 if v.initial_pipes else v.spawn_every[0]
+        return list(range(max(first, 1), v.spawn_every[1] + 1))
+    lo, hi = v.spawn_distance
+    if v.spawn == "chain":
+        return sorted({math.ceil(d / v.pipe_speed) for d in range(lo, hi + 1)})
+    # Distance spawns check before pipes move, so the gap is the next whole step
+    return sorted({d // v.pipe_speed + 1 for d in range(lo, hi + 1)})
+
+
+def build(variant, hitbox):
+    """Feasible gap deltas for every period, as {period: bool array}."""
+    lat = Lattice(variant, hitbox)
+    w = overlap_frames(variant, hitbox)
+    band = lat.band
+
+    # States that can leave a pipe alive, and states that can get through one
+    leaving = lat.empty()
+    leaving[:, band] = True
+    for _ in range(w - 1):
+        leaving = lat.forward(leaving, band)
+    safe = lat.empty()
+    safe[:, band] = True
+    for _ in range(w - 1):
+        safe = lat.backward(safe, band)
+    safe = lat.backward(safe)
+
+    span = variant.gap_hi - variant.gap_lo
+    deltas = np.arange(-span, span + 1)
+    n = 2 * lat.ny
+    entry = np.fft.rfft(safe, n, axis=1).conj()
+    cells = np.round(deltas / RES).astype(int) % n
+    table = {}
+    states, frames = leaving, 0
+    for period in periods(variant):
+        while frames < period - w:
+            states = lat.forward(states)
+            frames += 1
+        # Cross-correlate reachable and safe states over every vertical offset
+        corr = np.fft.irfft((np.fft.rfft(states, n, axis=1) * entry).sum(0), n)
+        table[period] = corr[cells] > 0.5
+    return table
+
+
+class ReachTable:
+    """O(1) feasibility checks and repairs for one variant and hitbox."""
+
+    def __init__(self, variant, table):
+        self.variant = variant
+        self.span = variant.gap_hi - variant.gap_lo
+        self.table = table
+        self.nearest = {}
+        for period, ok in table.items():
+            good = np.flatnonzero(ok)
+            if len(good) == 0:
+                self.nearest[period] = None
+                continue
+            idx = np.arange(len(ok))
+            pos = np.clip(np.searchsorted(good, idx), 1, len(good) - 1) if len(good) > 1 else 0
+            if len(good) > 1:
+                left, right = good[pos - 1], good[pos]
+                self.nearest[period] = np.where(idx - left <= right - idx, left, right) - self.span
+            else:
+                self.nearest[period] = np.full(len(ok), good[0] - self.span)
+
+    @classmethod
+    def load(cls, variant, hitbox, cache=None):
+        cache = cache or Cache("reach")
+        key = digest({"variant": variant.params(), "hitbox": list(hitbox), "res": RES,
+                      "version": TABLE_VERSION})
+        data = cache.load(key)
+        if data is None:
+            table = build(variant, hitbox)
+            cache.save(key, {str(p): "".join("1" if b else "0" for b in ok)
+                             for p, ok in table.items()})
+        else:
+            table = {int(p): np.array([c == "1" for c in bits]) for p, bits in data.items()}
+        return cls(variant, table)
+
+    def feasible(self, period, delta):
+        ok = self.table.get(period)
+        if ok is None or not -self.span <= delta <= self.span:
+            return False
+        return bool(ok[delta + self.span])
+
+    def limits(self, period):
+        """Highest climb and deepest drop (px) allowed after ``period`` frames."""
+        good = np.flatnonzero(self.table[period]) - self.span
+        return (-int(good.min()), int(good.max())) if len(good) else (0, 0)
+
+    def check(self, gaps, spacing):
+        """Indices of pipes whose gap can't be reached from the one before."""
+        return [i + 1 for i, (a, b, t) in enumerate(zip(gaps, gaps[1:], spacing))
+                if not self.feasible(t, b - a)]
+
+    def repair(self, gaps, spacing):
+        """Moves each unreachable gap to the nearest reachable height in range."""
+        v = self.variant
+        out = list(gaps[:1])
+        for gap, period in zip(gaps[1:], spacing):
+            delta = gap - out[-1]
+            if not self.feasible(period, delta):
+                nearest = self.nearest.get(period)
+                if nearest is not None:
+                    delta = int(nearest[max(-self.span, min(self.span, delta)) + self.span])
+                gap = max(v.gap_lo, min(v.gap_hi, out[-1] + delta))
+                if not self.feasible(period, gap - out[-1]):
+                    gap = out[-1]
+            out.append(gap)
+        return out
+
+
+def tables(variant):
+    """ReachTable per bird shape, sharing work between identical hitboxes."""
+    built = {}
+    for hitbox in set(variant.hitboxes.values()):
+        built[hitbox] = ReachTable.load(variant, hitbox)
+    return {shape: built[variant.hitboxes[shape]] for shape in SHAPES}
+
+
+def course(variant, seed, pipes):
+    """Gap tops, frames between consecutive pipes and bird shape of a Course."""
+    v = variant
+    c = Course(seed)
+    gaps = [pick(c.draw("gap", i), v.gap_lo, v.gap_hi) for i in range(pipes)]
+    if v.spawn == "timer":
+        # Sim places its first pipes before frame 1 moves them, as if spawned on it
+        starts = [1] * v.initial_pipes
+        t = 0
+        for i in range(pipes - v.initial_pipes):
+            t += pick(c.draw("timer", i), *v.spawn_every)
+            starts.append(t)
+        spacing = [b - a for a, b in zip(starts, starts[1:])]
+    elif v.spawn == "chain":
+        # Sim lays the first pipes out spawn_distance[0] apart; each later one
+        # takes the next spacing draw, from 1 (draw 0 is the unused spawn_offset)
+        distances = [v.spawn_distance[0]] * max(v.initial_pipes - 1, 0)
+        for i in range(1, pipes - len(distances)):
+            distances.append(pick(c.draw("spacing", i), *v.spawn_distance))
+        spacing = [math.ceil(d / v.pipe_speed) for d in distances[:pipes - 1]]
+    else:
+        first = 1 - min(v.initial_pipes, 1)
+        spacing = [pick(c.draw("spacing", i + first), *v.spawn_distance) // v.pipe_speed + 1
+                   for i in range(pipes - 1)]
+    return gaps, spacing, SHAPES[int(c.draw("shape", 0) * 3)]
+
+
+def report(spec, courses, pipes):
+    variant = parse(spec)
+    start = time.perf_counter()
+    by_shape = tables(variant)
+    built = time.perf_counter() - start
+    bad_courses = bad_pipes = 0
+    repaired_ok = True
+    start = time.perf_counter()
+    for seed in range(courses):
+        gaps, spacing, shape = course(variant, seed, pipes)
+        table = by_shape[shape]
+        bad = table.check(gaps, spacing)
+        if bad:
+            bad_courses += 1
+            bad_pipes += len(bad)
+            repaired_ok &= not table.check(table.repair(gaps, spacing), spacing)
+    checked = time.perf_counter() - start
+    table = by_shape["square"]
+    typical = sorted(table.table)[len(table.table) // 2]
+    climb, drop = table.limits(typical)
+    print(f"{spec:24s} impossible courses {bad_courses / courses:6.1%}"
+          f"  pipes {bad_pipes / (courses * (pipes - 1)):6.2%}"
+          f"  | {typical} frames apart: climb <= {climb}px, drop <= {drop}px"
+          f"  | table {built:.1f}s, check {checked * 1e6 / (courses * pipes):.1f}us/pipe"
+          + ("" if repaired_ok else "  (repair left impossible pipes)"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", help="variants to check (default: all)")
+    parser.add_argument("--courses", type=int, default=1000, help="seeded courses per variant")
+    parser.add_argument("--pipes", type=int, default=100, help="pipes per course")
+    args = parser.parse_args()
+    specs = args.variants or list(VARIANTS)
+    try:
+        for spec in specs:
+            parse(spec)
+    except KeyError as e:
+        parser.error(e.args[0])
+    for spec in specs:
+        report(spec, args.courses, args.pipes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Records play as training data (see ``dataset``).
+
+Live mode runs a variant's real main.py and records every frame while a
+round is on, whether a person is playing or the autopilot is pressing SPACE
+for them. Headless mode plays reference policies on seeded courses in
+``Sim``, which is much faster for bulk data:
+
+    python -m flappybench.record o3-mini                      # you play
+    python -m flappybench.record grok3 --bot --seconds 120    # autopilot plays
+    python -m flappybench.record all --headless --policy threshold:8 --courses 500
+    python -m flappybench.record --read data/o3-mini-*        # summarize
+
+Each run writes a new directory under ``data/`` named after the variant,
+source and start time.
+"""
+
+import argparse
+import glob
+import math
+import os
+import time
+
+import numpy as np
+
+from . import policies
+from .autopilot import Autopilot
+from .dataset import Dataset, Recorder
+from .probe import PROBES, State
+from .sim import Sim
+from .variants import VARIANTS
+
+NAN = math.nan
+RESTART_AFTER = 45  # frames the bot waits on a game over screen
+
+
+class Tracker:
+    """Turns a stream of probed states into rows, one episode per round.
+
+    Each row is a state and the action taken in it: ``add`` gets the state
+    the game shows now and the presses that led to it from the previous one,
+    so it writes the previous state's row. ``done`` marks the row whose
+    action ended the round.
+    """
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.episode = -1
+        self.frame = 0
+        self.last = None  # the last playing state, waiting for its action
+
+    def add(self, state, action):
+        if state is None:
+            return
+        last = self.last
+        restarted = last is not None and state.playing and state.score < last.score
+        if last is not None:
+            self._row(last, action, 0 if state.playing and not restarted else 1)
+        if state.playing and (last is None or restarted):
+            self.episode += 1
+            self.frame = 0
+        self.last = state if state.playing else None
+
+    def end(self):
+        """Drops the pending state of a round cut short, whose action never came."""
+        self.last = None
+
+    def _row(self, state, action, done):
+        ahead = [v for p in state.ahead(2) for v in p]
+        ahead += [NAN] * (6 - len(ahead))
+        self.recorder.append(self.episode, self.frame, state.y, state.vel, *ahead,
+                             1 if action else 0, state.score, done)
+        self.frame += 1
+
+
+def out_dir(root, name, source):
+    return os.path.join(root, f"{name}-{source}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+
+# --- Live ---
+def record_live(name, out, bot=False, seconds=None, chunk=4096):
+    from .harness import Harness
+
+    harness = Harness(name)
+    source = "autopilot" if bot else "human"
+    recorder = Recorder(out, {"variant": name, "source": source}, chunk)
+    tracker = Tracker(recorder)
+    pilot = Autopilot(VARIANTS[name]) if bot else None
+    half = VARIANTS[name].hitboxes["square"][3] / 2
+    waited = [0]
+    deadline = time.perf_counter() + seconds if seconds else None
+
+    def on_frame(frame):
+        tracker.add(frame.state, frame.presses)
+        state = frame.state
+        if pilot and state is not None:
+            if state.playing:
+                ahead = state.ahead(1)
+                gap = ahead[0][1:] if ahead else (None, None)
+                if pilot.decide(state.y, state.vel, half, *gap):
+                    harness.press()
+                waited[0] = 0
+            else:
+                waited[0] += 1
+                if waited[0] >= RESTART_AFTER:
+                    harness.press()
+                    waited[0] = 0
+        if deadline and frame.time > deadline and not harness.stopping:
+            harness.stop()
+
+    harness.frame_hooks.append(on_frame)
+    harness.run()
+    recorder.close()
+    return recorder
+
+
+# --- Headless ---
+def record_headless(name, out, policy_spec, courses, max_frames, chunk=4096):
+    variant = VARIANTS[name]
+    policy = policies.make(policy_spec)
+    recorder = Recorder(out, {"variant": name, "source": f"sim/{policy_spec}"}, chunk)
+    tracker = Tracker(recorder)
+    def state(sim, playing):
+        pipes = [(p.x, p.gap_top, p.gap_bottom) for p in sim.pipes]
+        return State(variant.bird_x, sim.y, sim.vel, playing, sim.score, pipes, variant.pipe_width)
+
+    for seed in range(courses):
+        sim = Sim(variant, seed)
+        policy.reset(seed)
+        tracker.add(state(sim, True), False)
+        for _ in range(max_frames):
+            flap = policy(sim)  # decided on the state the tracker is holding
+            over = sim.step(flap) or not sim.alive
+            tracker.add(state(sim, not over), flap)
+            if over:
+                break
+        tracker.end()
+    recorder.close()
+    return recorder
+
+
+def summarize(paths):
+    data = Dataset(*paths)
+    for meta, path in zip(data.meta, paths):
+        print(f"{path}: {meta['variant']} / {meta['source']}, {meta['rows']} frames"
+              f" in {len(meta['shards'])} shards")
+    if len(data):
+        episodes = int((data.column("frame") == 0).sum())
+        done = int(data.column("done").sum())
+        start = time.perf_counter()
+        rows = np.random.default_rng(0).integers(0, len(data), 10000)
+        data.take(rows)
+        took = time.perf_counter() - start
+        print(f"{len(data)} frames, {episodes} episodes, {done} deaths,"
+              f" flap rate {data.column('action').mean():.3f};"
+              f" random access {took * 1e6 / len(rows):.2f}us/frame")
+
+
+def report(recorder, seconds):
+    fps = recorder.rows / seconds if seconds else 0
+    print(f"{recorder.out}: {recorder.rows} frames, {len(recorder.shards)} shards,"
+          f" {fps:.0f} frames/s, writer stalled {recorder.stalled * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", help="variants to record, or 'all'")
+    parser.add_argument("--out", default="data", help="directory for recordings")
+    parser.add_argument("--bot", action="store_true", help="let the autopilot play (live)")
+    parser.add_argument("--seconds", type=float, help="stop a live run after this long")
+    parser.add_argument("--headless", action="store_true", help="play in Sim instead")
+    parser.add_argument("--policy", default="threshold:8", help="headless policy spec")
+    parser.add_argument("--courses", type=int, default=100, help="headless courses per variant")
+    parser.add_argument("--max-frames", type=int, default=3600, help="headless frames per course")
+    parser.add_argument("--chunk", type=int, default=4096, help="frames per shard")
+    parser.add_argument("--read", nargs="+", metavar="DIR", help="summarize recordings")
+    args = parser.parse_args()
+    if args.read:
+        summarize([p for pattern in args.read for p in sorted(glob.glob(pattern)) or [pattern]])
+        return
+    names = list(PROBES) if args.variants == ["all"] else args.variants
+    if not names:
+        parser.error("name a variant, 'all', or --read")
+    for name in names:
+        if name not in PROBES:
+            parser.error(f"unknown variant {name!r}, pick one of: {', '.join(PROBES)}")
+    if not args.headless and len(names) > 1 and not args.bot:
+        parser.error("record one variant at a time when playing yourself")
+    try:
+        policies.make(args.policy)
+    except KeyError as e:
+        parser.error(e.args[0])
+    for name in names:
+        start = time.perf_counter()
+        if args.headless:
+            source = args.policy.replace(":", "_").replace(",", "_")
+            recorder = record_headless(name, out_dir(args.out, name, source), args.policy,
+                                       args.courses, args.max_frames, args.chunk)
+        else:
+            source = "bot" if args.bot else "human"
+            recorder = record_live(name, out_dir(args.out, name, source), args.bot,
+                                   args.seconds, args.chunk)
+        report(recorder, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
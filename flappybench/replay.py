@@ -0,0 +1,144 @@
+"""Input logs with periodic state keyframes, and a ghost that replays them.
+
+A run is stored as the ticks on which SPACE was pressed plus a copy of the
+bird state every ``interval`` ticks. Seeking to any tick restores the nearest
+keyframe at or before it and re-simulates at most ``interval`` ticks, so a
+ghost can be scrubbed, resynced or started mid-run without replaying from 0.
+"""
+
+import bisect
+import json
+import os
+import time
+
+
+class InputLog:
+    """Flap ticks and bird keyframes for one run of a seeded course."""
+
+    def __init__(self, seed=None, interval=60):
+        self.seed = seed
+        self.interval = interval
+        self.flaps = []  # sorted tick numbers, one entry per SPACE press
+        self.keyframes = []  # bird state at ticks 0, interval, 2 * interval, ...
+        self.length = 0  # ticks recorded
+        self.score = 0
+
+    def start(self, state):
+        """Records the bird state before the first tick."""
+        self.flaps.clear()
+        self.keyframes = [tuple(state)]
+        self.length = 0
+        self.score = 0
+
+    def flap(self, tick):
+        self.flaps.append(tick)
+
+    def tick(self, state, score):
+        """Records the state after one more tick has been simulated."""
+        self.length += 1
+        self.score = score
+        if self.length % self.interval == 0:
+            self.keyframes.append(tuple(state))
+
+    def truncate(self, tick):
+        """Forgets everything from ``tick`` on, e.g. after a rewind."""
+        del self.flaps[bisect.bisect_left(self.flaps, tick):]
+        del self.keyframes[tick // self.interval + 1:]
+        self.length = min(self.length, tick)
+
+    def to_dict(self):
+        return {
+            "seed": self.seed,
+            "interval": self.interval,
+            "length": self.length,
+            "score": self.score,
+            "flaps": self.flaps,
+            "keyframes": [list(k) for k in self.keyframes],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        log = cls(data["seed"], data["interval"])
+        log.length = data["length"]
+        log.score = data["score"]
+        log.flaps = list(data["flaps"])
+        log.keyframes = [tuple(k) for k in data["keyframes"]]
+        return log
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the saved log, or None if there is none yet."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class Ghost:
+    """Drives a bird object through a recorded InputLog.
+
+    The game supplies the bird plus ``get_state``/``set_state`` callables that
+    read and write the tuple stored in keyframes, so the same ghost works for
+    any variant whose bird has ``flap()`` (or ``jump()``) and ``update()``.
+    Time spent per frame is measured; the work itself is bounded by the
+    keyframe interval, since no seek re-simulates more ticks than that.
+    """
+
+    def __init__(self, log, bird, get_state, set_state, flap="flap"):
+        self.log = log
+        self.bird = bird
+        self.get_state = get_state
+        self.set_state = set_state
+        self._flap = getattr(bird, flap)
+        self.tick = 0
+        self._next_flap = 0  # index into log.flaps of the next flap to apply
+        self.last_ms = 0.0
+        self.worst_ms = 0.0
+        self.total_ms = 0.0
+        self.frames = 0
+        self.seek(0)
+
+    @property
+    def finished(self):
+        return self.tick >= self.log.length
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.frames if self.frames else 0.0
+
+    def _advance(self):
+        flaps = self.log.flaps
+        while self._next_flap < len(flaps) and flaps[self._next_flap] == self.tick:
+            self._flap()
+            self._next_flap += 1
+        self.bird.update()
+        self.tick += 1
+
+    def seek(self, tick):
+        """Jumps to ``tick`` via the closest keyframe at or before it."""
+        tick = max(0, min(tick, self.log.length))
+        k = min(tick // self.log.interval, len(self.log.keyframes) - 1)
+        self.set_state(self.bird, self.log.keyframes[k])
+        self.tick = k * self.log.interval
+        self._next_flap = bisect.bisect_left(self.log.flaps, self.tick)
+        while self.tick < tick:
+            self._advance()
+
+    def update(self, tick):
+        """Moves the ghost to the player's tick, stepping once when in sync."""
+        start = time.perf_counter()
+        if self.finished and tick >= self.log.length:
+            pass  # stays at the end of the run until the player rewinds into it
+        elif tick == self.tick + 1:
+            self._advance()
+        elif tick != self.tick:
+            self.seek(tick)
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.worst_ms = max(self.worst_ms, self.last_ms)
+        self.total_ms += self.last_ms
+        self.frames += 1
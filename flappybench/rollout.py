@@ -0,0 +1,248 @@
+"""Rollout service: policies played on every core, results in shared memory.
+
+``RolloutPool`` keeps a process pool alive between batches. Each worker
+parses variants and builds policies once and then plays seeded courses in
+``Sim``, writing every frame's bird y and flap straight into arrays that live
+in one ``multiprocessing.shared_memory`` block; only row counts travel back
+through the pool. The parent hands out seeds and reads the arrays in place:
+
+    with RolloutPool() as pool:
+        batch = pool.run("o3-mini", "threshold:8", range(1000))
+        print(batch.stats())
+
+``python -m flappybench.rollout --bench`` plays the same batch with 1, 2, 4,
+... workers up to ``--jobs`` (default: the core count) and prints the speedup.
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from . import policies
+from .sim import CAUSES, Sim
+from .variants import parse
+
+CHUNK = 25  # seeds per job
+SURVIVED = 0  # cause code; deaths are 1 + index into CAUSES
+
+
+class Buffers:
+    """Per-rollout results and trajectories packed into one shared block."""
+
+    def __init__(self, rows, max_frames, name=None):
+        self.rows = rows
+        self.max_frames = max_frames
+        layout = [
+            ("seed", np.int64, (rows,)),
+            ("frames", np.int32, (rows,)),
+            ("score", np.int32, (rows,)),
+            ("cause", np.int8, (rows,)),
+            ("y", np.float32, (rows, max_frames)),
+            ("flap", np.uint8, (rows, max_frames)),
+        ]
+        size = sum(np.dtype(t).itemsize * int(np.prod(s)) for _, t, s in layout)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        else:
+            self.shm = shared_memory.SharedMemory(name)
+        offset = 0
+        for field, dtype, shape in layout:
+            array = np.ndarray(shape, dtype, self.shm.buf, offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        for field in ("seed", "frames", "score", "cause", "y", "flap"):
+            setattr(self, field, None)  # drop views so the block can be released
+        self.shm.close()
+
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
+
+
+# --- Workers ---
+_worker = {"buffers": None, "variants": {}, "policies": {}}
+
+
+def _buffers(name, rows, max_frames):
+    current = _worker["buffers"]
+    if current is None or current.name != name:
+        if current is not None:
+            current.close()
+        current = _worker["buffers"] = Buffers(rows, max_frames, name)
+    return current
+
+
+def _play(job):
+    name, rows, max_frames, variant_spec, policy_spec, first, seeds = job
+    buf = _buffers(name, rows, max_frames)
+    variants, made = _worker["variants"], _worker["policies"]
+    if variant_spec not in variants:
+        variants[variant_spec] = parse(variant_spec)
+    if policy_spec not in made:
+        made[policy_spec] = policies.make(policy_spec)
+    variant, policy = variants[variant_spec], made[policy_spec]
+    y, flaps = buf.y, buf.flap
+    for row, seed in enumerate(seeds, first):
+        sim = Sim(variant, seed)
+        policy.reset(seed)
+        cause = SURVIVED
+        t = 0
+        while t < max_frames:
+            flap = policy(sim)
+            over = sim.step(flap)
+            flaps[row, t] = flap
+            y[row, t] = sim.y
+            t += 1
+            if over or not sim.alive:
+                cause = CAUSES.index(sim.cause) + 1
+                break
+        buf.seed[row] = seed
+        buf.frames[row] = t
+        buf.score[row] = sim.score
+        buf.cause[row] = cause
+    return len(seeds)
+
+
+# --- Parent ---
+class Batch:
+    """Views of one run's rows; valid until the pool's next run."""
+
+    def __init__(self, buffers, n, seconds):
+        self.seed = buffers.seed[:n]
+        self.frames = buffers.frames[:n]
+        self.score = buffers.score[:n]
+        self.cause = buffers.cause[:n]
+        self.y = buffers.y[:n]
+        self.flap = buffers.flap[:n]
+        self.seconds = seconds
+
+    def __len__(self):
+        return len(self.seed)
+
+    def trajectory(self, i):
+        """(y, flap) per frame of rollout ``i``."""
+        n = self.frames[i]
+        return self.y[i, :n], self.flap[i, :n]
+
+    def stats(self):
+        n = len(self)
+        frames = int(self.frames.sum())
+        causes = np.bincount(self.cause, minlength=len(CAUSES) + 1)
+        return {
+            "rollouts": n,
+            "frames": frames,
+            "seconds": self.seconds,
+            "rollouts_per_s": n / self.seconds if self.seconds else 0.0,
+            "frames_per_s": frames / self.seconds if self.seconds else 0.0,
+            "score_mean": float(self.score.mean()) if n else 0.0,
+            "score_max": int(self.score.max()) if n else 0,
+            "survived": float(causes[SURVIVED] / n) if n else 0.0,
+            "causes": {c: int(causes[i + 1]) for i, c in enumerate(CAUSES) if causes[i + 1]},
+        }
+
+
+class RolloutPool:
+    def __init__(self, processes=None, chunk=CHUNK):
+        self.processes = processes or os.cpu_count()
+        self.chunk = chunk
+        # Workers must share the parent's resource tracker, or each of them
+        # would try to clean up the shared blocks it attached to on exit
+        resource_tracker.ensure_running()
+        self.pool = multiprocessing.Pool(self.processes)
+        self.buffers = None
+
+    def _reserve(self, rows, max_frames):
+        buf = self.buffers
+        if buf is not None and buf.rows >= rows and buf.max_frames == max_frames:
+            return buf
+        if buf is not None:
+            buf.unlink()
+        self.buffers = Buffers(max(rows, buf.rows if buf else 0), max_frames)
+        return self.buffers
+
+    def run(self, variant_spec, policy_spec, seeds, max_frames=3600):
+        """Plays ``policy_spec`` on every seed; returns a Batch."""
+        seeds = list(seeds)
+        buf = self._reserve(len(seeds), max_frames)
+        jobs = [(buf.name, buf.rows, max_frames, variant_spec, policy_spec, i,
+                 seeds[i:i + self.chunk]) for i in range(0, len(seeds), self.chunk)]
+        start = time.perf_counter()
+        done = sum(self.pool.imap_unordered(_play, jobs))
+        assert done == len(seeds)
+        return Batch(buf, len(seeds), time.perf_counter() - start)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        if self.buffers is not None:
+            self.buffers.unlink()
+            self.buffers = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def print_stats(label, s):
+    causes = ", ".join(f"{c} {n}" for c, n in s["causes"].items())
+    print(f"{label:36s} {s['rollouts']:6d} rollouts {s['frames_per_s']:10.0f} frames/s"
+          f"  score mean {s['score_mean']:6.1f} max {s['score_max']:4d}"
+          f"  survived {s['survived']:4.0%}  {causes}")
+
+
+def bench(variant_spec, policy_spec, courses, max_frames, most=None):
+    """Same batch at 1, 2, 4, ... ``most`` workers; prints throughput and speedup."""
+    most = most or os.cpu_count()
+    counts = sorted({min(2 ** i, most) for i in range(most.bit_length() + 1)})
+    base = None
+    print(f"{variant_spec} / {policy_spec}: {courses} courses, {os.cpu_count()} cores")
+    for n in counts:
+        with RolloutPool(n) as pool:
+            pool.run(variant_spec, policy_spec, range(n * 2), max_frames)  # warm up workers
+            s = pool.run(variant_spec, policy_spec, range(courses), max_frames).stats()
+        base = base or s["frames_per_s"]
+        speedup = s["frames_per_s"] / base
+        print(f"  {n:3d} workers  {s['frames_per_s']:10.0f} frames/s  {speedup:5.2f}x"
+              f"  ({speedup / n:4.0%} per worker)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", default=["o3-mini"], help="variants to play")
+    parser.add_argument("--policy", default="threshold:8", help="policy spec")
+    parser.add_argument("--courses", type=int, default=1000, help="seeded courses per variant")
+    parser.add_argument("--seconds", type=float, default=60, help="longest run to play")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--bench", action="store_true", help="measure scaling with worker count")
+    args = parser.parse_args()
+    try:
+        for spec in args.variants:
+            parse(spec)
+        policies.make(args.policy)
+    except KeyError as e:
+        parser.error(e.args[0])
+    max_frames = int(args.seconds * 60)
+    if args.bench:
+        for spec in args.variants:
+            bench(spec, args.policy, args.courses, max_frames, args.jobs)
+        return
+    with RolloutPool(args.jobs) as pool:
+        for spec in args.variants:
+            print_stats(f"{spec} / {args.policy}", pool.run(spec, args.policy,
+                                                            range(args.courses), max_frames).stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Scroll-based rendering: move last frame's pixels instead of redrawing.
+
+Pipes move exactly ``PIPE_SPEED`` pixels a frame, so most of a new frame is
+the previous one shifted left. ``ScrollRenderer`` keeps the scene (sky,
+pipes, land) on screen between frames: it scrolls the surface with
+``Surface.scroll(-speed, 0)``, paints the strip that scrolled into view and
+repaints the spots where sprites and text were drawn last frame. The game then draws its bird and HUD on top and reports the rects.
+Repaints go through the game's own scene-drawing function with a clip rect,
+so both render paths draw the same pixels.
+
+Whether this wins depends on the window size and on how much of the scene
+is flat fill, so it is measured against full redraws here:
+
+    python -m flappybench.scroll --sizes 400x600,800x600,1280x720,1920x1080
+"""
+
+import argparse
+import random
+import time
+
+import pygame
+
+
+class ScrollRenderer:
+    def __init__(self, surface, speed, paint):
+        self.surface = surface
+        self.speed = speed
+        self.paint = paint  # paint(surface) draws the scene; honours the clip rect
+        self.dirty = []  # rects drawn over the scene last frame
+        self.valid = False
+        self.repainted = 0  # pixels painted by the last frame()
+
+    def invalidate(self):
+        """Repaint everything next frame, e.g. after a restart or a rewind."""
+        self.valid = False
+
+    def _paint(self, rect):
+        surface = self.surface
+        rect = rect.clip(surface.get_rect())
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        surface.set_clip(rect)
+        self.paint(surface)
+        surface.set_clip(None)
+        self.repainted += rect.width * rect.height
+
+    def frame(self, scrolled=True):
+        """Brings the scene up to date; ``scrolled`` if the pipes moved this frame."""
+        surface = self.surface
+        self.repainted = 0
+        if not self.valid:
+            self._paint(surface.get_rect())
+            self.dirty = []
+            self.valid = True
+            return
+        shift = 0
+        if scrolled:
+            shift = -self.speed
+            surface.scroll(shift, 0)
+            width, height = surface.get_size()
+            self._paint(pygame.Rect(width - self.speed, 0, self.speed, height))
+        # Last frame's sprites moved with the scroll; paint today's scene over them
+        for rect in self.dirty:
+            self._paint(rect.move(shift, 0))
+        self.dirty = []
+
+    def drawn(self, rects):
+        """Rects drawn over the scene this frame, to be restored next frame."""
+        self.dirty.extend(pygame.Rect(r) for r in rects if r)
+
+
+# --- Benchmark ---
+class Scene:
+    """Pipes, land and a bobbing bird like the variants draw them."""
+
+    def __init__(self, width, height, speed=3, seed=0):
+        self.width = width
+        self.height = height
+        self.speed = speed
+        self.land = height - 80
+        self.rng = random.Random(seed)
+        self.pipes = []
+        self.frame = 0
+        x = width // 2
+        while x < width + 300:
+            self._add(x)
+            x += 250
+        self.font = pygame.font.Font(None, 36)
+
+    def _add(self, x):
+        top = self.rng.randint(80, self.land - 230)
+        self.pipes.append([x, top, (34, 139, 34)])
+
+    def update(self):
+        self.frame += 1
+        for p in self.pipes:
+            p[0] -= self.speed
+        if self.pipes[0][0] + 70 <= 0:
+            self.pipes.pop(0)
+        if self.pipes[-1][0] < self.width:
+            self._add(self.pipes[-1][0] + 250)
+
+    def paint(self, surface):
+        surface.fill((135, 206, 235))
+        for x, top, color in self.pipes:
+            pygame.draw.rect(surface, color, (x, 0, 70, top))
+            pygame.draw.rect(surface, color, (x, top + 150, 70, self.land - top - 150))
+        pygame.draw.rect(surface, (222, 184, 135), (0, self.land, self.width, self.height - self.land))
+
+    def overlay(self, surface):
+        y = self.height // 2 + int(80 * ((self.frame % 120) / 60 - 1) ** 2) - 40
+        bird = pygame.draw.circle(surface, (200, 40, 40), (self.width // 4, y), 15)
+        text = self.font.render(f"Score: {self.frame // 80}", True, (0, 0, 0))
+        return [bird, surface.blit(text, (self.width - text.get_width() - 20, 20))]
+
+
+def bench(size, frames, check):
+    width, height = size
+    screen = pygame.display.set_mode(size)
+    results = {}
+    snapshots = {}
+    for mode in ("full", "scroll"):
+        scene = Scene(width, height)
+        scroller = ScrollRenderer(screen, scene.speed, scene.paint)
+        start = time.perf_counter()
+        for i in range(frames):
+            scene.update()
+            if mode == "full":
+                scene.paint(screen)
+                scene.overlay(screen)
+            else:
+                scroller.frame()
+                scroller.drawn(scene.overlay(screen))
+            pygame.display.flip()
+            if check and i % 97 == 0:
+                snapshots.setdefault(i, []).append(pygame.image.tobytes(screen, "RGB"))
+        results[mode] = (time.perf_counter() - start) * 1000 / frames
+    same = all(a == b for a, b in snapshots.values())
+    return results, same
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="400x600,500x700,800x600,1280x720,1920x1080",
+                        help="comma separated WxH window sizes")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--check", action="store_true", help="compare frames pixel by pixel")
+    args = parser.parse_args()
+    pygame.init()
+    print(f"video driver: {pygame.display.get_driver()}")
+    for item in args.sizes.split(","):
+        size = tuple(int(v) for v in item.lower().split("x"))
+        results, same = bench(size, args.frames, args.check)
+        full, scroll = results["full"], results["scroll"]
+        note = "" if not args.check else ("  frames identical" if same else "  FRAMES DIFFER")
+        print(f"{item:>10s}  full redraw {full:6.3f} ms  scroll {scroll:6.3f} ms"
+              f"  {full / scroll:5.2f}x{note}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Display-free simulation of a variant, one frame per ``step``.
+
+The course comes from a seeded ``Course``, so the same seed and the same
+flaps always replay the same run, and different variants given the same seed
+see gaps at the same relative heights. Nothing here touches pygame.
+"""
+
+import copy
+import random
+
+from .variants import SHAPES
+
+# Causes of death
+CEILING = "ceiling"
+LAND = "land"
+TOP_PIPE = "top pipe"
+BOTTOM_PIPE = "bottom pipe"
+CAUSES = (CEILING, LAND, TOP_PIPE, BOTTOM_PIPE)
+
+
+def pick(u, lo, hi):
+    """Maps a uniform draw in [0, 1) onto ``randint(lo, hi)``."""
+    return lo + int(u * (hi - lo + 1))
+
+
+class Course:
+    """Random draws behind a run, one independent stream per kind of draw.
+
+    Variants consume draws differently (a timer variant never asks for a
+    spacing), so separate streams keep pipe ``n`` on the same draw everywhere.
+    Draws are kept in lists, so any number of sims can share one course and
+    every restart replays it from the first pipe.
+    """
+
+    KINDS = ("gap", "spacing", "timer", "shape")
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.streams = {kind: random.Random(f"{seed}:{kind}") for kind in self.KINDS}
+        self.gap = []
+        self.spacing = []
+        self.timer = []
+        self.shape = []
+
+    def draw(self, kind, i):
+        values = getattr(self, kind)
+        while len(values) <= i:
+            values.append(self.streams[kind].random())
+        return values[i]
+
+
+class Pipe:
+    __slots__ = ("id", "x", "gap_top", "gap_bottom", "passed")
+
+    def __init__(self, id, x, gap_top, gap_bottom):
+        self.id = id
+        self.x = x
+        self.gap_top = gap_top
+        self.gap_bottom = gap_bottom
+        self.passed = False
+
+
+class Sim:
+    """One bird on one seeded course, advanced a frame at a time."""
+
+    def __init__(self, variant, seed=0, shape=None, course=None):
+        self.variant = variant
+        self.seed = seed
+        self.course = course or Course(seed)
+        self.fixed_shape = shape
+        self.best = 0
+        self.restarts = -1
+        self.frames = 0  # frames stepped over all runs
+        self.reset()
+
+    # --- Course ---
+    def _gap(self):
+        v = self.variant
+        top = pick(self.course.draw("gap", self.next_id), v.gap_lo, v.gap_hi)
+        return top, top + v.pipe_gap
+
+    def _spacing(self):
+        self.spacings += 1
+        return pick(self.course.draw("spacing", self.spacings), *self.variant.spawn_distance)
+
+    def _timer(self):
+        self.timers += 1
+        return pick(self.course.draw("timer", self.timers), *self.variant.spawn_every)
+
+    def _add_pipe(self, x):
+        gap_top, gap_bottom = self._gap()
+        self.pipes.append(Pipe(self.next_id, x, gap_top, gap_bottom))
+        self.next_id += 1
+
+    # --- Runs ---
+    def reset(self):
+        """Starts a new run on the continuing course; the best score is kept."""
+        v = self.variant
+        self.restarts += 1
+        self.tick = 0
+        self.y = float(v.bird_y)
+        self.vel = 0.0
+        self.shape = self.fixed_shape or SHAPES[int(self.course.draw("shape", 0) * 3)]
+        self.hitbox = v.hitboxes[self.shape]
+        self.alive = True  # the bird
+        self.over = False  # the game
+        self.cause = None
+        self.score = 0
+        self.pipes = []
+        self.next_id = 0  # also the index of the next gap drawn from the course
+        self.spacings = -1
+        self.timers = -1
+        self.passed_indices = set()
+        if "best_resets" in v.quirks:
+            self.best = 0
+        for i in range(v.initial_pipes):
+            step = v.spawn_distance[0] if v.spawn == "chain" else 0
+            self._add_pipe(v.spawn_x + i * step)
+        self.spawn_in = self._timer()
+        self.spawn_offset = self._spacing()
+
+    def press(self):
+        """SPACE: flap while playing, restart once the game is over."""
+        if self.over:
+            if "restart_resumes" in self.variant.quirks:
+                # o1 only resets when SPACE is still held on the next frame
+                self.over = False
+                self.alive = True
+            else:
+                self.reset()
+                return
+        if not self.alive:
+            return
+        v = self.variant
+        if v.flap_mode == "set":
+            self.vel = v.flap
+        else:
+            self.vel += v.flap
+            if v.flap_mode == "clamp" and self.vel < v.max_up:
+                self.vel = v.max_up
+
+    def _die(self, cause):
+        self.over = True
+        self.alive = False
+        self.cause = cause
+
+    def _record_best(self):
+        v = self.variant
+        if "best_resets" in v.quirks:
+            return
+        if "best_on_land_only" in v.quirks and self.cause in (TOP_PIPE, BOTTOM_PIPE):
+            return
+        if self.score > self.best:
+            self.best = self.score
+
+    # --- Frame ---
+    def _move_bird(self):
+        v = self.variant
+        if not self.alive:
+            return
+        self.vel += v.gravity
+        self.y += self.vel
+        half = v.bird_size // 2
+        if v.ceiling == "clamp":
+            if self.y - half <= 0:
+                self.y = half
+                self.vel = 0.0
+        elif v.ceiling == "die":
+            if self.y + self.hitbox[1] <= 0:
+                self._die(CEILING)
+        elif v.ceiling == "offscreen":
+            if self.y + half < 0:
+                self._die(CEILING)
+        if v.land == "clamp":
+            if self.y > v.land_y - half:
+                self.y = v.land_y - half
+                self.vel = 0.0
+        elif v.land == "stop":
+            if self.y + half >= v.land_y:
+                self.y = v.land_y - half
+                self.alive = False
+                self.cause = LAND
+        elif self.y + self.hitbox[1] + self.hitbox[3] >= v.land_y and not self.over:
+            self._die(LAND)
+
+    def _move_pipes(self):
+        v = self.variant
+        pipes = self.pipes
+        if v.spawn == "timer":
+            self.spawn_in -= 1
+            if self.spawn_in <= 0:
+                self._add_pipe(v.spawn_x)
+                self.spawn_in = self._timer()
+        elif v.spawn == "distance":
+            if not pipes or pipes[-1].x < v.spawn_x - self.spawn_offset:
+                self._add_pipe(v.spawn_x)
+                self.spawn_offset = self._spacing()
+        for p in pipes:
+            p.x -= v.pipe_speed
+        if v.spawn == "chain":
+            if pipes and pipes[0].x + v.pipe_width < 0:
+                pipes.pop(0)
+                self._add_pipe(pipes[-1].x + self._spacing())
+        elif pipes and pipes[0].x + v.pipe_width <= 0:
+            self.pipes = [p for p in pipes if p.x + v.pipe_width > 0]
+
+    def _collide(self):
+        v = self.variant
+        if not self.alive:
+            return
+        dx, dy, w, h = self.hitbox
+        left = int(v.bird_x + dx)
+        right = left + w
+        top = int(self.y + dy)
+        bottom = top + h
+        for p in self.pipes:
+            if p.x < right and left < p.x + v.pipe_width:
+                if top < p.gap_top and bottom > 0:
+                    self._die(TOP_PIPE)
+                    return
+                if bottom > p.gap_bottom and top < v.bottom_end:
+                    self._die(BOTTOM_PIPE)
+                    return
+
+    def score_line(self, pipe):
+        """x at which the bird counts as having passed ``pipe``."""
+        v = self.variant
+        if v.score_at == "leading":
+            return pipe.x
+        if v.score_at == "center":
+            return pipe.x + v.pipe_width // 2
+        return pipe.x + v.pipe_width
+
+    def _score(self):
+        v = self.variant
+        if "score_by_index" in v.quirks:
+            # o1 remembers list positions, which shift after pipes.pop(0)
+            for i, p in enumerate(self.pipes):
+                if self.score_line(p) < v.bird_x and i not in self.passed_indices:
+                    self.passed_indices.add(i)
+                    self.score += 1
+            return
+        for p in self.pipes:
+            if not p.passed and self.score_line(p) < v.bird_x:
+                p.passed = True
+                self.score += 1
+
+    def step(self, flap=False):
+        """Advances one frame, pressing SPACE first if ``flap``. Returns ``over``."""
+        if flap:
+            self.press()
+        if self.over:
+            return True
+        self.frames += 1
+        self.tick += 1
+        v = self.variant
+        if v.pipes_first:
+            self._move_pipes()
+            self._collide()
+            if not self.over:
+                self._move_bird()
+        else:
+            self._move_bird()
+            self._move_pipes()
+            if not self.over:
+                self._collide()
+        # Pipes passed on the frame the bird dies still score; some variants
+        # save the best score before counting them
+        if self.over and v.best_before_score:
+            self._record_best()
+        self._score()
+        if self.over and not v.best_before_score:
+            self._record_best()
+        return self.over
+
+    def clone(self):
+        """Independent copy for look-ahead; the course is shared."""
+        other = copy.copy(self)
+        other.pipes = [copy.copy(p) for p in self.pipes]
+        other.passed_indices = set(self.passed_indices)
+        return other
+
+    def next_pipe(self):
+        """The first pipe whose trailing edge is still ahead of the bird."""
+        v = self.variant
+        left = v.bird_x + self.hitbox[0]
+        for p in self.pipes:
+            if p.x + v.pipe_width >= left:
+                return p
+        return None
+
+    def state(self):
+        """Plain tuple of everything that decides what happens next."""
+        return (
+            self.tick, self.y, self.vel, self.alive, self.over, self.score,
+            tuple((p.x, p.gap_top, p.gap_bottom, p.passed) for p in self.pipes),
+        )
+
+
+def run(variant, seed, flaps, length):
+    """Replays a list of flap ticks for ``length`` frames and returns the Sim."""
+    sim = Sim(variant, seed)
+    flaps = set(flaps)
+    for t in range(length):
+        sim.step(t in flaps)
+    return sim
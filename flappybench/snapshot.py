@@ -0,0 +1,118 @@
+"""Per-frame game snapshots packed into a fixed-size ring buffer.
+
+Every record has the same size, so frame ``n`` lives at a known offset and
+rewinding to any buffered frame is a single ``struct.unpack_from``.
+"""
+
+import struct
+
+FPS = 60
+MAX_PIPES = 8
+
+# frame, bird y, bird velocity, shape, bird r/g/b, alive, score, best, extra, pipe count
+HEADER = struct.Struct("<IffBBBBBHHIB")
+# pipe x, gap top, gap bottom, r/g/b, passed
+PIPE = struct.Struct("<hhhBBBB")
+RECORD_SIZE = HEADER.size + MAX_PIPES * PIPE.size
+
+SHAPES = ("square", "circle", "triangle")
+
+
+class Snapshot:
+    """Unpacked view of one frame."""
+
+    __slots__ = ("frame", "y", "velocity", "shape", "color", "alive", "score",
+                 "best", "pipes", "extra")
+
+    def __init__(self, frame, y, velocity, shape, color, alive, score, best, pipes, extra=0):
+        self.frame = frame
+        self.y = y
+        self.velocity = velocity
+        self.shape = shape
+        self.color = color
+        self.alive = alive
+        self.score = score
+        self.best = best
+        # list of (x, gap_top, gap_bottom, color, passed)
+        self.pipes = pipes
+        # one variant-specific counter the fields above don't cover
+        self.extra = extra
+
+
+def pack_into(buf, offset, frame, y, velocity, shape, color, alive, score, best, pipes, extra=0):
+    """Writes one frame at ``offset``. Pipes beyond MAX_PIPES are dropped."""
+    pipes = pipes[:MAX_PIPES]
+    HEADER.pack_into(
+        buf, offset, frame, y, velocity, SHAPES.index(shape),
+        color[0], color[1], color[2], alive, score, best, extra, len(pipes),
+    )
+    offset += HEADER.size
+    for x, gap_top, gap_bottom, pipe_color, passed in pipes:
+        PIPE.pack_into(
+            buf, offset, int(x), int(gap_top), int(gap_bottom),
+            pipe_color[0], pipe_color[1], pipe_color[2], passed,
+        )
+        offset += PIPE.size
+
+
+def unpack_from(buf, offset):
+    """Reads the frame written at ``offset`` back into a Snapshot."""
+    frame, y, velocity, shape, r, g, b, alive, score, best, extra, count = HEADER.unpack_from(
+        buf, offset
+    )
+    offset += HEADER.size
+    pipes = []
+    for _ in range(count):
+        x, gap_top, gap_bottom, pr, pg, pb, passed = PIPE.unpack_from(buf, offset)
+        pipes.append((x, gap_top, gap_bottom, (pr, pg, pb), bool(passed)))
+        offset += PIPE.size
+    return Snapshot(frame, y, velocity, SHAPES[shape], (r, g, b), bool(alive),
+                    score, best, pipes, extra)
+
+
+class SnapshotRing:
+    """Keeps the last ``capacity`` frames in one preallocated bytearray."""
+
+    def __init__(self, seconds=10, fps=FPS):
+        self.capacity = int(seconds * fps)
+        self.buffer = bytearray(self.capacity * RECORD_SIZE)
+        self.count = 0  # frames currently stored
+        self.head = 0  # slot the next push writes to
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return len(self.buffer)
+
+    def clear(self):
+        self.count = 0
+        self.head = 0
+
+    def push(self, frame, y, velocity, shape, color, alive, score, best, pipes, extra=0):
+        pack_into(self.buffer, self.head * RECORD_SIZE, frame, y, velocity, shape,
+                  color, alive, score, best, pipes, extra)
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _slot(self, frames_ago):
+        if not 0 <= frames_ago < self.count:
+            raise IndexError(f"only {self.count} frames buffered")
+        return (self.head - 1 - frames_ago) % self.capacity
+
+    def peek(self, frames_ago=0):
+        """Returns the snapshot ``frames_ago`` frames back without dropping it."""
+        return unpack_from(self.buffer, self._slot(frames_ago) * RECORD_SIZE)
+
+    def rewind(self, frames):
+        """Drops the newest ``frames`` snapshots and returns the one now on top.
+
+        Asking for more than is buffered rewinds to the oldest frame kept.
+        """
+        frames = min(frames, self.count - 1)
+        snap = self.peek(frames)
+        self.head = (self.head - frames) % self.capacity
+        self.count -= frames
+        return snap
@@ -0,0 +1,275 @@
+"""Soak test: a day of play in minutes, watching memory and frame times.
+
+Each variant runs its own loop through the harness with the clock sped up:
+``Clock.tick``, ``pygame.time.delay`` and ``asyncio.sleep`` return at once
+but advance a virtual clock by the frame they asked for, and
+``pygame.time.get_ticks``/``set_timer`` run on that clock, so pipes spawn
+on schedule however fast frames come. The autopilot plays rounds of
+``--round`` seconds, then lets the bird fall so the game restarts.
+
+Every ``--sample`` minutes of game time the soak records RSS, traced
+memory (``tracemalloc``), live objects by type and frame-time percentiles,
+and at the end flags what grew between the first sample and the last:
+
+    python -m flappybench.soak o1 --hours 24
+    python -m flappybench.soak all --hours 2 --no-tracemalloc
+
+``all`` runs each variant in a fresh process so their memory doesn't mix.
+Use the dummy video driver (``SDL_VIDEODRIVER=dummy``) to run without a window.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import pygame
+
+from . import pacing, probe
+from .autopilot import Autopilot
+from .harness import Harness
+from .variants import VARIANTS
+
+FPS = 60
+RESTART_AFTER = 45
+
+# Growth worth flagging between the first sample and the last
+RSS_MB = 5.0
+TRACED_KB = 256
+OBJECTS = 1000
+FRAME_P99 = 1.5  # ratio
+
+
+# --- Virtual clock ---
+class VirtualClock(pacing.Pacer):
+    """A pacer that never waits; time moves by exactly one requested frame per wait."""
+
+    mode = "virtual"
+
+    def __init__(self):
+        super().__init__()
+        self.ms = 0.0
+        self.timers = {}  # event type -> [interval, due, loops left (0 = forever)]
+
+    def wait(self, fps=0):
+        step = 1000 / (fps or FPS)
+        self.ms += step
+        self._fire()
+        self.last_ms = round(step)
+        return self.last_ms
+
+    def get_ticks(self):
+        return int(self.ms)
+
+    def set_timer(self, event, millis, loops=0):
+        kind = event if isinstance(event, int) else event.type
+        if millis <= 0:
+            self.timers.pop(kind, None)
+        else:
+            self.timers[kind] = [millis, self.ms + millis, loops]
+
+    def _fire(self):
+        for kind, timer in list(self.timers.items()):
+            interval, due, loops = timer
+            while due <= self.ms:
+                pygame.event.post(pygame.event.Event(kind))
+                due += interval
+                if loops:
+                    loops -= 1
+                    if not loops:
+                        del self.timers[kind]
+                        break
+            timer[1:] = due, loops
+
+
+@contextlib.contextmanager
+def accelerated(clock):
+    """Installs ``clock`` as the variant's pacer, ticks and timers."""
+    ptime = pygame.time
+    saved = ptime.get_ticks, ptime.set_timer
+    ptime.get_ticks, ptime.set_timer = clock.get_ticks, clock.set_timer
+    try:
+        with pacing.install(clock):
+            yield clock
+    finally:
+        ptime.get_ticks, ptime.set_timer = saved
+
+
+# --- Sampling ---
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, not current
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+
+
+class Sample:
+    def __init__(self, frame, restarts, frame_ms, snapshot):
+        gc.collect()
+        self.frame = frame
+        self.hours = frame / FPS / 3600
+        self.restarts = restarts
+        self.rss = rss_mb()
+        self.traced = tracemalloc.get_traced_memory()[0] / 1024 if snapshot else None
+        self.snapshot = snapshot
+        self.objects = Counter(type(o).__name__ for o in gc.get_objects())
+        self.total = sum(self.objects.values())
+        self.p50 = percentile(frame_ms, 0.5)
+        self.p99 = percentile(frame_ms, 0.99)
+        self.max = max(frame_ms, default=0.0)
+
+    def row(self):
+        traced = f"{self.traced:9.0f}" if self.traced is not None else "        -"
+        return (f"{self.hours:7.2f} h  {self.restarts:6d}  {self.rss:8.1f}  {traced}"
+                f"  {self.total:8d}  {self.p50:6.2f}  {self.p99:6.2f}  {self.max:7.2f}")
+
+    def as_dict(self):
+        return {"hours": self.hours, "frame": self.frame, "restarts": self.restarts, "rss_mb": self.rss,
+                "traced_kb": self.traced, "objects": self.total,
+                "frame_ms": {"p50": self.p50, "p99": self.p99, "max": self.max}}
+
+
+HEADER = "   game  restarts   rss MB  traced KB   objects  p50 ms  p99 ms   max ms"
+
+
+def snapshot():
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, __file__),
+    ))
+
+
+def growth(first, last):
+    """Lines describing what grew from ``first`` to ``last``."""
+    flags = []
+    rss = last.rss - first.rss
+    if rss > RSS_MB:
+        per_day = rss / max(last.hours - first.hours, 1e-9) * 24
+        flags.append(f"RSS grew {rss:.1f} MB ({per_day:.1f} MB per day of play)")
+    if first.snapshot and last.snapshot:
+        for stat in last.snapshot.compare_to(first.snapshot, "lineno")[:10]:
+            if stat.size_diff > TRACED_KB * 1024:
+                where = stat.traceback[0]
+                flags.append(f"traced memory +{stat.size_diff / 1024:.0f} KB"
+                             f" (+{stat.count_diff} blocks) at {where.filename}:{where.lineno}")
+    for name, count in (last.objects - first.objects).most_common(10):
+        if count > OBJECTS and count > first.objects[name] * 0.5:
+            flags.append(f"{name} objects {first.objects[name]} -> {last.objects[name]}")
+    if first.p99 and last.p99 > first.p99 * FRAME_P99 + 0.5:
+        flags.append(f"frame time p99 {first.p99:.2f} -> {last.p99:.2f} ms")
+    return flags
+
+
+# --- Soak ---
+def soak(name, hours, round_seconds, sample_minutes, trace=True, out=None):
+    variant = VARIANTS[name]
+    harness = Harness(name)
+    clock = VirtualClock()
+    pilot = Autopilot(variant)
+    half = variant.hitboxes["square"][3] / 2
+    total = int(hours * 3600 * FPS)
+    every = max(int(sample_minutes * 60 * FPS), 1)
+    round_frames = int(round_seconds * FPS)
+    samples = []
+    frame_ms = []
+    st = {"last": None, "playing": 0, "waited": 0, "restarts": 0, "skip": False}
+    if trace:
+        tracemalloc.start()
+
+    def on_frame(frame):
+        now = time.perf_counter()
+        if st["last"] is not None and not st["skip"]:
+            frame_ms.append((now - st["last"]) * 1000)
+        st["skip"] = False
+        s = frame.state
+        if s is not None:
+            if s.playing:
+                st["waited"] = 0
+                st["playing"] += 1
+                ahead = s.ahead(1)
+                gap = ahead[0][1:] if ahead else (None, None)
+                # Play the round out, then let the bird fall to force a restart
+                if st["playing"] < round_frames and pilot.decide(s.y, s.vel, half, *gap):
+                    harness.press()
+            else:
+                st["waited"] += 1
+                if st["waited"] == RESTART_AFTER:
+                    harness.press()
+                    st["playing"] = 0
+                    st["restarts"] += 1
+                    st["waited"] = 0
+        if frame.index and frame.index % every == 0:
+            sample = Sample(frame.index, st["restarts"], frame_ms, snapshot() if trace else None)
+            if len(samples) > 1:
+                # Keep snapshots and object counts of the first and latest samples only
+                samples[-1].snapshot = samples[-1].objects = None
+            samples.append(sample)
+            print(sample.row(), flush=True)
+            frame_ms.clear()
+            st["skip"] = True  # the sample itself isn't frame time
+        if frame.index >= total and not harness.stopping:
+            harness.stop()
+        st["last"] = time.perf_counter() if st["skip"] else now
+
+    harness.frame_hooks.append(on_frame)
+    print(f"{name}: {hours:g} h of play ({total} frames), sampling every {sample_minutes:g} min")
+    print(HEADER)
+    start = time.perf_counter()
+    with accelerated(clock):
+        harness.run()
+    took = time.perf_counter() - start
+    if trace:
+        tracemalloc.stop()
+    print(f"{name}: {harness.frames} frames in {took:.0f} s ({harness.frames / took:.0f} frames/s),"
+          f" {st['restarts']} restarts")
+    flags = growth(samples[0], samples[-1]) if len(samples) > 1 else []
+    for line in flags:
+        print(f"  GROWTH {line}")
+    if len(samples) > 1 and not flags:
+        print("  no growth flagged")
+    if out:
+        os.makedirs(out, exist_ok=True)
+        with open(os.path.join(out, f"{name}.json"), "w") as f:
+            json.dump({"variant": name, "hours": hours, "seconds": took, "flags": flags,
+                       "samples": [s.as_dict() for s in samples]}, f, indent=1)
+    return samples, flags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="+", help="variant names, or all")
+    parser.add_argument("--hours", type=float, default=24, help="game time to play")
+    parser.add_argument("--round", type=float, default=120, help="seconds per round before the bot gives up")
+    parser.add_argument("--sample", type=float, default=10, help="minutes of game time between samples")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip allocation tracing (faster)")
+    parser.add_argument("--out", help="write each variant's samples to <out>/<variant>.json")
+    args = parser.parse_args()
+    names = list(probe.PROBES) if args.variants == ["all"] else args.variants
+    for name in names:
+        if name not in probe.PROBES:
+            parser.error(f"unknown variant {name!r}, pick from: {', '.join(probe.PROBES)}")
+    if len(names) == 1:
+        soak(names[0], args.hours, args.round, args.sample, not args.no_tracemalloc, args.out)
+        return
+    rest = [a for a in sys.argv[1:] if a not in args.variants]
+    for name in names:
+        subprocess.run([sys.executable, "-m", "flappybench.soak", name] + rest, check=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Optimal play on a seeded course by memoized search over bird states.
+
+Pipes don't depend on the bird, so the course is laid out once as a frame
+timeline and the search only tracks (y, velocity) per frame. Every frame each
+live state branches on flap / no flap; states that fall in the same cell of
+``res`` px by ``res / 4`` px/frame as one already seen that frame are merged,
+and states that can't reach the next gap even when always or never flapping
+are pruned. A bird's score only depends on how long it lives, so the best
+score belongs to the last frame any state survives.
+
+Searches start coarse and halve the cell size while the bird still dies, down
+to ``--res``; most courses are cleared at the first, cheapest pass:
+
+    python -m flappybench.solve gemini-2.5 o3-mini-high --pipes 100
+    python -m flappybench.solve o1 --seed 3 --res 0.25
+
+The winning flaps are replayed in ``Sim`` as a check. Merging keeps one real
+trajectory per cell, so the score found is always achievable; "death is
+unavoidable" holds up to the finest resolution tried. Scores count pipes
+passed, without the variants' bookkeeping quirks.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .sim import Sim, run
+from .variants import parse
+
+
+class Timeline:
+    """Per-frame pipes of a course as they meet the bird's column."""
+
+    def __init__(self, variant, seed, pipes):
+        sim = Sim(variant, seed)
+        v = variant
+        self.hitbox = sim.hitbox
+        dx, _, w, _ = sim.hitbox
+        left = int(v.bird_x + dx)
+        right = left + w
+        self.overlap = [[]]  # frame -> [(gap_top, gap_bottom)]
+        self.score = [0]  # frame -> pipes passed by then
+        entry = {}
+        passed = set()
+        while len(passed) < pipes:
+            sim._move_pipes()
+            frame = len(self.score)
+            hits = []
+            for p in sim.pipes:
+                if p.x < right and left < p.x + v.pipe_width:
+                    hits.append((p.gap_top, p.gap_bottom))
+                    entry.setdefault(p.id, (frame, p.gap_top, p.gap_bottom))
+                if sim.score_line(p) < v.bird_x:
+                    passed.add(p.id)
+            self.overlap.append(hits)
+            self.score.append(len(passed))
+        self.frames = len(self.score) - 1
+
+        # For every frame, the next pipe the bird has yet to enter
+        _, dy, _, h = sim.hitbox
+        entries = sorted(entry.values())
+        self.next_entry = np.zeros(self.frames + 1, np.int64)
+        self.next_lo = np.full(self.frames + 1, -np.inf)
+        self.next_hi = np.full(self.frames + 1, np.inf)
+        i = 0
+        for frame in range(self.frames + 1):
+            while i < len(entries) and entries[i][0] <= frame:
+                i += 1
+            if i < len(entries):
+                tp, top, bottom = entries[i]
+                self.next_entry[frame] = tp
+                self.next_lo[frame] = top - dy
+                self.next_hi[frame] = bottom - h - dy + 1
+
+
+class Result:
+    def __init__(self, score, frames, flaps, cleared, states, seconds, res):
+        self.score = score
+        self.frames = frames
+        self.flaps = flaps
+        self.cleared = cleared
+        self.states = states
+        self.seconds = seconds
+        self.res = res
+
+    def __str__(self):
+        end = "cleared the course" if self.cleared else f"death unavoidable at frame {self.frames + 1}"
+        return (f"max score {self.score}, {end}; {len(self.flaps)} flaps,"
+                f" {self.states} states at {self.res:g}px in {self.seconds:.2f}s")
+
+
+class Solver:
+    def __init__(self, variant, seed=0, pipes=100):
+        self.variant = variant
+        self.seed = seed
+        self.timeline = Timeline(variant, seed, pipes)
+
+    def _flap(self, vel):
+        v = self.variant
+        if v.flap_mode == "set":
+            return np.full_like(vel, v.flap)
+        vel = vel + v.flap
+        return np.maximum(vel, v.max_up) if v.flap_mode == "clamp" else vel
+
+    def _step(self, frame, y, vel):
+        """One frame for every state; returns new y, vel and the alive mask."""
+        v = self.variant
+        _, dy, _, h = self.timeline.hitbox
+        alive = np.ones(len(y), bool)
+        y0 = y
+        if not v.pipes_first:
+            y, vel, alive = self._move(y, vel)
+        top = np.trunc((y0 if v.pipes_first else y) + dy)
+        for gap_top, gap_bottom in self.timeline.overlap[frame]:
+            alive &= ~((top < gap_top) & (top + h > 0))
+            alive &= ~((top + h > gap_bottom) & (top < v.bottom_end))
+        if v.pipes_first:
+            y, vel, moved_alive = self._move(y, vel)
+            alive &= moved_alive
+        return y, vel, alive
+
+    def _move(self, y, vel):
+        v = self.variant
+        _, dy, _, h = self.timeline.hitbox
+        half = v.bird_size // 2
+        vel = vel + v.gravity
+        y = y + vel
+        alive = np.ones(len(y), bool)
+        if v.ceiling == "clamp":
+            up = y - half <= 0
+            y = np.where(up, half, y)
+            vel = np.where(up, 0.0, vel)
+        elif v.ceiling == "die":
+            alive &= y + dy > 0
+        elif v.ceiling == "offscreen":
+            alive &= y + half >= 0
+        if v.land == "clamp":
+            down = y > v.land_y - half
+            y = np.where(down, v.land_y - half, y)
+            vel = np.where(down, 0.0, vel)
+        elif v.land == "stop":
+            alive &= y + half < v.land_y
+        else:
+            alive &= y + dy + h < v.land_y
+        return y, vel, alive
+
+    def _reachable(self, frame, y, vel):
+        """False for states that can't be inside the next gap when they reach it."""
+        v = self.variant
+        t = self.timeline
+        k = t.next_entry[frame] - frame
+        if k <= 0:
+            return np.ones(len(y), bool)
+        g = v.gravity
+        lowest = y + vel * k + g * k * (k + 1) / 2  # never flapping
+        if v.ceiling == "clamp":
+            # A rising bird stopped at the ceiling falls from there at rest, lower
+            # than it would have been. It first hits on the frame n where
+            # y + (vel + g/2) n + g/2 n^2 <= half; rounding that frame down
+            # only moves the bound lower, which can't prune a reachable state.
+            half = v.bird_size // 2
+            a = vel + g / 2
+            disc = a * a - 2 * g * (y - half)
+            root = np.sqrt(np.maximum(disc, 0.0))
+            first = np.maximum(np.floor((-a - root) / g), 1)
+            hits = (disc >= 0) & (first <= k) & ((-a + root) / g >= 1)
+            j = k - first
+            lowest = np.where(hits, np.maximum(lowest, half + g * j * (j + 1) / 2), lowest)
+        if v.flap_mode == "set":
+            highest = y + k * (v.flap + g)
+        elif v.flap_mode == "clamp":
+            highest = y + k * (v.max_up + g)
+        else:
+            highest = y + vel * k + (v.flap + g) * k * (k + 1) / 2
+        return (lowest >= t.next_lo[frame]) & (highest < t.next_hi[frame])
+
+    def search(self, res):
+        """One pass with cells of ``res`` px; returns a Result."""
+        start = time.perf_counter()
+        t = self.timeline
+        y = np.array([float(self.variant.bird_y)])
+        vel = np.array([0.0])
+        parents, actions = [], []
+        states = 0
+        frame = 0
+        while frame < t.frames:
+            frame += 1
+            both_y = np.concatenate([y, y])
+            both_vel = np.concatenate([vel, self._flap(vel)])
+            flapped = np.repeat([False, True], len(y))
+            parent = np.tile(np.arange(len(y)), 2)
+            ny, nvel, alive = self._step(frame, both_y, both_vel)
+            alive &= self._reachable(frame, ny, nvel)
+            if not alive.any():
+                frame -= 1
+                break
+            ny, nvel, flapped, parent = ny[alive], nvel[alive], flapped[alive], parent[alive]
+            # Memoize: one state per (y cell, velocity) this frame
+            keys = (np.round(ny / res).astype(np.int64) * 1_000_003
+                    + np.round(nvel * 4 / res).astype(np.int64))
+            _, keep = np.unique(keys, return_index=True)
+            y, vel = ny[keep], nvel[keep]
+            parents.append(parent[keep])
+            actions.append(flapped[keep])
+            states += len(keep)
+
+        cleared = frame == t.frames
+        flaps = []
+        i = 0
+        for tick in range(frame - 1, -1, -1):
+            if actions[tick][i]:
+                flaps.append(tick)
+            i = parents[tick][i]
+        flaps.reverse()
+        # Dying on the next frame still counts pipes crossed on it
+        score = t.score[frame] if cleared else t.score[min(frame + 1, t.frames)]
+        return Result(score, frame, flaps, cleared, states, time.perf_counter() - start, res)
+
+    def solve(self, res=0.5, coarse=4.0):
+        """Coarse to fine: stops at the first pass that clears the course."""
+        start = time.perf_counter()
+        states = 0
+        best = None
+        cell = coarse
+        while True:
+            result = self.search(cell)
+            states += result.states
+            if best is None or result.frames > best.frames:
+                best = result
+            if result.cleared or cell <= res:
+                break
+            cell = max(cell / 2, res)
+        # best keeps the resolution of its own pass; totals cover every pass
+        best.states = states
+        best.seconds = time.perf_counter() - start
+        return best
+
+    def verify(self, result):
+        """Replays the solution in Sim; returns the score it actually gets."""
+        plain = self.variant.with_params(quirks=frozenset())
+        sim = run(plain, self.seed, result.flaps, result.frames)
+        if not result.cleared:
+            sim.step(False)
+            while sim.alive and not sim.over and sim.tick < self.timeline.frames:
+                sim.step(False)
+        return sim.score
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variants", nargs="*", default=["gemini-2.5", "o3-mini-high"],
+                        help="variants to solve (default: gemini-2.5 o3-mini-high)")
+    parser.add_argument("--seed", type=int, default=0, help="first course seed")
+    parser.add_argument("--seeds", type=int, default=1, help="courses to solve")
+    parser.add_argument("--pipes", type=int, default=100, help="course length in pipes")
+    parser.add_argument("--res", type=float, default=0.5, help="finest state cell, px")
+    args = parser.parse_args()
+    try:
+        variants = [parse(v) for v in args.variants]
+    except KeyError as e:
+        parser.error(e.args[0])
+    for spec, variant in zip(args.variants, variants):
+        for seed in range(args.seed, args.seed + args.seeds):
+            solver = Solver(variant, seed, args.pipes)
+            result = solver.solve(args.res)
+            replayed = solver.verify(result)
+            check = "" if replayed == result.score else f" (replay scored {replayed}!)"
+            print(f"{spec:24s} seed {seed:4d}: {result}{check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Pre-rendered bird and pipe sprites, shared through a small LRU cache.
+
+Drawing a bird with ``pygame.draw`` re-rasterizes its shape every frame;
+here each (shape, size, color) bird and each (width, color) pipe body is
+rasterized once into a display-format surface and then only blitted. Bird
+and pipe colors are re-rolled on every restart, so the cache keeps the
+``maxsize`` most recently used sprites and drops the rest.
+
+Pipes of any height come from one screen-tall body per (width, color),
+cropped with the ``area`` argument of a blit, so a whole frame of pipes is
+a single ``Surface.blits`` call.
+
+Sprites land where ``pygame.draw`` put the shapes, since it truncates float
+coordinates the way ``bird_pos`` does; variants that drew a square from a
+``Rect`` whose center was set (which rounds) blit at that rect instead. The
+one difference is a triangle clipped by the top of the window, where
+``pygame.draw.polygon`` drops a few pixels of the right edge.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, render, *args):
+        """The sprite for ``key``, calling ``render(*args)`` to make it on a miss."""
+        sprite = self._items.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._items.move_to_end(key)
+            return sprite
+        self.misses += 1
+        sprite = self._items[key] = render(*args)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def stats(self):
+        return (f"sprites: {len(self)} cached, {self.hits} hits, {self.misses} misses,"
+                f" {self.evictions} evicted")
+
+    # --- Birds ---
+    def bird(self, shape, size, color, alpha=255):
+        """Bird sprite; blit it at ``bird_pos(x, y, size)``."""
+        key = ("bird", shape, size, color, alpha)
+        return self.get(key, render_bird, shape, size, color, alpha)
+
+    # --- Pipes ---
+    def pipe(self, width, height, color):
+        """Opaque pipe body ``height`` tall; crop it with a blit area."""
+        return self.get(("pipe", width, color, height), render_pipe, width, height, color)
+
+    def pipe_blits(self, color, rects, tall):
+        """Blit sequence entries drawing ``rects`` in ``color``; ``tall`` is the screen height."""
+        out = []
+        for rect in rects:
+            x, y, w, h = rect
+            if w > 0 and h > 0:
+                out.append((self.pipe(w, tall, color), (x, y), (0, 0, w, h)))
+        return out
+
+
+def bird_pos(x, y, size):
+    return int(x) - size // 2, int(y) - size // 2
+
+
+def render_bird(shape, size, color, alpha=255):
+    sprite = pygame.Surface((size + 1, size + 1), pygame.SRCALPHA)
+    rgba = (*color, alpha)
+    if shape == "square":
+        sprite.fill(rgba, (0, 0, size, size))
+    elif shape == "circle":
+        pygame.draw.circle(sprite, rgba, (size // 2, size // 2), size // 2)
+    else:
+        pygame.draw.polygon(sprite, rgba, [(size / 2, 0), (0, size), (size, size)])
+    return sprite.convert_alpha() if pygame.display.get_surface() else sprite
+
+
+def render_pipe(width, height, color):
+    sprite = pygame.Surface((width, height))
+    sprite.fill(color)
+    return sprite.convert() if pygame.display.get_surface() else sprite
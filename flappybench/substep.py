@@ -0,0 +1,116 @@
+"""Fixed-step physics with flaps applied at the moment they were pressed.
+
+A variant that handles input once per frame applies a press made just after
+a frame boundary up to a frame late, and every press queued in one
+``pygame.event.get()`` lands at once; gemini-2.5's flaps add up, so how hard
+rapid presses accelerate the bird depends on how they fall across frames.
+
+``TimedInput`` polls the event queue while the frame waits, so each event
+carries the time it arrived. ``FixedStep`` advances the game in ticks of
+1/60 s of wall time whatever the frame rate, and ``integrate`` runs one tick
+of the variants' ``vel += gravity; y += vel``, split at each flap's
+fraction of the way through the tick. A flap at fraction 0 gives exactly the
+per-frame result, so a tick with no late presses plays the same as before.
+
+    FLAPPY_SUBSTEP=1 python gemini-2.5/main.py
+    FLAPPY_SUBSTEP=1 FLAPPY_FPS=30 python gemini-2.5/main.py
+"""
+
+import time
+
+import pygame
+
+POLL = 0.001  # seconds between event polls while waiting out a frame
+
+
+class TimedInput:
+    """Events paired with the ``perf_counter()`` time they were dequeued."""
+
+    def __init__(self):
+        self.queue = []
+
+    def poll(self):
+        events = pygame.event.get()
+        if events:
+            now = time.perf_counter()
+            self.queue.extend((now, e) for e in events)
+
+    def wait(self, until):
+        """Sleeps until ``until``, picking up events as they arrive."""
+        while True:
+            self.poll()
+            left = until - time.perf_counter()
+            if left <= 0:
+                return
+            time.sleep(min(POLL, left))
+
+    def take(self):
+        """Everything that arrived since the last call, as (time, event)."""
+        self.poll()
+        events, self.queue = self.queue, []
+        return events
+
+
+class FixedStep:
+    """Runs ticks of ``1 / rate`` seconds to keep up with the wall clock."""
+
+    def __init__(self, rate=60, fps=60, max_ticks=5):
+        self.tick = 1 / rate
+        self.frame = 1 / fps
+        self.max_ticks = max_ticks  # past this many per frame, drop time instead of spiralling
+        self.now = None  # wall time the simulation has reached
+        self.next_frame = None
+
+    def reset(self):
+        self.now = None
+
+    def ticks(self):
+        """(start, end) wall times of the ticks that ended since the last frame.
+
+        A tick only runs once it is over, so every press made during it has
+        arrived and lands at its own time whatever the frame rate; the game
+        shows a state at most one tick old.
+        """
+        now = time.perf_counter()
+        if self.now is None:
+            self.now = now
+        due = []
+        while self.now + self.tick <= now and len(due) < self.max_ticks:
+            due.append((self.now, self.now + self.tick))
+            self.now += self.tick
+        if len(due) == self.max_ticks:
+            self.now = max(self.now, now)
+        return due
+
+    def wait(self, inputs):
+        """Waits out the frame at the render rate, timestamping input meanwhile."""
+        now = time.perf_counter()
+        self.next_frame = max((self.next_frame or now) + self.frame, now)
+        inputs.wait(self.next_frame)
+
+
+def split(presses, start, end):
+    """Fractions through the tick (start, end) of the press times before ``end``.
+
+    Returns (fractions, presses left for later ticks); presses from before
+    the tick count as at its start.
+    """
+    span = end - start
+    now = sorted(t for t in presses if t < end)
+    later = [t for t in presses if t >= end]
+    return [max(0.0, (t - start) / span) for t in now], later
+
+
+def integrate(y, vel, gravity, fractions, flap):
+    """One tick of ``vel += gravity; y += vel`` with ``vel = flap(vel)`` at each fraction."""
+    done = 0.0
+    for f in fractions:
+        part = f - done
+        vel += gravity * part
+        y += vel * part
+        vel = flap(vel)
+        done = f
+    part = 1.0 - done
+    vel += gravity * part
+    y += vel * part
+    return y, vel
@@ -0,0 +1,362 @@
+"""Swarm mode: hundreds to thousands of birds flying one seeded course.
+
+Pipes don't depend on the birds, so the course is one ``Sim`` whose pipes
+are moved every frame, and the birds are numpy arrays stepped together.
+Since every bird sits in the same column, the only pipes that can hit any
+bird are found once per frame by binary search over the sorted pipe spans,
+and each is then checked against all birds in a single vectorized compare.
+Birds are drawn with one ``Surface.blits`` call from a handful of cached
+sprites.
+
+    python -m flappybench.swarm o3-mini --birds 1000
+    python -m flappybench.swarm gemini-2.5 --bots evolved --play
+    python -m flappybench.swarm o3-mini --birds 1000 --bench 600
+
+Bots are ``threshold`` (each with its own margin and reaction slips),
+``evolved`` (noisy copies of the best ``flappybench.evolve`` genome) or
+``random``. ``--optimal`` adds a gold bird replaying the solver's best run
+of the course, and ``--play`` adds a red bird that SPACE flaps. R starts
+the next course; a new one also starts once every bird is down.
+"""
+
+import argparse
+import colorsys
+import os
+import time
+
+import numpy as np
+import pygame
+
+from .sim import Sim
+from .variants import parse
+
+SKY = (135, 206, 235)
+PIPE = (34, 139, 34)
+LAND = (222, 184, 135)
+TEXT = (20, 20, 20)
+HUES = 12  # sprite colors for bots
+NEXT_ROUND_AFTER = 60  # frames to linger once every bird is down
+
+
+class Swarm:
+    """``n`` birds on one course, as arrays."""
+
+    def __init__(self, variant, seed, n):
+        v = variant
+        self.variant = v
+        self.seed = seed
+        self.n = n
+        self.course = Sim(v, seed)  # only its pipes are used
+        self.dx, self.dy, self.w, self.h = self.course.hitbox
+        self.left = int(v.bird_x + self.dx)
+        self.right = self.left + self.w
+        self.y = np.full(n, float(v.bird_y))
+        self.vel = np.zeros(n)
+        self.alive = np.ones(n, bool)
+        self.score = np.zeros(n, np.int64)
+        self.ticks = np.zeros(n, np.int64)
+        self.tick = 0
+        self.passed = 0
+
+    @property
+    def pipes(self):
+        return self.course.pipes
+
+    def next_gap(self):
+        """(x, gap_top, gap_bottom) of the first pipe not yet cleared, or None."""
+        width = self.variant.pipe_width
+        for p in self.pipes:
+            if p.x + width >= self.left:
+                return p.x, p.gap_top, p.gap_bottom
+        return None
+
+    # --- Frame ---
+    def _move(self, live):
+        v = self.variant
+        half = v.bird_size // 2
+        vel = self.vel
+        vel[live] += v.gravity
+        self.y[live] += vel[live]
+        y = self.y
+        dead = np.zeros(self.n, bool)
+        if v.ceiling == "clamp":
+            up = live & (y - half <= 0)
+            y[up] = half
+            vel[up] = 0.0
+        elif v.ceiling == "die":
+            dead |= y + self.dy <= 0
+        elif v.ceiling == "offscreen":
+            dead |= y + half < 0
+        if v.land == "clamp":
+            down = live & (y > v.land_y - half)
+            y[down] = v.land_y - half
+            vel[down] = 0.0
+        elif v.land == "stop":
+            down = live & (y + half >= v.land_y)
+            y[down] = v.land_y - half
+            dead |= down
+        else:
+            dead |= y + self.dy + self.h >= v.land_y
+        return dead & live
+
+    def _collide(self, live, y):
+        v = self.variant
+        pipes = self.pipes
+        dead = np.zeros(self.n, bool)
+        if not pipes:
+            return dead
+        lefts = np.fromiter((p.x for p in pipes), np.float64, len(pipes))
+        first = np.searchsorted(lefts + v.pipe_width, self.left, "right")
+        last = np.searchsorted(lefts, self.right, "left")
+        if first >= last:
+            return dead
+        top = np.trunc(y + self.dy)
+        bottom = top + self.h
+        for p in pipes[first:last]:
+            dead |= (top < p.gap_top) & (bottom > 0)
+            dead |= (bottom > p.gap_bottom) & (top < v.bottom_end)
+        return dead & live
+
+    def step(self, flap):
+        """One frame for every bird; ``flap`` is a bool per bird."""
+        v = self.variant
+        live = self.alive.copy()
+        flap = flap & live
+        if v.flap_mode == "set":
+            self.vel[flap] = v.flap
+        else:
+            self.vel[flap] += v.flap
+            if v.flap_mode == "clamp":
+                self.vel[flap] = np.maximum(self.vel[flap], v.max_up)
+        if v.pipes_first:
+            y0 = self.y.copy()
+            self.course._move_pipes()
+            dead = self._collide(live, y0)
+            dead |= self._move(live & ~dead)
+        else:
+            dead = self._move(live)
+            self.course._move_pipes()
+            dead |= self._collide(live & ~dead, self.y)
+        self.alive = live & ~dead
+        self.tick += 1
+        self.ticks[live] += 1
+        # All birds share one column, so the course's own scoring (quirks and
+        # all) counts for every bird still flying
+        self.course._score()
+        self.passed = self.course.score
+        self.score[live] = self.passed
+
+
+# --- Bots ---
+def threshold_bots(swarm, rng, margin=(0, 24), slip=0.08):
+    """Flap when sinking below the gap floor minus a per-bird margin; sometimes miss."""
+    v = swarm.variant
+    margins = rng.uniform(*margin, swarm.n)
+
+    def policy():
+        gap = swarm.next_gap()
+        floor = gap[2] if gap else (v.land_y + v.bird_size) // 2
+        bottom_next = swarm.y + swarm.vel + v.gravity + swarm.dy + swarm.h
+        return (bottom_next > floor - margins) & (rng.random(swarm.n) > slip)
+
+    return policy
+
+
+def random_bots(swarm, rng, rate=0.05):
+    return lambda: rng.random(swarm.n) < rate
+
+
+def evolved_bots(swarm, rng, spec, out, noise=0.05):
+    from . import evolve
+
+    state = evolve.latest(evolve.run_dir(out, spec))
+    if state is None:
+        raise SystemExit(f"no evolve checkpoints for {spec} in {out}; train first")
+    genomes = state["best"] + rng.normal(0, noise, (swarm.n, evolve.GENES))
+    land_y = swarm.variant.land_y
+
+    def policy():
+        gap = swarm.next_gap() or (np.nan, np.nan, np.nan)
+        x = evolve.features(swarm.y, swarm.vel, gap[0] - swarm.variant.bird_x,
+                            gap[1], gap[2], land_y)
+        return evolve.decide(genomes, x[:, None])[:, 0]
+
+    return policy
+
+
+def optimal_flaps(variant, seed):
+    from .solve import Solver
+
+    result = Solver(variant, seed, pipes=200).solve()
+    return set(result.flaps)
+
+
+# --- Drawing ---
+def bird_sprite(size, color, alpha=170):
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (*color, alpha), (size // 2, size // 2), size // 2)
+    pygame.draw.circle(sprite, (0, 0, 0, alpha), (size // 2, size // 2), size // 2, 1)
+    return sprite.convert_alpha()
+
+
+class Renderer:
+    def __init__(self, screen, variant, n, extra):
+        self.screen = screen
+        self.variant = variant
+        size = variant.bird_size
+        colors = [tuple(int(c * 255) for c in colorsys.hsv_to_rgb(i / HUES, 0.55, 1.0))
+                  for i in range(HUES)]
+        hues = [bird_sprite(size, c) for c in colors]
+        self.sprites = [hues[i % HUES] for i in range(n)]
+        for i, color in extra.items():
+            self.sprites[i] = bird_sprite(size, color, 255)
+        self.front = sorted(extra)  # drawn last so they stay visible
+        self.font = pygame.font.SysFont(None, 26)
+
+    def draw(self, swarm, hud):
+        v = self.variant
+        screen = self.screen
+        screen.fill(SKY)
+        for p in swarm.pipes:
+            pygame.draw.rect(screen, PIPE, (p.x, 0, v.pipe_width, p.gap_top))
+            pygame.draw.rect(screen, PIPE, (p.x, p.gap_bottom, v.pipe_width, v.bottom_end - p.gap_bottom))
+        pygame.draw.rect(screen, LAND, (0, v.land_y, v.width, v.height - v.land_y))
+
+        half = v.bird_size // 2
+        x = v.bird_x - half
+        alive = swarm.alive.copy()
+        alive[self.front] = False
+        idx = np.flatnonzero(alive)
+        ys = (swarm.y[idx] - half).astype(np.int64).tolist()
+        sprites = self.sprites
+        screen.blits([(sprites[i], (x, y)) for i, y in zip(idx.tolist(), ys)], False)
+        for i in self.front:
+            if swarm.alive[i]:
+                screen.blit(sprites[i], (x, int(swarm.y[i]) - half))
+
+        for row, line in enumerate(hud):
+            screen.blit(self.font.render(line, True, TEXT), (10, 10 + 22 * row))
+
+
+# --- Main ---
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variant", nargs="?", default="o3-mini")
+    parser.add_argument("--birds", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0, help="first course")
+    parser.add_argument("--bots", default="threshold", choices=("threshold", "evolved", "random"))
+    parser.add_argument("--evolve-out", default="evolve-out", help="where --bots evolved looks")
+    parser.add_argument("--optimal", action="store_true", help="add the solver's best run")
+    parser.add_argument("--play", action="store_true", help="add a bird you flap with SPACE")
+    parser.add_argument("--bench", type=int, metavar="FRAMES",
+                        help="run uncapped for FRAMES frames and print per-frame costs")
+    args = parser.parse_args()
+    try:
+        variant = parse(args.variant)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    pygame.init()
+    screen = pygame.display.set_mode((variant.width, variant.height))
+    pygame.display.set_caption(f"Swarm - {args.variant}")
+    clock = pygame.time.Clock()
+    rng = np.random.default_rng(args.seed)
+    extra = {}
+    n = args.birds
+    player = optimal = None
+    if args.play:
+        player = n
+        extra[player] = (220, 30, 30)
+        n += 1
+    if args.optimal:
+        optimal = n
+        extra[optimal] = (255, 200, 0)
+        n += 1
+
+    def new_round(seed):
+        swarm = Swarm(variant, seed, n)
+        if args.bots == "evolved":
+            bots = evolved_bots(swarm, rng, args.variant, args.evolve_out)
+        elif args.bots == "random":
+            bots = random_bots(swarm, rng)
+        else:
+            bots = threshold_bots(swarm, rng)
+        flaps = optimal_flaps(variant, seed) if optimal is not None else set()
+        return swarm, bots, flaps
+
+    seed = args.seed
+    swarm, bots, best_flaps = new_round(seed)
+    renderer = Renderer(screen, variant, n, extra)
+    pressed = False
+    down_for = 0
+    sim_ms = draw_ms = 0.0
+    sim_total = draw_total = 0.0
+    frames = 0
+    start = time.perf_counter()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    pressed = True
+                elif event.key == pygame.K_r:
+                    seed += 1
+                    swarm, bots, best_flaps = new_round(seed)
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+
+        t0 = time.perf_counter()
+        flap = bots()
+        if player is not None:
+            flap[player] = pressed
+        if optimal is not None:
+            flap[optimal] = swarm.tick in best_flaps
+        pressed = False
+        swarm.step(flap)
+        t1 = time.perf_counter()
+
+        alive = int(swarm.alive.sum())
+        hud = [
+            f"course {seed}  frame {swarm.tick}  pipes {swarm.passed}",
+            f"alive {alive}/{n}",
+            f"{clock.get_fps():.0f} fps  sim {sim_ms:.2f} ms  draw {draw_ms:.2f} ms",
+        ]
+        if player is not None:
+            hud.append(f"you: {swarm.score[player]}" + ("" if swarm.alive[player] else " (down)"))
+        renderer.draw(swarm, hud)
+        pygame.display.flip()
+        t2 = time.perf_counter()
+        sim_ms = (t1 - t0) * 1000
+        draw_ms = (t2 - t1) * 1000
+        sim_total += t1 - t0
+        draw_total += t2 - t1
+        frames += 1
+
+        if alive == 0:
+            down_for += 1
+            if down_for >= NEXT_ROUND_AFTER:
+                seed += 1
+                swarm, bots, best_flaps = new_round(seed)
+                down_for = 0
+        else:
+            down_for = 0
+
+        if args.bench:
+            clock.tick()
+            if frames >= args.bench:
+                running = False
+        else:
+            clock.tick(60)
+
+    took = time.perf_counter() - start
+    if frames:
+        print(f"{n} birds, {frames} frames: sim {sim_total * 1000 / frames:.2f} ms,"
+              f" draw {draw_total * 1000 / frames:.2f} ms per frame,"
+              f" {frames / took:.0f} fps")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Physics parameter sweeps with a cached result grid.
+
+Explores a grid or a Latin hypercube over a variant's tuning constants and
+measures how playable each point is, playing every point on many seeded
+courses at once in ``VecSim``:
+
+- ``survival``: mean seconds alive under the reference controller
+  (``threshold:8``) and the share of courses it survives to the end
+- ``score``: mean score of that controller
+- ``best``: mean over courses of the best score any controller margin in
+  ``MARGINS`` reached, a cheap stand-in for the best achievable score
+
+Results are cached per point, keyed by the full parameter set, so growing a
+grid or adding hypercube samples only plays the new points:
+
+    python -m flappybench.sweep gemini-2.5 --grid 3
+    python -m flappybench.sweep o1 --param flap=-9:-4 --param pipe_gap=120:220 --lhs 64
+
+Ranges are ``name=lo:hi``; without any, the default dimensions are swept
+around the variant's own values. ``pipe_gap`` keeps the gap centers where
+they were, ``spawn_every``/``spawn_distance`` keep the variant's jitter, and
+the names used in the variants' source (``FLAP_STRENGTH``, ``jump_strength``,
+``gap_size``, ``PIPE_FREQUENCY`` in ms, ...) are accepted too.
+"""
+
+import argparse
+import csv
+import itertools
+import random
+import time
+
+import numpy as np
+
+from .cache import Cache, digest
+from .variants import FPS, ms_to_frames, parse
+from .vecsim import VecSim, threshold
+
+MARGINS = (0, 4, 8, 16, 32, 48)
+REFERENCE = MARGINS.index(8)
+BATCH = 20000  # games stepped together
+INTEGER = ("pipe_gap", "pipe_speed", "spawn_every", "spawn_distance", "pipe_frequency")
+ALIASES = {
+    "flap_strength": "flap",
+    "jump_strength": "flap",
+    "jump": "flap",
+    "gap_size": "pipe_gap",
+    "gap": "pipe_gap",
+}
+# Default dimensions as (low, high) multiples of the variant's value
+DEFAULT_RANGES = {
+    "gravity": (0.5, 1.5),
+    "flap": (0.5, 1.5),
+    "pipe_gap": (0.75, 1.25),
+    "pipe_speed": (0.67, 1.67),
+    "spawn": (0.75, 1.5),
+}
+
+
+def default_dims(variant):
+    dims = {}
+    for name, (lo, hi) in DEFAULT_RANGES.items():
+        if name == "spawn":
+            name = "spawn_every" if variant.spawn == "timer" else "spawn_distance"
+            value = getattr(variant, name)[0]
+        else:
+            value = getattr(variant, name)
+        dims[name] = tuple(sorted((value * lo, value * hi)))
+    return dims
+
+
+def parse_range(text):
+    """``name=lo:hi`` -> (name, (lo, hi)); raises ValueError."""
+    name, _, span = text.partition("=")
+    lo, _, hi = span.partition(":")
+    name = name.strip().lower()
+    return ALIASES.get(name, name), (float(lo), float(hi or lo))
+
+
+def grid(dims, steps):
+    axes = [np.linspace(lo, hi, steps) if steps > 1 else [(lo + hi) / 2]
+            for lo, hi in dims.values()]
+    return [dict(zip(dims, values)) for values in itertools.product(*axes)]
+
+
+def latin_hypercube(dims, n, seed=0):
+    """``n`` points with exactly one sample in each of ``n`` strata per dimension."""
+    rng = random.Random(f"{seed}:lhs")
+    columns = []
+    for lo, hi in dims.values():
+        strata = list(range(n))
+        rng.shuffle(strata)
+        columns.append([lo + (s + rng.random()) / n * (hi - lo) for s in strata])
+    return [dict(zip(dims, values)) for values in zip(*columns)]
+
+
+def tidy(point):
+    return {name: int(round(v)) if name in INTEGER else round(float(v), 4)
+            for name, v in point.items()}
+
+
+def apply(base, point):
+    """The base variant with a sweep point's values swapped in."""
+    changes = {}
+    for name, value in point.items():
+        if name == "pipe_frequency":
+            name, value = "spawn_every", ms_to_frames(value)
+        if name == "pipe_gap":
+            shift = (base.pipe_gap - value) // 2
+            changes.update(gap_lo=base.gap_lo + shift, gap_hi=base.gap_hi + shift)
+        elif name in ("spawn_every", "spawn_distance"):
+            lo, hi = getattr(base, name)
+            value = (value, value + hi - lo)
+        changes[name] = value
+    return base.with_params(**changes)
+
+
+def measure(variants, courses, frames):
+    """Playability of each variant over seeds 0..courses-1."""
+    games = [(i, seed, margin) for i in range(len(variants))
+             for seed in range(courses) for margin in MARGINS]
+    ticks = np.empty(len(games), np.int64)
+    scores = np.empty(len(games), np.int64)
+    for start in range(0, len(games), BATCH):
+        chunk = games[start:start + BATCH]
+        vs = VecSim([variants[i] for i, _, _ in chunk], [s for _, s, _ in chunk], frames)
+        vs.run(threshold(np.array([m for _, _, m in chunk])), frames)
+        ticks[start:start + len(chunk)] = vs.ticks
+        scores[start:start + len(chunk)] = vs.score
+    shape = (len(variants), courses, len(MARGINS))
+    ticks, scores = ticks.reshape(shape), scores.reshape(shape)
+    results = []
+    for i in range(len(variants)):
+        ref_ticks = ticks[i, :, REFERENCE]
+        results.append({
+            "survival": float(ref_ticks.mean()) / FPS,
+            "survive_rate": float((ref_ticks >= frames).mean()),
+            "score": float(scores[i, :, REFERENCE].mean()),
+            "best": float(scores[i].max(1).mean()),
+        })
+    return results
+
+
+def sweep(base, points, courses, frames, cache):
+    """Results for every point, playing only the ones not in the cache."""
+    variants = [apply(base, p) for p in points]
+    keys = [digest({"variant": v.params(), "courses": courses, "frames": frames,
+                    "margins": MARGINS}) for v in variants]
+    results = [cache.load(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        for i, r in zip(missing, measure([variants[i] for i in missing], courses, frames)):
+            cache.save(keys[i], r)
+            results[i] = r
+    return results, len(missing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("variant", help="variant to sweep, optionally with overrides")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=LO:HI",
+                        help="dimension to sweep, repeatable")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--grid", type=int, metavar="STEPS", help="grid with STEPS values per dimension")
+    group.add_argument("--lhs", type=int, metavar="N", help="N Latin hypercube samples (default 32)")
+    parser.add_argument("--seed", type=int, default=0, help="Latin hypercube seed")
+    parser.add_argument("--courses", type=int, default=50, help="seeded courses per point")
+    parser.add_argument("--seconds", type=float, default=30, help="longest run to play")
+    parser.add_argument("--top", type=int, default=20, help="rows to print, most playable first")
+    parser.add_argument("--csv", metavar="PATH", help="write every point and its results here")
+    args = parser.parse_args()
+
+    try:
+        base = parse(args.variant)
+    except KeyError as e:
+        parser.error(e.args[0])
+    if args.param:
+        dims = {}
+        for text in args.param:
+            try:
+                name, span = parse_range(text)
+            except ValueError:
+                parser.error(f"bad range {text!r}, expected name=lo:hi")
+            if name != "pipe_frequency" and not hasattr(base, name):
+                parser.error(f"unknown parameter {name!r}")
+            dims[name] = span
+    else:
+        dims = default_dims(base)
+
+    if args.grid:
+        points = grid(dims, args.grid)
+    else:
+        points = latin_hypercube(dims, args.lhs or 32, args.seed)
+    points = [tidy(p) for p in points]
+    frames = int(args.seconds * FPS)
+
+    start = time.perf_counter()
+    results, played = sweep(base, points, args.courses, frames, Cache("sweep"))
+    elapsed = time.perf_counter() - start
+
+    rows = sorted(zip(points, results), key=lambda pr: (-pr[1]["survival"], -pr[1]["best"]))
+    names = list(dims)
+    print("  ".join(f"{n:>14s}" for n in names) + "    alive  survive   score    best")
+    for point, r in rows[:args.top]:
+        print("  ".join(f"{point[n]:>14g}" for n in names)
+              + f"  {r['survival']:6.1f}s  {r['survive_rate']:6.0%}  {r['score']:6.1f}  {r['best']:6.1f}")
+    print(f"{len(points)} points, {played} played ({len(points) - played} cached),"
+          f" {args.courses} courses x {len(MARGINS)} margins each, {elapsed:.1f}s")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names + ["survival", "survive_rate", "score", "best"])
+            for point, r in zip(points, results):
+                writer.writerow([point[n] for n in names]
+                                + [r["survival"], r["survive_rate"], r["score"], r["best"]])
+
+
+if __name__ == "__main__":
+    main()
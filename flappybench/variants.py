@@ -0,0 +1,244 @@
+"""Physics of each variant, transcribed from its main.py.
+
+Every main.py mixes its rules into a pygame loop, so the numbers are copied
+here once and ``flappybench.sim`` runs them without a display. Positions are
+pixel-exact up to pygame's float-to-int rounding of Rects; spawns that a
+variant performs after moving its pipes are shifted by one ``pipe_speed`` so
+that every variant can use the same frame order. ``tests/test_parity.py``
+plays each real main.py and checks the transcription against it frame by
+frame.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field, fields, replace
+
+SHAPES = ("square", "circle", "triangle")
+
+FPS = 60
+
+
+def ms_to_frames(ms):
+    return round(ms * FPS / 1000)
+
+
+@dataclass(frozen=True)
+class Variant:
+    name: str
+    width: int
+    height: int
+    land_y: int  # top of the land, where a falling bird stops or dies
+
+    # Bird
+    bird_x: int
+    bird_y: float
+    bird_size: int
+    gravity: float
+    flap: float
+    flap_mode: str  # "set": vel = flap, "add": vel += flap, "clamp": add then cap
+    max_up: float = None  # upward speed limit for "clamp"
+    ceiling: str = "die"  # "die", "clamp", "offscreen" (fully above) or "none"
+    land: str = "die"  # "die", "clamp" (rests on land) or "stop" (bird dies, game goes on)
+    # Collision box per shape as (dx, dy, w, h) from the bird's centre
+    hitboxes: dict = field(default_factory=dict)
+
+    # Pipes
+    pipe_width: int = 60
+    pipe_speed: int = 3
+    pipe_gap: int = 150
+    gap_lo: int = 100  # range of the gap's top edge, inclusive
+    gap_hi: int = 300
+    pipe_bottom: int = None  # where the bottom pipe ends, defaults to land_y
+    spawn: str = "timer"  # "timer" (every N frames), "distance" or "chain"
+    spawn_every: tuple = (90, 90)  # frames between spawns for "timer"
+    spawn_distance: tuple = (200, 200)  # spacing for "distance" and "chain"
+    spawn_x: int = 400
+    initial_pipes: int = 0
+    score_at: str = "trailing"  # bird passes the pipe's "leading" edge, "center" or "trailing" edge
+    pipes_first: bool = False  # pipes move and collide before the bird moves
+    best_before_score: bool = False  # best is saved before the death frame's score
+
+    # Bookkeeping bugs reproduced on purpose, see flappybench.fuzz
+    quirks: frozenset = frozenset()
+
+    @property
+    def bottom_end(self):
+        return self.land_y if self.pipe_bottom is None else self.pipe_bottom
+
+    def with_params(self, **params):
+        return replace(self, **params)
+
+    def params(self):
+        """Every parameter except the name, as JSON-friendly values."""
+        out = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, (frozenset, set)):
+                value = sorted(value)
+            elif isinstance(value, dict):
+                value = {k: list(v) for k, v in sorted(value.items())}
+            elif isinstance(value, tuple):
+                value = list(value)
+            out[f.name] = value
+        del out["name"]
+        return out
+
+
+def square_hitbox(size):
+    half = size // 2
+    return {shape: (-half, -half, size, size) for shape in SHAPES}
+
+
+VARIANTS = {}
+
+
+def register(variant):
+    VARIANTS[variant.name] = variant
+    return variant
+
+
+register(Variant(
+    name="gemini-2-flash-thinking",
+    width=600, height=480, land_y=430,
+    bird_x=50, bird_y=240, bird_size=20,
+    gravity=0.5, flap=-10, flap_mode="set",
+    ceiling="none", land="clamp",
+    hitboxes=square_hitbox(20),
+    pipe_width=60, pipe_gap=150, gap_lo=100, gap_hi=180,
+    spawn="timer", spawn_every=(150, 150), spawn_x=600,
+    score_at="trailing", pipes_first=True,
+))
+
+register(Variant(
+    name="gemini-2.5",
+    width=500, height=700, land_y=600,
+    bird_x=125, bird_y=350, bird_size=20,
+    gravity=0.25, flap=-0.6, flap_mode="clamp", max_up=-6,
+    ceiling="clamp", land="die",
+    hitboxes={
+        "square": (-10, -10, 20, 20),
+        "circle": (-9, -9, 18, 18),
+        "triangle": (-10, -10, 21, 21),
+    },
+    pipe_width=70, pipe_gap=170, gap_lo=-20, gap_hi=110,
+    spawn="timer", spawn_every=(ms_to_frames(1500),) * 2, spawn_x=500,
+    score_at="center", best_before_score=True,
+))
+
+register(Variant(
+    name="grok3",
+    width=400, height=600, land_y=550,
+    bird_x=100, bird_y=300, bird_size=20,
+    gravity=0.5, flap=-10, flap_mode="add",
+    ceiling="die", land="die",
+    hitboxes=square_hitbox(20),
+    pipe_width=50, pipe_gap=150, gap_lo=25, gap_hi=375,
+    spawn="timer", spawn_every=(50, 100), spawn_x=403, initial_pipes=1,
+    score_at="leading",
+    quirks=frozenset({"best_resets"}),
+))
+
+register(Variant(
+    name="o1",
+    width=400, height=600, land_y=560,
+    bird_x=50, bird_y=300, bird_size=30,
+    gravity=0.4, flap=-6, flap_mode="set",
+    ceiling="offscreen", land="die",
+    hitboxes=square_hitbox(30),
+    pipe_width=60, pipe_gap=150, gap_lo=50, gap_hi=400,
+    spawn="chain", spawn_distance=(200, 200), spawn_x=400, initial_pipes=3,
+    score_at="center",
+    quirks=frozenset({"score_by_index", "restart_resumes"}),
+))
+
+register(Variant(
+    name="o3-mini",
+    width=400, height=600, land_y=550,
+    bird_x=100, bird_y=300, bird_size=30,
+    gravity=0.25, flap=-6, flap_mode="set",
+    ceiling="die", land="die",
+    hitboxes=square_hitbox(30),
+    pipe_width=60, pipe_gap=150, gap_lo=100, gap_hi=300,
+    spawn="timer", spawn_every=(ms_to_frames(1500),) * 2, spawn_x=410,
+    score_at="center", best_before_score=True,
+))
+
+register(Variant(
+    name="o3-mini-high",
+    width=400, height=600, land_y=550,
+    bird_x=50, bird_y=300, bird_size=30,
+    gravity=0.5, flap=-10, flap_mode="set",
+    ceiling="die", land="die",
+    hitboxes=square_hitbox(30),
+    pipe_width=70, pipe_gap=150, gap_lo=100, gap_hi=300,
+    spawn="distance", spawn_distance=(200, 300), spawn_x=400, initial_pipes=1,
+    score_at="trailing",
+))
+
+register(Variant(
+    name="o4-mini",
+    width=400, height=600, land_y=560,
+    bird_x=100, bird_y=300, bird_size=30,
+    gravity=0.5, flap=-12, flap_mode="set",
+    ceiling="die", land="die",
+    hitboxes=square_hitbox(30),
+    pipe_width=50, pipe_gap=150, gap_lo=50, gap_hi=300, pipe_bottom=600,
+    spawn="timer", spawn_every=(ms_to_frames(1500) + 1,) * 2, spawn_x=400,
+    score_at="trailing",
+    quirks=frozenset({"best_on_land_only"}),
+))
+
+register(VARIANTS["o4-mini"].with_params(name="o4-mini-high"))
+
+register(Variant(
+    name="sonnet-3.7",
+    width=800, height=600, land_y=520,
+    bird_x=200, bird_y=300, bird_size=30,
+    gravity=0.5, flap=-8, flap_mode="set",
+    ceiling="clamp", land="stop",
+    hitboxes={
+        "square": (-15, -15, 30, 30),
+        "circle": (-12, -12, 24, 24),
+        "triangle": (-12, -10, 24, 20),
+    },
+    pipe_width=70, pipe_gap=200, gap_lo=100, gap_hi=220,
+    spawn="distance", spawn_distance=(370, 370), spawn_x=873, initial_pipes=1,
+    score_at="trailing",
+))
+
+
+def parse(spec):
+    """Looks up ``name`` or ``name:param=value,...``, e.g. ``gemini-2.5:gravity=0.5``."""
+    name, _, overrides = spec.partition(":")
+    if name not in VARIANTS:
+        raise KeyError(f"unknown variant {name!r}, pick one of: {', '.join(VARIANTS)}")
+    variant = VARIANTS[name]
+    if not overrides:
+        return variant
+    params = {}
+    for item in re.split(r",(?=\w+=)", overrides):
+        key, _, value = item.partition("=")
+        if not hasattr(variant, key):
+            raise KeyError(f"{name} has no parameter {key!r}")
+        params[key] = ast.literal_eval(value)
+    return variant.with_params(name=spec, **params)
+
+
+def layout_problems(variant):
+    """Mistakes in a variant's parameters that show without playing it."""
+    problems = []
+    if variant.gap_hi + variant.pipe_gap >= variant.land_y:
+        problems.append("gap can reach the land")
+    if variant.bottom_end > variant.land_y:
+        problems.append("bottom pipe runs past the land")
+    return problems
+
+
+def main():
+    for name, variant in VARIANTS.items():
+        problems = layout_problems(variant)
+        print(f"{name}: {', '.join(problems) or 'ok'}")
+
+
+if __name__ == "__main__":
+    main()
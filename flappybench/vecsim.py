@@ -0,0 +1,260 @@
+"""Many games at once as numpy arrays, one vectorized ``step`` per frame.
+
+Each game (row) can have its own variant parameters and course seed. Pipes
+live in ``K`` ring slots per game, so moving, culling, colliding and scoring
+every pipe of every game is a handful of array operations. Frame order and
+course draws follow ``flappybench.sim``, so a game here replays exactly like
+a Sim given the same flaps; the scoring and best-score quirks are left out
+and a bird stopped on the land counts as dead.
+"""
+
+import math
+
+import numpy as np
+
+from .sim import CAUSES, Course
+from .variants import SHAPES
+
+CEILING, LAND, TOP_PIPE, BOTTOM_PIPE = range(1, 5)
+CAUSE_NAMES = (None,) + CAUSES
+
+
+def _course_draws(seeds, kind, n):
+    out = np.empty((len(seeds), n))
+    for i, seed in enumerate(seeds):
+        course = Course(seed)
+        course.draw(kind, n - 1)
+        out[i] = getattr(course, kind)[:n]
+    return out
+
+
+class VecSim:
+    """``len(variants)`` independent games stepped together.
+
+    ``variants`` is one Variant per game (or a single Variant for all) and
+    ``seeds`` one course seed per game.
+    """
+
+    def __init__(self, variants, seeds, max_frames=3600):
+        seeds = np.asarray(seeds)
+        n = len(seeds)
+        if not isinstance(variants, (list, tuple)):
+            variants = [variants] * n
+        self.n = n
+        self.variants = variants
+
+        def col(get, dtype=np.float64):
+            return np.array([get(v) for v in variants], dtype=dtype)
+
+        self.gravity = col(lambda v: v.gravity)
+        self.flap = col(lambda v: v.flap)
+        self.flap_set = col(lambda v: v.flap_mode == "set", bool)
+        self.max_up = col(lambda v: v.max_up if v.flap_mode == "clamp" else -np.inf)
+        self.bird_x = col(lambda v: v.bird_x)
+        self.bird_y = col(lambda v: v.bird_y)
+        self.size = col(lambda v: v.bird_size)
+        self.half = col(lambda v: v.bird_size // 2)
+        self.land_y = col(lambda v: v.land_y)
+        self.ceiling = col(lambda v: v.ceiling, object)
+        self.land = col(lambda v: v.land, object)
+        self.pipe_width = col(lambda v: v.pipe_width)
+        self.pipe_speed = col(lambda v: v.pipe_speed)
+        self.pipe_gap = col(lambda v: v.pipe_gap)
+        self.gap_lo = col(lambda v: v.gap_lo)
+        self.gap_span = col(lambda v: v.gap_hi - v.gap_lo + 1)
+        self.bottom_end = col(lambda v: v.bottom_end)
+        self.spawn_x = col(lambda v: v.spawn_x)
+        self.timer = col(lambda v: v.spawn == "timer", bool)
+        self.distance = col(lambda v: v.spawn == "distance", bool)
+        self.chain = col(lambda v: v.spawn == "chain", bool)
+        self.pipes_first = col(lambda v: v.pipes_first, bool)
+        self.every_lo = col(lambda v: v.spawn_every[0])
+        self.every_span = col(lambda v: v.spawn_every[1] - v.spawn_every[0] + 1)
+        self.dist_lo = col(lambda v: v.spawn_distance[0])
+        self.dist_span = col(lambda v: v.spawn_distance[1] - v.spawn_distance[0] + 1)
+        self.initial = col(lambda v: v.initial_pipes, np.int64)
+        self.score_offset = col(
+            lambda v: {"leading": 0, "center": v.pipe_width // 2}.get(v.score_at, v.pipe_width)
+        )
+
+        # Ring slots must outlast the longest time a pipe stays on screen
+        fastest = min(v.spawn_every[0] if v.spawn == "timer" else v.spawn_distance[0] / v.pipe_speed
+                      for v in variants)
+        lifetime = max((v.spawn_x + v.pipe_width) / v.pipe_speed for v in variants)
+        self.k = int(math.ceil(lifetime / max(fastest, 1))) + max(v.initial_pipes for v in variants) + 1
+        pipes_needed = self.k + int(max_frames / max(fastest, 1)) + 2
+
+        # Course draws, identical to what flappybench.sim would use
+        unique, index = np.unique(seeds, return_inverse=True)
+        self.gap_u = _course_draws(unique, "gap", pipes_needed)[index]
+        self.spacing_u = _course_draws(unique, "spacing", pipes_needed)[index]
+        self.timer_u = _course_draws(unique, "timer", pipes_needed)[index]
+        shape_u = _course_draws(unique, "shape", 1)[index, 0]
+        boxes = np.array([
+            v.hitboxes[SHAPES[int(u * 3)]] for v, u in zip(variants, shape_u)
+        ], dtype=np.float64)
+        self.hit_dx, self.hit_dy, self.hit_w, self.hit_h = boxes.T
+        self.reset()
+
+    def reset(self):
+        n, k = self.n, self.k
+        self.y = self.bird_y.copy()
+        self.vel = np.zeros(n)
+        self.alive = np.ones(n, bool)
+        self.cause = np.zeros(n, np.int8)
+        self.score = np.zeros(n, np.int64)
+        self.ticks = np.zeros(n, np.int64)
+        self.px = np.zeros((n, k))
+        self.gap_top = np.zeros((n, k))
+        self.active = np.zeros((n, k), bool)
+        self.passed = np.zeros((n, k), bool)
+        self.spawned = np.zeros(n, np.int64)
+        self.spacings = np.zeros(n, np.int64)
+        self.timers = np.zeros(n, np.int64)
+        self.last_x = np.full(n, -np.inf)
+        rows = np.arange(n)
+        for i in range(int(self.initial.max())):
+            which = rows[self.initial > i]
+            step = np.where(self.chain[which], self.dist_lo[which], 0)
+            self._spawn(which, self.spawn_x[which] + i * step)
+        self.spawn_in = self._next_timer(rows)
+        self.next_spacing = self._next_spacing(rows)
+
+    def _next_timer(self, rows):
+        u = self.timer_u[rows, self.timers[rows]]
+        self.timers[rows] += 1
+        return self.every_lo[rows] + np.floor(u * self.every_span[rows])
+
+    def _next_spacing(self, rows):
+        u = self.spacing_u[rows, self.spacings[rows]]
+        self.spacings[rows] += 1
+        return self.dist_lo[rows] + np.floor(u * self.dist_span[rows])
+
+    def _spawn(self, rows, x):
+        if len(rows) == 0:
+            return
+        ids = self.spawned[rows]
+        slot = ids % self.k
+        u = self.gap_u[rows, ids]
+        self.px[rows, slot] = x
+        self.gap_top[rows, slot] = self.gap_lo[rows] + np.floor(u * self.gap_span[rows])
+        self.active[rows, slot] = True
+        self.passed[rows, slot] = False
+        self.spawned[rows] += 1
+        self.last_x[rows] = x
+
+    def step(self, flap):
+        """Advances every live game one frame; ``flap`` is a bool per game."""
+        live = self.alive
+        rows = np.flatnonzero(live)
+        if len(rows) == 0:
+            return
+        self.ticks[rows] += 1
+        y0 = self.y.copy()
+
+        # Bird
+        flap = flap & live
+        set_mask = flap & self.flap_set
+        add_mask = flap & ~self.flap_set
+        self.vel[set_mask] = self.flap[set_mask]
+        self.vel[add_mask] = np.maximum(self.vel[add_mask] + self.flap[add_mask],
+                                        self.max_up[add_mask])
+        flapped = self.vel.copy()
+        self.vel[rows] += self.gravity[rows]
+        self.y[rows] += self.vel[rows]
+        clamp_top = live & (self.ceiling == "clamp") & (self.y - self.half <= 0)
+        self.y[clamp_top] = self.half[clamp_top]
+        self.vel[clamp_top] = 0
+        dead = live & (
+            ((self.ceiling == "die") & (self.y + self.hit_dy <= 0))
+            | ((self.ceiling == "offscreen") & (self.y + self.half < 0))
+        )
+        self.cause[dead] = CEILING
+        rest = live & (self.land == "clamp") & (self.y > self.land_y - self.half)
+        self.y[rest] = (self.land_y - self.half)[rest]
+        self.vel[rest] = 0
+        stop = live & ~dead & (self.land == "stop") & (self.y + self.half >= self.land_y)
+        self.y[stop] = (self.land_y - self.half)[stop]
+        hit_land = stop | (live & ~dead & (self.land == "die") & (
+            self.y + self.hit_dy + self.hit_h >= self.land_y
+        ))
+        self.cause[hit_land] = LAND
+        dead |= hit_land
+
+        # Pipes: spawn, move, then cull or extend the chain
+        timer = rows[self.timer[rows]]
+        self.spawn_in[timer] -= 1
+        due = timer[self.spawn_in[timer] <= 0]
+        if len(due):
+            self._spawn(due, self.spawn_x[due])
+            self.spawn_in[due] = self._next_timer(due)
+        distance = rows[self.distance[rows]]
+        due = distance[self.last_x[distance] < self.spawn_x[distance] - self.next_spacing[distance]]
+        if len(due):
+            self._spawn(due, self.spawn_x[due])
+            self.next_spacing[due] = self._next_spacing(due)
+        self.px[rows] -= self.pipe_speed[rows, None]
+        self.last_x[rows] -= self.pipe_speed[rows]
+        right_edge = self.px + self.pipe_width[:, None]
+        gone = self.active & np.where(self.chain[:, None], right_edge < 0, right_edge <= 0)
+        self.active &= ~gone
+        due = np.flatnonzero(self.chain & live & gone.any(1))
+        if len(due):
+            self._spawn(due, self.last_x[due] + self._next_spacing(due))
+
+        # Collisions against every slot at once; pipes_first variants collide
+        # before the bird moves and don't move it on the frame they die (the
+        # flap was already pressed, so it keeps that velocity)
+        y = np.where(self.pipes_first, y0, self.y)
+        left = np.trunc(self.bird_x + self.hit_dx)[:, None]
+        right = left + self.hit_w[:, None]
+        top = np.trunc(y + self.hit_dy)[:, None]
+        bottom = top + self.hit_h[:, None]
+        over = self.active & (self.px < right) & (left < self.px + self.pipe_width[:, None])
+        hit_top = (over & (top < self.gap_top) & (bottom > 0)).any(1)
+        hit_bottom = (over & (bottom > self.gap_top + self.pipe_gap[:, None]) & (
+            top < self.bottom_end[:, None]
+        )).any(1)
+        pipe_dead = live & np.where(self.pipes_first, True, ~dead) & (hit_top | hit_bottom)
+        self.cause[pipe_dead] = np.where(hit_top, TOP_PIPE, BOTTOM_PIPE)[pipe_dead]
+        frozen = pipe_dead & self.pipes_first
+        self.y[frozen] = y0[frozen]
+        self.vel[frozen] = flapped[frozen]
+        dead |= pipe_dead
+
+        # Score, including the frame of death
+        line = self.px + self.score_offset[:, None]
+        newly = self.active & ~self.passed & (line < self.bird_x[:, None]) & live[:, None]
+        self.score += newly.sum(1)
+        self.passed |= newly
+        self.alive = live & ~dead
+
+    def next_pipe(self):
+        """x, gap top and gap bottom of each game's next pipe (NaN if none)."""
+        ahead = self.active & (self.px + self.pipe_width[:, None] >= (self.bird_x + self.hit_dx)[:, None])
+        x = np.where(ahead, self.px, np.inf)
+        slot = x.argmin(1)
+        rows = np.arange(self.n)
+        found = ahead[rows, slot]
+        gap_top = np.where(found, self.gap_top[rows, slot], np.nan)
+        return (np.where(found, x[rows, slot], np.nan), gap_top, gap_top + self.pipe_gap)
+
+    def run(self, policy, frames):
+        """Steps until every game is over or ``frames`` have passed."""
+        for _ in range(frames):
+            if not self.alive.any():
+                break
+            self.step(policy(self))
+
+
+def threshold(margin=8):
+    """Vectorized counterpart of ``policies.Threshold``."""
+    margin = np.asarray(margin, dtype=np.float64)
+
+    def policy(vs):
+        _, _, gap_bottom = vs.next_pipe()
+        floor = np.where(np.isnan(gap_bottom), (vs.land_y + vs.size) // 2, gap_bottom)
+        bottom_next = vs.y + vs.vel + vs.gravity + vs.hit_dy + vs.hit_h
+        return bottom_next > floor - margin
+
+    return policy
@@ -0,0 +1,48 @@
+"""A variant's window at a lower internal resolution, scaled up by SDL.
+
+``FLAPPY_INTERNAL=0.5`` makes a variant that draws through a ``View`` open
+its window at half its size with ``pygame.SCALED`` and draw at that size:
+fills, sprites and text all cover a quarter of the pixels, and SDL's
+renderer stretches the frame to the screen in ``display.flip``. The game
+itself still runs in its own pixels; only drawing goes through the view.
+
+Without it (or at 1) every method hands its arguments back unchanged, so
+the variant draws exactly what it drew before.
+
+    FLAPPY_INTERNAL=0.5 python o3-mini-high/main.py
+"""
+
+import os
+
+import pygame
+
+
+class View:
+    def __init__(self, size, scale=None):
+        if scale is None:
+            scale = float(os.environ.get("FLAPPY_INTERNAL") or 1)
+        self.scale = scale
+        self.scaled = scale != 1
+        self.game_size = size
+        self.size = (self.length(size[0]), self.length(size[1])) if self.scaled else size
+
+    def open(self):
+        """Opens the window: at the internal size, scaled to the screen, if there is one."""
+        return pygame.display.set_mode(self.size, pygame.SCALED if self.scaled else 0)
+
+    def length(self, n):
+        """A game-pixel length in window pixels, at least 1."""
+        return max(round(n * self.scale), 1) if self.scaled else n
+
+    def pos(self, x, y):
+        if not self.scaled:
+            return x, y
+        return round(x * self.scale), round(y * self.scale)
+
+    def rect(self, x, y, w, h):
+        """A game-pixel rect in window pixels; edges are scaled, so neighbours still meet."""
+        if not self.scaled:
+            return x, y, w, h
+        s = self.scale
+        left, top = round(x * s), round(y * s)
+        return left, top, max(round((x + w) * s) - left, 1), max(round((y + h) * s) - top, 1)
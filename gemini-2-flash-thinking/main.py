@@ -1,5 +1,10 @@
 import pygame
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.sprites import SpriteCache, bird_pos
 
 # Initialize Pygame
 pygame.init()
@@ -10,6 +15,9 @@ HEIGHT = 480
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("gemini-2-flash-thinking")
 
+# Pre-rendered bird and pipe sprites (colors change every restart)
+sprites = SpriteCache()
+
 # Colors
 LIGHT_BLUE = (173, 216, 230)
 DARK_BROWN = (101, 67, 33)
@@ -66,15 +74,8 @@ class Bird:
         self.velocity = self.jump_strength
 
     def draw(self, screen):
-        if self.shape_type == 'square':
-            pygame.draw.rect(screen, self.color, (self.x - self.size // 2, self.y - self.size // 2, self.size, self.size))
-        elif self.shape_type == 'circle':
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.size // 2)
-        elif self.shape_type == 'triangle':
-            points = [(self.x, self.y - self.size // 2),
-                      (self.x - self.size // 2, self.y + self.size // 2),
-                      (self.x + self.size // 2, self.y + self.size // 2)]
-            pygame.draw.polygon(screen, self.color, points)
+        sprite = sprites.bird(self.shape_type, self.size, self.color)
+        screen.blit(sprite, bird_pos(self.x, self.y, self.size))
 
 class Pipe:
     def __init__(self, x):
@@ -89,9 +90,11 @@ class Pipe:
     def update(self):
         self.x -= self.speed
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, (self.x, 0, self.width, self.gap_y)) # Top pipe
-        pygame.draw.rect(screen, self.color, (self.x, self.gap_y + self.gap_size, self.width, HEIGHT - (self.gap_y + self.gap_size) - LAND_HEIGHT)) # Bottom pipe
+    def blits(self):
+        """Blit entries for both pipe bodies, drawn from the sprite cache."""
+        top = (self.x, 0, self.width, self.gap_y) # Top pipe
+        bottom = (self.x, self.gap_y + self.gap_size, self.width, HEIGHT - (self.gap_y + self.gap_size) - LAND_HEIGHT) # Bottom pipe
+        return sprites.pipe_blits(self.color, (top, bottom), HEIGHT)
 
     def is_off_screen(self):
         return self.x + self.width < 0
@@ -129,6 +132,28 @@ def reset_game():
     background_color = get_light_color()
     land_color = get_land_color()
 
+def display_game_screen():
+    # Background
+    screen.fill(background_color)
+
+    # Land
+    pygame.draw.rect(screen, land_color, (0, HEIGHT - LAND_HEIGHT, WIDTH, LAND_HEIGHT))
+    # Added text overlay on the floor
+    ground_text = font.render("gemini-2-flash-thinking", True, BLACK)
+    ground_rect = ground_text.get_rect(center=(WIDTH // 2, HEIGHT - LAND_HEIGHT // 2))
+    screen.blit(ground_text, ground_rect)
+
+    # Pipes, all in one call
+    screen.blits([entry for pipe in pipes for entry in pipe.blits()], False)
+
+    # Bird
+    bird.draw(screen)
+
+    # Score display
+    score_text = font.render(f"Score: {score}", True, BLACK)
+    score_rect = score_text.get_rect(topright=(WIDTH - 10, 10))
+    screen.blit(score_text, score_rect)
+
 def display_game_over_screen():
     screen.fill(background_color)
     pygame.draw.rect(screen, land_color, (0, HEIGHT - LAND_HEIGHT, WIDTH, LAND_HEIGHT))
@@ -168,16 +193,6 @@ while running:
                 running = False
 
     if not game_over:
-        # Background
-        screen.fill(background_color)
-
-        # Land
-        pygame.draw.rect(screen, land_color, (0, HEIGHT - LAND_HEIGHT, WIDTH, LAND_HEIGHT))
-        # Added text overlay on the floor
-        ground_text = font.render("gemini-2-flash-thinking", True, BLACK)
-        ground_rect = ground_text.get_rect(center=(WIDTH // 2, HEIGHT - LAND_HEIGHT // 2))
-        screen.blit(ground_text, ground_rect)
-        
         # Pipes
         pipe_spawn_timer += 1
         if pipe_spawn_timer >= pipe_spawn_interval:
@@ -186,7 +201,6 @@ while running:
 
         for pipe in list(pipes): # Iterate over a copy to allow removal
             pipe.update()
-            pipe.draw(screen)
 
             if not pipe.passed and pipe.x + pipe.width < bird.x:
                 score += 1
@@ -201,12 +215,8 @@ while running:
 
         # Bird
         bird.update()
-        bird.draw(screen)
 
-        # Score display
-        score_text = font.render(f"Score: {score}", True, BLACK)
-        score_rect = score_text.get_rect(topright=(WIDTH - 10, 10))
-        screen.blit(score_text, score_rect)
+        display_game_screen()
     else:
         display_game_over_screen()
 
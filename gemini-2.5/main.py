@@ -1,8 +1,16 @@
 import pygame
+import os
 import random
 import sys
 import math
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.autopilot import Autopilot
+from flappybench.hud import PerfHud
+from flappybench.sprites import SpriteCache, bird_pos
+from flappybench.substep import FixedStep, TimedInput, integrate, split
+from flappybench.variants import VARIANTS
+
 # Initialize Pygame
 pygame.init()
 
@@ -23,6 +31,14 @@ PIPE_GAP = 170
 PIPE_SPEED = 3
 PIPE_FREQUENCY = 1500  # Milliseconds between new pipe spawns
 
+# Autopilot (demo on the start screen, A toggles assist while playing)
+AUTOPILOT_BUDGET_MS = 1.0
+
+# Sub-frame flaps: physics in fixed 1/60 s ticks, each flap applied at the
+# moment it was pressed, drawn at FLAPPY_FPS frames a second
+SUBSTEP = os.environ.get("FLAPPY_SUBSTEP") == "1"
+RENDER_FPS = int(os.environ.get("FLAPPY_FPS", "60"))
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -70,6 +86,11 @@ def get_random_pipe_color():
 
 
 # --- Bird Class ---
+def flapped(velocity):
+    """Velocity after a flap, limited to the maximum upward velocity."""
+    return max(velocity - FLAP_STRENGTH, MAX_UP_VELOCITY)
+
+
 class Bird:
     def __init__(self):
         self.x = SCREEN_WIDTH // 4
@@ -84,14 +105,15 @@ class Bird:
         self.reset()  # Initialize with random properties
 
     def flap(self):
-        self.velocity -= FLAP_STRENGTH
-        # Limit maximum upward velocity
-        if self.velocity < MAX_UP_VELOCITY:
-            self.velocity = MAX_UP_VELOCITY
+        self.velocity = flapped(self.velocity)
 
-    def update(self):
-        self.velocity += GRAVITY
-        self.y += self.velocity
+    def update(self, flaps=()):
+        """Moves the bird one tick; ``flaps`` are fractions of the tick where SPACE was pressed."""
+        if flaps:
+            self.y, self.velocity = integrate(self.y, self.velocity, GRAVITY, flaps, flapped)
+        else:
+            self.velocity += GRAVITY
+            self.y += self.velocity
 
         # Prevent going above the screen
         if self.y < self.size // 2:
@@ -101,43 +123,21 @@ class Bird:
         self.rect.center = (self.x, self.y)
 
     def draw(self, screen):
-        if self.shape == "square":
-            # Adjust rect position for drawing centered square
-            draw_rect = pygame.Rect(
-                self.x - self.size // 2, self.y - self.size // 2, self.size, self.size
-            )
-            pygame.draw.rect(screen, self.color, draw_rect)
-        elif self.shape == "circle":
-            pygame.draw.circle(
-                screen, self.color, (self.x, int(self.y)), self.size // 2
-            )
-        elif self.shape == "triangle":
-            # Simple isosceles triangle pointing up
-            points = [
-                (self.x, int(self.y - self.size // 2)),  # Top point
-                (
-                    int(self.x - self.size / 2),
-                    int(self.y + self.size // 2),
-                ),  # Bottom left
-                (
-                    int(self.x + self.size / 2),
-                    int(self.y + self.size // 2),
-                ),  # Bottom right
-            ]
-            pygame.draw.polygon(screen, self.color, points)
+        sprite = sprites.bird(self.shape, self.size, self.color)
+        screen.blit(sprite, bird_pos(self.x, self.y, self.size))
 
         # Update the collision rect regardless of shape (bounding box)
         # Make the collision rect slightly smaller for circles/triangles for fairness
         if self.shape != "square":
             hitbox_size = int(self.size * 0.9)  # Adjust hitbox size
-            self.rect = pygame.Rect(
+            self.rect.update(
                 self.x - hitbox_size // 2,
                 self.y - hitbox_size // 2,
                 hitbox_size,
                 hitbox_size,
             )
         else:
-            self.rect = pygame.Rect(
+            self.rect.update(
                 self.x - self.size // 2, self.y - self.size // 2, self.size, self.size
             )
 
@@ -185,10 +185,11 @@ def move_pipes(pipes):
 
 
 def draw_pipes(screen, pipes):
-    """Draws all pipes."""
+    """Draws all pipes in one blits call from cached pipe bodies."""
+    batch = []
     for bottom_pipe, top_pipe, color, passed in pipes:
-        pygame.draw.rect(screen, color, bottom_pipe)
-        pygame.draw.rect(screen, color, top_pipe)
+        batch += sprites.pipe_blits(color, (bottom_pipe, top_pipe), SCREEN_HEIGHT)
+    screen.blits(batch, False)
 
 
 # --- Collision Function ---
@@ -212,6 +213,25 @@ def check_collision(bird, pipes, land_rect):
     return False
 
 
+# --- Autopilot ---
+def autopilot_flap(autopilot, bird, pipes):
+    """Asks the autopilot whether to flap, aiming at the next gap ahead."""
+    for bottom_pipe, top_pipe, color, passed in pipes:
+        if bottom_pipe.right >= bird.rect.left:
+            return autopilot.decide(
+                bird.y, bird.velocity, bird.rect.height / 2, top_pipe.bottom, bottom_pipe.top
+            )
+    return autopilot.decide(bird.y, bird.velocity, bird.rect.height / 2)
+
+
+def draw_autopilot(screen, autopilot, font, demo):
+    """Draws the autopilot label and what it costs per frame."""
+    label = "DEMO" if demo else "ASSIST (A to turn off)"
+    text = f"{label}  autopilot {autopilot.last * 1000:.3f} ms"
+    text_surface = font.render(text, True, BLACK)
+    screen.blit(text_surface, (10, 10))
+
+
 # --- Text Display Functions ---
 def draw_score(screen, score, font):
     """Draws the current score."""
@@ -264,10 +284,74 @@ def draw_game_over(screen, score, best_score, font_large, font_small):
     screen.blit(quit_surface, quit_rect)
 
 
+def draw_frame(screen):
+    """Draws the frame under the HUD from the game's state."""
+    # Background
+    screen.fill(background_color)
+
+    if game_active:
+        # Draw pipes
+        draw_pipes(screen, pipes)
+
+        # Draw Bird
+        bird.draw(screen)
+
+        # Draw Score
+        draw_score(screen, score, score_font)
+
+        if demo_mode:
+            # Initial instructions over the demo
+            start_text = "Press SPACE to Start"
+            start_surface = game_over_font_small.render(start_text, True, BLACK)
+            start_rect = start_surface.get_rect(
+                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+            )
+            screen.blit(start_surface, start_rect)
+
+            quit_text = "Press Q or ESC to Quit"
+            quit_surface = game_over_font_small.render(quit_text, True, BLACK)
+            quit_rect = quit_surface.get_rect(
+                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
+            )
+            screen.blit(quit_surface, quit_rect)
+
+            assist_text = "A during play toggles autopilot assist"
+            assist_surface = hud_font.render(assist_text, True, BLACK)
+            assist_rect = assist_surface.get_rect(
+                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 95)
+            )
+            screen.blit(assist_surface, assist_rect)
+
+        if demo_mode or assist:
+            draw_autopilot(screen, autopilot, hud_font, demo_mode)
+
+    else:  # Game Over Screen
+        bird.draw(screen)  # Show the bird where it died (or reset position)
+        draw_game_over(
+            screen, score, best_score, game_over_font_large, game_over_font_small
+        )
+
+    # Draw Land (always visible)
+    pygame.draw.rect(screen, land_color, land_rect)
+    # Draw a thin black line above the land for definition
+    pygame.draw.line(
+        screen,
+        BLACK,
+        (0, SCREEN_HEIGHT - LAND_HEIGHT),
+        (SCREEN_WIDTH, SCREEN_HEIGHT - LAND_HEIGHT),
+        2,
+    )
+
+
 # --- Game Setup ---
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Flappy Clone")
 clock = pygame.time.Clock()
+sprites = SpriteCache()
+hud = PerfHud()  # F3 toggles the performance overlay
+inputs = TimedInput()
+stepper = FixedStep(fps=RENDER_FPS)
+presses = []  # times of SPACE presses not yet applied (FLAPPY_SUBSTEP)
 
 # Fonts
 score_font = pygame.font.Font(None, 40)  # Font for score
@@ -275,15 +359,23 @@ game_over_font_large = pygame.font.Font(None, 70)  # Font for "GAME OVER"
 game_over_font_small = pygame.font.Font(
     None, 40
 )  # Font for scores/instructions on game over
+hud_font = pygame.font.Font(None, 24)  # Font for the autopilot label
 
 # Game Variables
 bird = Bird()
 pipes = []  # List to store tuples: (bottom_rect, top_rect, color, passed_flag)
 score = 0
 best_score = 0
-game_active = False
+game_active = True  # The start screen plays a demo game
 running = True
-first_game = True  # To prevent showing "Game Over" on the very first screen
+demo_mode = True  # Autopilot plays until SPACE is pressed
+assist = False  # Autopilot flaps for the player while playing
+autopilot = Autopilot(
+    VARIANTS["gemini-2.5"].with_params(
+        gravity=GRAVITY, flap=-FLAP_STRENGTH, max_up=MAX_UP_VELOCITY
+    ),
+    budget_ms=AUTOPILOT_BUDGET_MS,
+)
 
 # Timers
 pipe_timer = pygame.USEREVENT + 1
@@ -298,22 +390,32 @@ land_rect = pygame.Rect(0, SCREEN_HEIGHT - LAND_HEIGHT, SCREEN_WIDTH, LAND_HEIGH
 # --- Main Game Loop ---
 while running:
     # --- Event Handling ---
-    for event in pygame.event.get():
+    events = inputs.take() if SUBSTEP else [(None, e) for e in pygame.event.get()]
+    for stamp, event in events:
         if event.type == pygame.QUIT:
             running = False
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                 running = False
+            if event.key == pygame.K_a and game_active and not demo_mode:
+                assist = not assist
+            if event.key == pygame.K_F3:
+                hud.toggle()
             if event.key == pygame.K_SPACE:
-                if game_active:
-                    bird.flap()
+                if game_active and not demo_mode:
+                    if SUBSTEP:
+                        presses.append(stamp)
+                    else:
+                        bird.flap()
                 else:
                     # Restart Game
                     game_active = True
-                    first_game = False
+                    demo_mode = False
                     pipes.clear()
                     bird.reset()
                     score = 0
+                    presses.clear()
+                    stepper.reset()
                     # Choose new random colors for the new game
                     background_color = get_random_light_color()
                     land_color = get_random_land_color()
@@ -326,83 +428,69 @@ while running:
             )  # Add new pipe data with passed_flag=False
 
     # --- Game Logic ---
+    hud.mark("update")
     if game_active:
-        # Bird movement
-        bird.update()
-
-        # Pipe movement and removal
-        pipes = move_pipes(pipes)
-
-        # Collision detection
-        if check_collision(bird, pipes, land_rect):
-            game_active = False
-            if score > best_score:
-                best_score = score
-
-        # Score update
-        for i in range(len(pipes)):
-            bottom_pipe, top_pipe, color, passed = pipes[i]
-            # Check if bird has passed the pipe's center AND hasn't been scored yet
-            if not passed and bottom_pipe.centerx < bird.x:
-                score += 1
-                # Mark this pipe pair as passed
-                pipes[i] = (bottom_pipe, top_pipe, color, True)
-                # print(f"Score: {score}") # Debugging score
+        # One tick per frame, or as many fixed ticks as are due with FLAPPY_SUBSTEP
+        for start, end in stepper.ticks() if SUBSTEP else [(None, None)]:
+            flaps = []
+            if SUBSTEP:
+                flaps, presses = split(presses, start, end)
+
+            # Autopilot flaps before the bird moves, like a key press would
+            if (demo_mode or assist) and autopilot_flap(autopilot, bird, pipes):
+                bird.flap()
+
+            # Bird movement
+            bird.update(flaps)
+
+            # Pipe movement and removal
+            pipes = move_pipes(pipes)
+
+            # Collision detection
+            if check_collision(bird, pipes, land_rect):
+                if demo_mode:
+                    # Keep the demo going with a fresh bird
+                    pipes.clear()
+                    bird.reset()
+                    score = 0
+                else:
+                    game_active = False
+                    if score > best_score:
+                        best_score = score
+
+            # Score update
+            for i in range(len(pipes)):
+                bottom_pipe, top_pipe, color, passed = pipes[i]
+                # Check if bird has passed the pipe's center AND hasn't been scored yet
+                if not passed and bottom_pipe.centerx < bird.x:
+                    score += 1
+                    # Mark this pipe pair as passed
+                    pipes[i] = (bottom_pipe, top_pipe, color, True)
+                    # print(f"Score: {score}") # Debugging score
+
+            if not game_active:
+                break
 
     # --- Drawing ---
-    # Background
-    screen.fill(background_color)
-
-    if game_active:
-        # Draw pipes
-        draw_pipes(screen, pipes)
-
-        # Draw Bird
-        bird.draw(screen)
-
-        # Draw Score
-        draw_score(screen, score, score_font)
-
-    else:  # Game Over Screen or Initial Screen
-        # Draw Bird (idle) only if it's not the very first launch screen
-        if not first_game:
-            bird.draw(screen)  # Show the bird where it died (or reset position)
-            draw_game_over(
-                screen, score, best_score, game_over_font_large, game_over_font_small
-            )
-        else:
-            # Initial instructions
-            start_text = "Press SPACE to Start"
-            start_surface = game_over_font_small.render(start_text, True, BLACK)
-            start_rect = start_surface.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-            )
-            screen.blit(start_surface, start_rect)
+    hud.mark("draw")
+    draw_frame(screen)
 
-            quit_text = "Press Q or ESC to Quit"
-            quit_surface = game_over_font_small.render(quit_text, True, BLACK)
-            quit_rect = quit_surface.get_rect(
-                center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
-            )
-            screen.blit(quit_surface, quit_rect)
-
-    # Draw Land (always visible)
-    pygame.draw.rect(screen, land_color, land_rect)
-    # Draw a thin black line above the land for definition
-    pygame.draw.line(
-        screen,
-        BLACK,
-        (0, SCREEN_HEIGHT - LAND_HEIGHT),
-        (SCREEN_WIDTH, SCREEN_HEIGHT - LAND_HEIGHT),
-        2,
-    )
+    # Performance HUD over everything else
+    hud.draw(screen, len(pipes))
 
     # Update display
     pygame.display.flip()
+    hud.presented()
 
     # Cap framerate
-    clock.tick(60)
+    if SUBSTEP:
+        stepper.wait(inputs)
+    else:
+        clock.tick(60)
 
 # --- Cleanup ---
+if autopilot.decisions:
+    print(autopilot.stats())
+hud.close()
 pygame.quit()
 sys.exit()
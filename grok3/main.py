@@ -2,6 +2,12 @@ import pygame
 import random
 import platform
 import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.hud import PerfHud
+from flappybench.sprites import SpriteCache, bird_pos
 
 pygame.init()
 
@@ -12,6 +18,7 @@ FPS = 60
 land_height = 50
 land_rect = pygame.Rect(0, SCREEN_HEIGHT - land_height, SCREEN_WIDTH, land_height)
 font = pygame.font.SysFont(None, 36)
+sprites = SpriteCache()  # pre-rendered birds and pipes; colors change every restart
 
 
 def generate_light_color():
@@ -49,17 +56,11 @@ class Bird:
         self.rect.center = (self.x, self.y)
 
     def draw(self, screen):
+        sprite = sprites.bird(self.shape, self.size, self.color)
         if self.shape == "square":
-            pygame.draw.rect(screen, self.color, self.rect)
-        elif self.shape == "circle":
-            pygame.draw.circle(screen, self.color, (self.x, self.y), self.size // 2)
-        elif self.shape == "triangle":
-            points = [
-                (self.x - self.size // 2, self.y + self.size // 2),
-                (self.x + self.size // 2, self.y + self.size // 2),
-                (self.x, self.y - self.size // 2),
-            ]
-            pygame.draw.polygon(screen, self.color, points)
+            screen.blit(sprite, self.rect)  # the rect's center rounds y, bird_pos truncates
+        else:
+            screen.blit(sprite, bird_pos(self.x, self.y, self.size))
 
 
 class Pipe:
@@ -83,9 +84,8 @@ class Pipe:
         self.top_rect.x = self.x
         self.bottom_rect.x = self.x
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, self.top_rect)
-        pygame.draw.rect(screen, self.color, self.bottom_rect)
+    def blits(self):
+        return sprites.pipe_blits(self.color, (self.top_rect, self.bottom_rect), SCREEN_HEIGHT)
 
     def off_screen(self):
         return self.x < -self.width
@@ -102,6 +102,7 @@ class Game:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Flappy Bird-like Game")
         self.clock = pygame.time.Clock()
+        self.hud = PerfHud()  # F3 toggles the performance overlay
         self.reset()
 
     def reset(self):
@@ -119,6 +120,8 @@ class Game:
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.hud.toggle()
                 if not self.game_over:
                     if event.key == pygame.K_SPACE:
                         self.bird.flap()
@@ -133,33 +136,41 @@ class Game:
         return True
 
     def update(self):
+        self.hud.mark("update")
         if not self.game_over:
             self.bird.update()
-            for pipe in self.pipes[:]:
-                pipe.update()
-                if pipe.check_passed(self.bird.x):
-                    self.score += 1
-            if (
-                self.bird.rect.top <= 0
-                or self.bird.rect.colliderect(land_rect)
-                or any(
-                    self.bird.rect.colliderect(pipe.top_rect)
-                    or self.bird.rect.colliderect(pipe.bottom_rect)
-                    for pipe in self.pipes
-                )
-            ):
+            self.move_pipes()
+            if self.collided():
                 self.game_over = True
-            self.pipes = [pipe for pipe in self.pipes if not pipe.off_screen()]
             self.spawn_counter -= 1
             if self.spawn_counter <= 0:
                 self.pipes.append(Pipe(SCREEN_WIDTH))
                 self.spawn_counter = random.randint(50, 100)
 
+    def move_pipes(self):
+        for pipe in self.pipes[:]:
+            pipe.update()
+            if pipe.check_passed(self.bird.x):
+                self.score += 1
+        # off-screen pipes are well left of the bird, so dropping them first can't miss a hit
+        self.pipes = [pipe for pipe in self.pipes if not pipe.off_screen()]
+
+    def collided(self):
+        return (
+            self.bird.rect.top <= 0
+            or self.bird.rect.colliderect(land_rect)
+            or any(
+                self.bird.rect.colliderect(pipe.top_rect)
+                or self.bird.rect.colliderect(pipe.bottom_rect)
+                for pipe in self.pipes
+            )
+        )
+
     def draw(self):
+        self.hud.mark("draw")
         self.screen.fill(self.background_color)
         pygame.draw.rect(self.screen, self.land_color, land_rect)
-        for pipe in self.pipes:
-            pipe.draw(self.screen)
+        self.screen.blits([entry for pipe in self.pipes for entry in pipe.blits()], False)
         self.bird.draw(self.screen)
         score_text = font.render(f"Score: {self.score}", True, (0, 0, 0))
         self.screen.blit(score_text, (SCREEN_WIDTH - score_text.get_width() - 10, 10))
@@ -176,7 +187,9 @@ class Game:
                     SCREEN_HEIGHT // 2 - game_over_text.get_height() // 2,
                 ),
             )
+        self.hud.draw(self.screen, len(self.pipes))
         pygame.display.flip()
+        self.hud.presented()
 
 
 async def main():
@@ -187,6 +200,7 @@ async def main():
         game.update()
         game.draw()
         await asyncio.sleep(1.0 / FPS)
+    game.hud.close()
     pygame.quit()
 
 
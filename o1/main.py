@@ -1,7 +1,11 @@
 import pygame
+import os
 import sys
 import random
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.sprites import SpriteCache, bird_pos
+
 pygame.init()
 
 # ------------------
@@ -12,6 +16,7 @@ FPS = 60
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("o1")
 clock = pygame.time.Clock()
+sprites = SpriteCache()  # pre-rendered birds and pipes; colors change every restart
 
 # ------------------
 # Helper functions
@@ -70,20 +75,9 @@ def create_bird_shape():
 def draw_bird(screen, shape_type, color, x, y, size=20):
     """
     Draws the bird on the screen given shape_type, color, position, and size.
+    The shape is rasterized once per shape, size and color and then blitted.
     """
-    if shape_type == 'square':
-        pygame.draw.rect(screen, color, (x - size//2, y - size//2, size, size))
-    elif shape_type == 'circle':
-        pygame.draw.circle(screen, color, (x, y), size//2)
-    elif shape_type == 'triangle':
-        # Draw an upward-pointing triangle
-        # Coordinates of triangle's vertices
-        points = [
-            (x, y - size//2),           # top
-            (x - size//2, y + size//2), # bottom-left
-            (x + size//2, y + size//2)  # bottom-right
-        ]
-        pygame.draw.polygon(screen, color, points)
+    screen.blit(sprites.bird(shape_type, size, color), bird_pos(x, y, size))
 
 def generate_pipe_pair(pipe_x):
     """
@@ -102,6 +96,24 @@ def generate_pipe_pair(pipe_x):
     bottom_rect = pygame.Rect(pipe_x, bottom_y, PIPE_WIDTH, bottom_height)
     return top_rect, bottom_rect, pipe_color
 
+def update_bird(bird_y, bird_velocity, gravity):
+    """
+    Applies one frame of gravity.
+    Returns the new (bird_y, bird_velocity).
+    """
+    bird_velocity += gravity
+    return bird_y + bird_velocity, bird_velocity
+
+def move_pipes(pipes):
+    """
+    Moves every pipe pair left by PIPE_SPEED, in place.
+    """
+    for i in range(len(pipes)):
+        top_rect, bottom_rect, color = pipes[i]
+        top_rect.x -= PIPE_SPEED
+        bottom_rect.x -= PIPE_SPEED
+        pipes[i] = (top_rect, bottom_rect, color)
+
 def check_collision(bird_rect, pipes):
     """
     Checks if the bird_rect collides with any pipe rects or the land.
@@ -118,11 +130,34 @@ def check_collision(bird_rect, pipes):
 
 def draw_pipes(screen, pipes):
     """
-    Draws the pipe pairs on the screen.
+    Draws the pipe pairs on the screen, all in one blits call.
     """
+    batch = []
     for (top_rect, bottom_rect, pipe_color) in pipes:
-        pygame.draw.rect(screen, pipe_color, top_rect)
-        pygame.draw.rect(screen, pipe_color, bottom_rect)
+        batch += sprites.pipe_blits(pipe_color, (top_rect, bottom_rect), HEIGHT)
+    screen.blits(batch, False)
+
+def draw_frame(screen, background_color, land_color, pipes, bird_shape, bird_color, bird_x, bird_y, bird_size, score):
+    """
+    Draws everything but the game over text: background, pipes, bird,
+    land with the "o1" text over it, and the score in the top-right.
+    """
+    screen.fill(background_color)
+    
+    # Draw pipes
+    draw_pipes(screen, pipes)
+    
+    # Draw bird
+    draw_bird(screen, bird_shape, bird_color, bird_x, int(bird_y), bird_size)
+    
+    # Draw land at the bottom
+    pygame.draw.rect(screen, land_color, (0, HEIGHT - LAND_HEIGHT, WIDTH, LAND_HEIGHT))
+    
+    # Draw "o1" text overlaying the floor
+    draw_text(screen, "o1", 30, (0, 0, 0), 10, HEIGHT - LAND_HEIGHT + 5)
+    
+    # Draw score in top-right
+    draw_text(screen, f"Score: {score}", 30, (0, 0, 0), WIDTH - 10, 10, align_right=True)
 
 def draw_text(screen, text, size, color, x, y, align_right=False):
     """
@@ -214,15 +249,10 @@ def main():
             # -------------
             if game_active:
                 # Bird movement
-                bird_velocity += gravity
-                bird_y += bird_velocity
+                bird_y, bird_velocity = update_bird(bird_y, bird_velocity, gravity)
                 
                 # Move pipes
-                for i in range(len(pipes)):
-                    top_rect, bottom_rect, color = pipes[i]
-                    top_rect.x -= PIPE_SPEED
-                    bottom_rect.x -= PIPE_SPEED
-                    pipes[i] = (top_rect, bottom_rect, color)
+                move_pipes(pipes)
                 
                 # If the leftmost pipe is off screen, pop it and add a new one
                 if pipes[0][0].right < 0:
@@ -255,22 +285,8 @@ def main():
             # -------------
             # Drawing
             # -------------
-            screen.fill(background_color)
-            
-            # Draw pipes
-            draw_pipes(screen, pipes)
-            
-            # Draw bird
-            draw_bird(screen, bird_shape, bird_color, bird_x, int(bird_y), bird_size)
-            
-            # Draw land at the bottom
-            pygame.draw.rect(screen, land_color, (0, HEIGHT - LAND_HEIGHT, WIDTH, LAND_HEIGHT))
-            
-            # Draw "o1" text overlaying the floor
-            draw_text(screen, "o1", 30, (0, 0, 0), 10, HEIGHT - LAND_HEIGHT + 5)
-            
-            # Draw score in top-right
-            draw_text(screen, f"Score: {score}", 30, (0, 0, 0), WIDTH - 10, 10, align_right=True)
+            draw_frame(screen, background_color, land_color, pipes,
+                       bird_shape, bird_color, bird_x, bird_y, bird_size, score)
             
             # If game is over, show best score
             if not game_active:
@@ -1,7 +1,13 @@
 import pygame
+import os
 import random
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.snapshot import SnapshotRing
+from flappybench.sprites import SpriteCache, bird_pos
+from flappybench.view import View
+
 # -------- Constants -------- #
 WIDTH, HEIGHT = 400, 600
 FPS = 60
@@ -15,6 +21,13 @@ PIPE_GAP = 150  # vertical gap between top and bottom pipe
 
 LAND_HEIGHT = 50  # height of the land at the bottom
 
+REWIND_SECONDS = 2  # how far BACKSPACE jumps back
+
+# Pre-rendered bird and pipe sprites (colors change every restart)
+sprites = SpriteCache()
+# Drawing happens at FLAPPY_INTERNAL times the game's size (full size by default)
+view = View((WIDTH, HEIGHT))
+
 # Land colors: dark brown or a yellowish tone.
 LAND_COLORS = [
     (101, 67, 33),   # dark brown
@@ -60,18 +73,14 @@ class Bird:
         self.rect.center = (self.x, self.y)
     
     def draw(self, screen):
+        size = view.length(self.size)
+        sprite = sprites.bird(self.shape, size, self.color)
         if self.shape == "square":
-            pygame.draw.rect(screen, self.color, self.rect)
-        elif self.shape == "circle":
-            pygame.draw.circle(screen, self.color, (self.x, int(self.y)), self.size // 2)
-        elif self.shape == "triangle":
-            half = self.size // 2
-            points = [
-                (self.x, self.y - half),           # top point
-                (self.x - half, self.y + half),      # bottom left
-                (self.x + half, self.y + half)       # bottom right
-            ]
-            pygame.draw.polygon(screen, self.color, points)
+            x, y = self.rect.topleft  # the rect's center rounds y, bird_pos truncates
+            screen.blit(sprite, view.pos(x, y))
+        else:
+            x, y = view.pos(self.x, self.y)
+            screen.blit(sprite, bird_pos(x, y, size))
 
 class Pipe:
     def __init__(self, x):
@@ -84,18 +93,30 @@ class Pipe:
         # Choose a random color for this pipe pair.
         self.color = random.choice(PIPE_COLORS)
         self.passed = False  # to mark when the bird has successfully passed it
+
+    @classmethod
+    def restored(cls, x, gap_y, color, passed):
+        """A pipe from snapshot fields, without drawing from the RNG."""
+        pipe = cls.__new__(cls)
+        pipe.x = x
+        pipe.width = PIPE_WIDTH
+        pipe.gap = PIPE_GAP
+        pipe.gap_y = gap_y
+        pipe.color = color
+        pipe.passed = passed
+        return pipe
     
     def update(self):
         self.x -= PIPE_SPEED
     
-    def draw(self, screen):
+    def blits(self):
+        """Blit entries for both pipe bodies, drawn from the sprite cache."""
         # Top pipe: from the top of the screen to gap_y.
-        top_rect = pygame.Rect(self.x, 0, self.width, self.gap_y)
+        top = (self.x, 0, self.width, self.gap_y)
         # Bottom pipe: from gap_y + gap to just above the land.
-        bottom_rect = pygame.Rect(self.x, self.gap_y + self.gap, self.width,
-                                  HEIGHT - LAND_HEIGHT - (self.gap_y + self.gap))
-        pygame.draw.rect(screen, self.color, top_rect)
-        pygame.draw.rect(screen, self.color, bottom_rect)
+        bottom = (self.x, self.gap_y + self.gap, self.width,
+                  HEIGHT - LAND_HEIGHT - (self.gap_y + self.gap))
+        return sprites.pipe_blits(self.color, (view.rect(*top), view.rect(*bottom)), view.size[1])
     
     def get_rects(self):
         """Return the two pygame.Rect objects for collision checking."""
@@ -106,8 +127,24 @@ class Pipe:
 
 def draw_land(screen, land_color):
     """Draw the ground (land) at the bottom."""
-    land_rect = pygame.Rect(0, HEIGHT - LAND_HEIGHT, WIDTH, LAND_HEIGHT)
-    pygame.draw.rect(screen, land_color, land_rect)
+    pygame.draw.rect(screen, land_color, view.rect(0, HEIGHT - LAND_HEIGHT, WIDTH, LAND_HEIGHT))
+
+def draw_game(screen, font, bird, pipes, score, background_color, land_color):
+    """Draw the frame under the game over text: sky, pipes, bird, land and score."""
+    screen.fill(background_color)
+    screen.blits([entry for pipe in pipes for entry in pipe.blits()], False)
+    bird.draw(screen)
+    draw_land(screen, land_color)
+    
+    # Overlay text on the floor: "o3-mini-high"
+    floor_text = font.render("o3-mini-high", True, (255, 255, 255))  # white text
+    floor_text_rect = floor_text.get_rect(center=view.pos(WIDTH // 2, HEIGHT - LAND_HEIGHT // 2))
+    screen.blit(floor_text, floor_text_rect)
+    
+    # Draw current score (top right).
+    score_text = font.render(f"Score: {score}", True, (0, 0, 0))
+    score_rect = score_text.get_rect(topright=view.pos(WIDTH - 10, 10))
+    screen.blit(score_text, score_rect)
 
 def reset_game(first=False):
     """
@@ -123,18 +160,41 @@ def reset_game(first=False):
     pipe_gap_offset = random.randint(200, 300)
     return bird, pipes, score, background_color, land_color, pipe_gap_offset
 
+def snapshot_game(history, frame, bird, pipes, score, best_score, game_over, pipe_gap_offset):
+    """Push the current frame onto the rewind buffer."""
+    history.push(frame, bird.y, bird.vel, bird.shape, bird.color, not game_over,
+                 score, best_score,
+                 [(p.x, p.gap_y, p.gap_y + p.gap, p.color, p.passed) for p in pipes],
+                 pipe_gap_offset)
+
+def restore_game(snap, bird):
+    """Put the bird back where the snapshot has it and rebuild the pipes.
+
+    Returns the pipes, the score and the spawn distance to the next pipe.
+    """
+    bird.y = snap.y
+    bird.vel = snap.velocity
+    bird.shape = snap.shape
+    bird.color = snap.color
+    bird.rect.center = (bird.x, bird.y)
+    pipes = [Pipe.restored(x, gap_top, color, passed)
+             for x, gap_top, gap_bottom, color, passed in snap.pipes]
+    return pipes, snap.score, snap.extra
+
 # -------- Main Game Loop -------- #
 def main():
     pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = view.open()
     pygame.display.set_caption("o3-mini-high")
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 36)
+    font = pygame.font.SysFont(None, view.length(36))
     
     best_score = 0
     # Initialize game state (first game uses light blue background)
     bird, pipes, score, background_color, land_color, pipe_gap_offset = reset_game(first=True)
     game_over = False
+    history = SnapshotRing(seconds=10, fps=FPS)
+    frame = 0
 
     while True:
         # --- Event Handling --- #
@@ -148,8 +208,16 @@ def main():
                     if game_over:
                         bird, pipes, score, background_color, land_color, pipe_gap_offset = reset_game()
                         game_over = False
+                        history.clear()
+                        frame = 0
                     else:
                         bird.flap()
+                # BACKSPACE: jump back a couple of seconds, even after dying.
+                if event.key == pygame.K_BACKSPACE and history:
+                    snap = history.rewind(REWIND_SECONDS * FPS)
+                    pipes, score, pipe_gap_offset = restore_game(snap, bird)
+                    frame = snap.frame
+                    game_over = False
                 # Quit on q or Esc.
                 if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                     pygame.quit()
@@ -189,32 +257,21 @@ def main():
             
             if score > best_score:
                 best_score = score
+
+            frame += 1
+            snapshot_game(history, frame, bird, pipes, score, best_score, game_over, pipe_gap_offset)
         
         # --- Drawing --- #
-        screen.fill(background_color)
-        for pipe in pipes:
-            pipe.draw(screen)
-        bird.draw(screen)
-        draw_land(screen, land_color)
-        
-        # Overlay text on the floor: "o3-mini-high"
-        floor_text = font.render("o3-mini-high", True, (255, 255, 255))  # white text
-        floor_text_rect = floor_text.get_rect(center=(WIDTH // 2, HEIGHT - LAND_HEIGHT // 2))
-        screen.blit(floor_text, floor_text_rect)
-        
-        # Draw current score (top right).
-        score_text = font.render(f"Score: {score}", True, (0, 0, 0))
-        score_rect = score_text.get_rect(topright=(WIDTH - 10, 10))
-        screen.blit(score_text, score_rect)
+        draw_game(screen, font, bird, pipes, score, background_color, land_color)
         
         # If game over, display game over and best score messages.
         if game_over:
             go_text = font.render("Game Over!", True, (255, 0, 0))
             bs_text = font.render(f"Best Score: {best_score}", True, (255, 0, 0))
             restart_text = font.render("Press SPACE to Restart", True, (255, 0, 0))
-            screen.blit(go_text, go_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30)))
-            screen.blit(bs_text, bs_text.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
-            screen.blit(restart_text, restart_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 30)))
+            screen.blit(go_text, go_text.get_rect(center=view.pos(WIDTH // 2, HEIGHT // 2 - 30)))
+            screen.blit(bs_text, bs_text.get_rect(center=view.pos(WIDTH // 2, HEIGHT // 2)))
+            screen.blit(restart_text, restart_text.get_rect(center=view.pos(WIDTH // 2, HEIGHT // 2 + 30)))
         
         pygame.display.flip()
         clock.tick(FPS)
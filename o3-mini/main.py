@@ -1,8 +1,13 @@
 # Game Setup
+import os
 import pygame
 import random
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.events import Input
+from flappybench.sprites import SpriteCache, bird_pos
+
 # Initialize pygame
 pygame.init()
 
@@ -14,6 +19,7 @@ pygame.display.set_caption('o3-mini')
 
 clock = pygame.time.Clock()
 FONT = pygame.font.SysFont('Arial', 24)
+sprites = SpriteCache()  # pre-rendered birds and pipes; colors change every restart
 
 # Colors
 LIGHT_BLUE = (173, 216, 230)  # Starting background color
@@ -48,19 +54,14 @@ def create_bird():
             'vel': 0}
 
 
+def update_bird(bird):
+    bird['vel'] += GRAVITY
+    bird['y'] += bird['vel']
+
+
 def draw_bird(bird):
-    if bird['shape'] == 'square':
-        pygame.draw.rect(screen, bird['color'], (bird['x'] - bird['size']//2, bird['y'] - bird['size']//2, bird['size'], bird['size']))
-    elif bird['shape'] == 'circle':
-        pygame.draw.circle(screen, bird['color'], (bird['x'], bird['y']), bird['size']//2)
-    elif bird['shape'] == 'triangle':
-        half = bird['size'] // 2
-        points = [
-            (bird['x'], bird['y'] - half),
-            (bird['x'] - half, bird['y'] + half),
-            (bird['x'] + half, bird['y'] + half)
-        ]
-        pygame.draw.polygon(screen, bird['color'], points)
+    sprite = sprites.bird(bird['shape'], bird['size'], bird['color'])
+    screen.blit(sprite, bird_pos(bird['x'], bird['y'], bird['size']))
 
 # Pipe functions
 def create_pipe_pair():
@@ -75,12 +76,16 @@ def create_pipe_pair():
     return pipe
 
 
-def draw_pipes(pipe):
-    # Top pipe: from top to gap_y
-    pygame.draw.rect(screen, pipe['color'], (pipe['x'], 0, PIPE_WIDTH, pipe['gap_y']))
-    # Bottom pipe: from gap_y + PIPE_GAP to ground top
-    bottom_pipe_height = SCREEN_HEIGHT - GROUND_HEIGHT - (pipe['gap_y'] + PIPE_GAP)
-    pygame.draw.rect(screen, pipe['color'], (pipe['x'], pipe['gap_y'] + PIPE_GAP, PIPE_WIDTH, bottom_pipe_height))
+def draw_pipes(pipes):
+    batch = []
+    for pipe in pipes:
+        # Top pipe: from top to gap_y
+        top = (pipe['x'], 0, PIPE_WIDTH, pipe['gap_y'])
+        # Bottom pipe: from gap_y + PIPE_GAP to ground top
+        bottom_pipe_height = SCREEN_HEIGHT - GROUND_HEIGHT - (pipe['gap_y'] + PIPE_GAP)
+        bottom = (pipe['x'], pipe['gap_y'] + PIPE_GAP, PIPE_WIDTH, bottom_pipe_height)
+        batch += sprites.pipe_blits(pipe['color'], (top, bottom), SCREEN_HEIGHT)
+    screen.blits(batch, False)  # all pipes in one call
 
 
 def move_pipes(pipes, speed):
@@ -89,6 +94,13 @@ def move_pipes(pipes, speed):
     # Remove pipes that are out of screen
     return [pipe for pipe in pipes if pipe['x'] + PIPE_WIDTH > 0]
 
+def check_pipe_collision(bird, pipe):
+    # Bird against the top and the bottom pipe
+    bird_rect = pygame.Rect(bird['x'] - bird['size']//2, bird['y'] - bird['size']//2, bird['size'], bird['size'])
+    top_pipe_rect = pygame.Rect(pipe['x'], 0, PIPE_WIDTH, pipe['gap_y'])
+    bottom_pipe_rect = pygame.Rect(pipe['x'], pipe['gap_y'] + PIPE_GAP, PIPE_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT - (pipe['gap_y'] + PIPE_GAP))
+    return bird_rect.colliderect(top_pipe_rect) or bird_rect.colliderect(bottom_pipe_rect)
+
 # Land
 LAND_COLOR = random.choice(LAND_COLORS)
 
@@ -111,6 +123,13 @@ def display_game_over(current_score, best_score):
     text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
     screen.blit(game_over_text, text_rect)
 
+def draw_game(background_color, bird, pipes, score):
+    screen.fill(background_color)
+    draw_bird(bird)
+    draw_pipes(pipes)
+    draw_land()
+    display_score(score)
+
 # Main game loop
 
 def main_game():
@@ -127,37 +146,46 @@ def main_game():
     PIPE_EVENT = pygame.USEREVENT + 1
     pygame.time.set_timer(PIPE_EVENT, PIPE_FREQUENCY)
 
+    # Event handlers; only these event types are let into the queue
+    def quit_game(event):
+        pygame.quit()
+        sys.exit()
+
+    def space(event):
+        nonlocal bird, pipes, score, background_color, game_active
+        global LAND_COLOR
+        if game_active:
+            # Accelerate the bird: pressing SPACE multiple times accelerates the bird upward
+            bird['vel'] = FLAP_STRENGTH
+        else:
+            # Restarting game
+            bird = create_bird()
+            pipes = []
+            score = 0
+            # Change background color randomly from light shades on restart
+            background_color = random.choice(LIGHT_SHADES)
+            # Also choose new land color
+            LAND_COLOR = random.choice(LAND_COLORS)
+            game_active = True
+
+    def spawn_pipe(event):
+        if game_active:
+            pipes.append(create_pipe_pair())
+
+    inputs = Input()
+    inputs.on(pygame.QUIT, quit_game)
+    inputs.on_key(pygame.K_SPACE, space)
+    inputs.on_key(pygame.K_q, quit_game)
+    inputs.on_key(pygame.K_ESCAPE, quit_game)
+    inputs.on(PIPE_EVENT, spawn_pipe)
+    inputs.allow()
+
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    if game_active:
-                        # Accelerate the bird: pressing SPACE multiple times accelerates the bird upward
-                        bird['vel'] = FLAP_STRENGTH
-                    else:
-                        # Restarting game
-                        bird = create_bird()
-                        pipes = []
-                        score = 0
-                        # Change background color randomly from light shades on restart
-                        background_color = random.choice(LIGHT_SHADES)
-                        # Also choose new land color
-                        global LAND_COLOR
-                        LAND_COLOR = random.choice(LAND_COLORS)
-                        game_active = True
-                if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-            if event.type == PIPE_EVENT and game_active:
-                pipes.append(create_pipe_pair())
+        inputs.dispatch()
 
         if game_active:
             # Update bird
-            bird['vel'] += GRAVITY
-            bird['y'] += bird['vel']
+            update_bird(bird)
 
             # Collision with ground
             if bird['y'] + bird['size'] // 2 > SCREEN_HEIGHT - GROUND_HEIGHT or bird['y'] - bird['size'] // 2 < 0:
@@ -169,11 +197,7 @@ def main_game():
 
             # Check collision with pipes and increase score if passed
             for pipe in pipes:
-                # Check collision with top pipe
-                bird_rect = pygame.Rect(bird['x'] - bird['size']//2, bird['y'] - bird['size']//2, bird['size'], bird['size'])
-                top_pipe_rect = pygame.Rect(pipe['x'], 0, PIPE_WIDTH, pipe['gap_y'])
-                bottom_pipe_rect = pygame.Rect(pipe['x'], pipe['gap_y'] + PIPE_GAP, PIPE_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT - (pipe['gap_y'] + PIPE_GAP))
-                if bird_rect.colliderect(top_pipe_rect) or bird_rect.colliderect(bottom_pipe_rect):
+                if check_pipe_collision(bird, pipe):
                     game_active = False
                     best_score = max(best_score, score)
                 # Increase score: when bird passes the center of the pipe
@@ -182,15 +206,10 @@ def main_game():
                     pipe['scored'] = True
 
         # Draw everything
-        screen.fill(background_color)
-        
         if game_active:
-            draw_bird(bird)
-            for pipe in pipes:
-                draw_pipes(pipe)
-            draw_land()
-            display_score(score)
+            draw_game(background_color, bird, pipes, score)
         else:
+            screen.fill(background_color)
             draw_land()
             display_game_over(score, best_score)
 
@@ -1,4 +1,7 @@
-import pygame, sys, random
+import pygame, os, sys, random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.sprites import SpriteCache, bird_pos
 
 # ─── Constants ─────────────────────────────────────────────────────────────────
 WIDTH, HEIGHT = 400, 600
@@ -16,6 +19,7 @@ DARK_COLORS = [
 PIPE_COLORS = [(0, 100, 0), (181, 101, 29), (64, 64, 64)]
 LAND_COLORS = [(101, 67, 33), (218, 165, 32)]
 LIGHT_SHADE_RANGE = (180, 255)
+sprites = SpriteCache()  # pre-rendered birds and pipes; colors change every restart
 
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
@@ -38,22 +42,8 @@ class Bird:
         self.y += self.vel
 
     def draw(self, surf):
-        if self.shape == "circle":
-            pygame.draw.circle(
-                surf, self.color, (int(self.x), int(self.y)), self.size // 2
-            )
-        elif self.shape == "square":
-            rect = pygame.Rect(
-                self.x - self.size // 2, self.y - self.size // 2, self.size, self.size
-            )
-            pygame.draw.rect(surf, self.color, rect)
-        else:  # triangle
-            points = [
-                (self.x, self.y - self.size // 2),
-                (self.x - self.size // 2, self.y + self.size // 2),
-                (self.x + self.size // 2, self.y + self.size // 2),
-            ]
-            pygame.draw.polygon(surf, self.color, points)
+        sprite = sprites.bird(self.shape, self.size, self.color)
+        surf.blit(sprite, bird_pos(self.x, self.y, self.size))
 
     def jump(self):
         self.vel = JUMP_STRENGTH * 1.2  # accelerate more if pressed repeatedly
@@ -80,9 +70,20 @@ class Pipe:
         self.x -= PIPE_SPEED
         self.top.x = self.bot.x = self.x
 
-    def draw(self, surf):
-        pygame.draw.rect(surf, self.color, self.top)
-        pygame.draw.rect(surf, self.color, self.bot)
+    def blits(self):
+        return sprites.pipe_blits(self.color, (self.top, self.bot), HEIGHT)
+
+
+# ─── Drawing ─────────────────────────────────────────────────────────────────
+def draw_game(screen, font, bird, pipes, score, bg_color, land_color):
+    screen.fill(bg_color)
+    screen.blits([entry for p in pipes for entry in p.blits()], False)
+    pygame.draw.rect(screen, land_color, (0, HEIGHT - 40, WIDTH, 40))
+    bird.draw(screen)
+
+    # Score
+    score_surf = font.render(f"Score: {score}", True, (0, 0, 0))
+    screen.blit(score_surf, (WIDTH - score_surf.get_width() - 10, 10))
 
 
 # ─── Main Game ────────────────────────────────────────────────────────────────
@@ -157,15 +158,7 @@ def main():
                 best_score = max(best_score, score)
 
         # ─── Draw ────────────────────────────────────────────────────────────────
-        screen.fill(bg_color)
-        for p in pipes:
-            p.draw(screen)
-        pygame.draw.rect(screen, land_color, (0, HEIGHT - 40, WIDTH, 40))
-        bird.draw(screen)
-
-        # Score
-        score_surf = font.render(f"Score: {score}", True, (0, 0, 0))
-        screen.blit(score_surf, (WIDTH - score_surf.get_width() - 10, 10))
+        draw_game(screen, font, bird, pipes, score, bg_color, land_color)
 
         if not playing:
             msg = font.render(f"Game Over! Best: {best_score}", True, (0, 0, 0))
@@ -1,8 +1,16 @@
 import pygame
+import os
 import sys
 import random
 import math
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flappybench.hud import PerfHud
+from flappybench.replay import Ghost, InputLog
+from flappybench.scroll import ScrollRenderer
+from flappybench.snapshot import SnapshotRing
+from flappybench.sprites import SpriteCache, bird_pos
+
 # Initialize pygame
 pygame.init()
 pygame.font.init()
@@ -16,6 +24,9 @@ PIPE_WIDTH = 70
 PIPE_GAP = 200
 PIPE_SPEED = 3
 GROUND_HEIGHT = 80
+REWIND_SECONDS = 2  # how far BACKSPACE jumps back
+GHOST_ALPHA = 90
+GHOST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ghosts")
 FONT = pygame.font.SysFont("Arial", 30)
 FONT_LARGE = pygame.font.SysFont("Arial", 50)
 
@@ -47,6 +58,17 @@ WHITE = (255, 255, 255)
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Flappy Bird Clone")
 clock = pygame.time.Clock()
+sprites = SpriteCache()
+hud = PerfHud()  # F3 toggles the performance overlay
+
+
+def bird_state(bird):
+    return (bird.y, bird.velocity, bird.alive)
+
+
+def set_bird_state(bird, state):
+    bird.y, bird.velocity, alive = state
+    bird.alive = bool(alive)
 
 
 # Game variables
@@ -85,26 +107,8 @@ class Bird:
             self.velocity = 0
 
     def draw(self):
-        if self.shape == "square":
-            pygame.draw.rect(
-                screen,
-                self.color,
-                (self.x - BIRD_SIZE / 2, self.y - BIRD_SIZE / 2, BIRD_SIZE, BIRD_SIZE),
-            )
-        elif self.shape == "circle":
-            pygame.draw.circle(
-                screen, self.color, (int(self.x), int(self.y)), BIRD_SIZE // 2
-            )
-        elif self.shape == "triangle":
-            pygame.draw.polygon(
-                screen,
-                self.color,
-                [
-                    (self.x, self.y - BIRD_SIZE / 2),
-                    (self.x - BIRD_SIZE / 2, self.y + BIRD_SIZE / 2),
-                    (self.x + BIRD_SIZE / 2, self.y + BIRD_SIZE / 2),
-                ],
-            )
+        sprite = sprites.bird(self.shape, BIRD_SIZE, self.color)
+        return screen.blit(sprite, bird_pos(self.x, self.y, BIRD_SIZE))
 
     def check_collision(self, pipes):
         if not self.alive:
@@ -151,23 +155,54 @@ class Bird:
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # With a seed every run gets the same pipes and races the best run so far
+        self.seed = seed
+        self.ghost_path = os.path.join(GHOST_DIR, f"seed-{seed}.json")
+        self.best_run = InputLog.load(self.ghost_path) if seed is not None else None
+        # FLAPPY_RENDER=scroll scrolls last frame instead of redrawing the scene
+        self.scroller = None
+        if os.environ.get("FLAPPY_RENDER") == "scroll":
+            self.scroller = ScrollRenderer(screen, PIPE_SPEED, self.draw_scene)
+        self.history = SnapshotRing(seconds=10, fps=FPS)
         self.reset()
 
     def reset(self):
         self.bird = Bird()
         self.pipes = []
+        self.spawned = 0  # pipes added this run; seeds the next one's height
         self.score = 0
         self.best_score = self.best_score if hasattr(self, "best_score") else 0
         self.add_pipe()
         self.game_active = True
+        self.frame = 0
+        self.history.clear()
+        self.log = InputLog(self.seed)
+        self.log.start(bird_state(self.bird))
+        self.ghost = None
+        if self.best_run is not None:
+            ghost_bird = Bird()
+            self.ghost = Ghost(self.best_run, ghost_bird, bird_state, set_bird_state)
+            self.ghost_sprite = sprites.bird(
+                ghost_bird.shape, BIRD_SIZE, ghost_bird.color, GHOST_ALPHA
+            )
         self.background_color = (
             random_light_color() if random.random() > 0.5 else LIGHT_BLUE
         )
         self.ground_color = random.choice([DARK_BROWN, YELLOW])
+        self.scrolled = False
+        if self.scroller is not None:
+            self.scroller.invalidate()
+
+    def pipe_rng(self):
+        """The seeded course's next pipe comes from (seed, pipe index) alone, so a rewind can't shift it."""
+        if self.seed is None:
+            return random
+        return random.Random(f"{self.seed}:pipe-{self.spawned}")
 
     def add_pipe(self):
-        pipe_height = random.randint(100, HEIGHT - GROUND_HEIGHT - PIPE_GAP - 100)
+        pipe_height = self.pipe_rng().randint(100, HEIGHT - GROUND_HEIGHT - PIPE_GAP - 100)
+        self.spawned += 1
         pipe_color = random.choice([DARK_GREEN, LIGHT_BROWN, DARK_GRAY])
         self.pipes.append(
             {
@@ -178,13 +213,77 @@ class Game:
             }
         )
 
+    def flap(self):
+        self.log.flap(self.frame)
+        self.bird.flap()
+
+    def snapshot(self):
+        self.history.push(
+            self.frame,
+            self.bird.y,
+            self.bird.velocity,
+            self.bird.shape,
+            self.bird.color,
+            self.bird.alive,
+            self.score,
+            self.best_score,
+            [
+                (p["x"], p["height"], p["height"] + PIPE_GAP, p["color"], p["passed"])
+                for p in self.pipes
+            ],
+            self.spawned,
+        )
+
+    def rewind(self, seconds=REWIND_SECONDS):
+        if not self.history:
+            return
+        snap = self.history.rewind(int(seconds * FPS))
+        self.frame = snap.frame
+        self.log.truncate(snap.frame)
+        self.bird.y = snap.y
+        self.bird.velocity = snap.velocity
+        self.bird.shape = snap.shape
+        self.bird.color = snap.color
+        self.bird.alive = snap.alive
+        self.score = snap.score
+        self.spawned = snap.extra
+        self.pipes = [
+            {"x": x, "height": top, "color": color, "passed": passed}
+            for x, top, bottom, color, passed in snap.pipes
+        ]
+        self.game_active = True
+        if self.scroller is not None:
+            self.scroller.invalidate()
+
     def update(self):
+        self.scrolled = False
         if not self.game_active:
             return
 
+        self.frame += 1
         self.bird.update()
+        self.log.tick(bird_state(self.bird), self.score)
+        if self.ghost is not None:
+            self.ghost.update(self.frame)
 
         # Update pipes and check for score
+        self.scrolled = True
+        self.move_pipes()
+
+        # Add new pipes
+        if len(self.pipes) == 0 or self.pipes[-1]["x"] < WIDTH - 300:
+            self.add_pipe()
+
+        # Check for collisions
+        if self.bird.check_collision(self.pipes):
+            self.game_active = False
+            if self.score > self.best_score:
+                self.best_score = self.score
+            self.save_ghost()
+
+        self.snapshot()
+
+    def move_pipes(self):
         for pipe in self.pipes:
             pipe["x"] -= PIPE_SPEED
 
@@ -196,49 +295,55 @@ class Game:
         # Remove pipes that are off screen
         self.pipes = [pipe for pipe in self.pipes if pipe["x"] + PIPE_WIDTH > 0]
 
-        # Add new pipes
-        if len(self.pipes) == 0 or self.pipes[-1]["x"] < WIDTH - 300:
-            self.add_pipe()
-
-        # Check for collisions
-        if self.bird.check_collision(self.pipes):
-            self.game_active = False
-            if self.score > self.best_score:
-                self.best_score = self.score
+    def save_ghost(self):
+        if self.seed is None:
+            return
+        if self.best_run is None or self.score > self.best_run.score:
+            self.log.score = self.score
+            self.log.save(self.ghost_path)
+            self.best_run = InputLog.from_dict(self.log.to_dict())
 
-    def draw(self):
+    def draw_scene(self, surface):
+        """Background, pipes and ground: everything that scrolls."""
         # Draw background
-        screen.fill(self.background_color)
+        surface.fill(self.background_color)
 
-        # Draw pipes
+        # Draw pipes, all in one blits call
+        batch = []
         for pipe in self.pipes:
-            # Top pipe
-            pygame.draw.rect(
-                screen, pipe["color"], (pipe["x"], 0, PIPE_WIDTH, pipe["height"])
-            )
-            # Bottom pipe
-            pygame.draw.rect(
-                screen,
-                pipe["color"],
-                (
-                    pipe["x"],
-                    pipe["height"] + PIPE_GAP,
-                    PIPE_WIDTH,
-                    HEIGHT - pipe["height"] - PIPE_GAP - GROUND_HEIGHT,
-                ),
+            top = (pipe["x"], 0, PIPE_WIDTH, pipe["height"])
+            bottom = (
+                pipe["x"],
+                pipe["height"] + PIPE_GAP,
+                PIPE_WIDTH,
+                HEIGHT - pipe["height"] - PIPE_GAP - GROUND_HEIGHT,
             )
+            batch += sprites.pipe_blits(pipe["color"], (top, bottom), HEIGHT)
+        surface.blits(batch, False)
 
         # Draw ground
         pygame.draw.rect(
-            screen, self.ground_color, (0, HEIGHT - GROUND_HEIGHT, WIDTH, GROUND_HEIGHT)
+            surface, self.ground_color, (0, HEIGHT - GROUND_HEIGHT, WIDTH, GROUND_HEIGHT)
         )
 
-        # Draw bird
-        self.bird.draw()
+    def draw(self):
+        if self.scroller is not None:
+            self.scroller.frame(self.scrolled)
+        else:
+            self.draw_scene(screen)
+        drawn = []
+
+        # Draw ghost of the best run, then the bird
+        if self.ghost is not None and not self.ghost.finished:
+            drawn.append(screen.blit(
+                self.ghost_sprite,
+                bird_pos(self.ghost.bird.x, self.ghost.bird.y, BIRD_SIZE),
+            ))
+        drawn.append(self.bird.draw())
 
         # Draw score
         score_text = FONT.render(f"Score: {self.score}", True, BLACK)
-        screen.blit(score_text, (WIDTH - score_text.get_width() - 20, 20))
+        drawn.append(screen.blit(score_text, (WIDTH - score_text.get_width() - 20, 20)))
 
         # If game is over, show best score and restart instructions
         if not self.game_active:
@@ -247,33 +352,48 @@ class Game:
             restart_text = FONT.render(
                 "Press SPACE to restart or Q/ESC to quit", True, BLACK
             )
+            rewind_text = FONT.render("BACKSPACE to rewind", True, BLACK)
 
-            screen.blit(
+            drawn.append(screen.blit(
                 game_over_text,
                 (
                     WIDTH // 2 - game_over_text.get_width() // 2,
                     HEIGHT // 3 - game_over_text.get_height() // 2,
                 ),
-            )
-            screen.blit(
+            ))
+            drawn.append(screen.blit(
                 best_score_text,
                 (
                     WIDTH // 2 - best_score_text.get_width() // 2,
                     HEIGHT // 2 - best_score_text.get_height() // 2,
                 ),
-            )
-            screen.blit(
+            ))
+            drawn.append(screen.blit(
                 restart_text,
                 (
                     WIDTH // 2 - restart_text.get_width() // 2,
                     HEIGHT // 2 + restart_text.get_height(),
                 ),
-            )
+            ))
+            drawn.append(screen.blit(
+                rewind_text,
+                (
+                    WIDTH // 2 - rewind_text.get_width() // 2,
+                    HEIGHT // 2 + restart_text.get_height() * 2,
+                ),
+            ))
+
+        # Performance HUD over everything else
+        drawn.append(hud.draw(screen, len(self.pipes)))
+
+        if self.scroller is not None:
+            self.scroller.drawn(drawn)
 
 
 # Main game loop
 def main():
-    game = Game()
+    seed = os.environ.get("FLAPPY_SEED")
+    game = Game(seed=int(seed) if seed else None)
 
     running = True
     while running:
@@ -284,24 +404,37 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     if game.game_active:
-                        game.bird.flap()
+                        game.flap()
                     else:
                         game.reset()
+                elif event.key == pygame.K_BACKSPACE:
+                    game.rewind()
+                elif event.key == pygame.K_F3:
+                    hud.toggle()
                 elif event.key in (pygame.K_q, pygame.K_ESCAPE):
                     running = False
 
         # Update game state
+        hud.mark("update")
         game.update()
 
         # Draw everything
+        hud.mark("draw")
         game.draw()
 
         # Update the display
         pygame.display.flip()
+        hud.presented()
 
         # Cap the frame rate
         clock.tick(FPS)
 
+    if game.ghost is not None and game.ghost.frames:
+        print(
+            f"ghost cost: mean {game.ghost.mean_ms:.3f} ms, "
+            f"worst {game.ghost.worst_ms:.3f} ms over {game.ghost.frames} frames"
+        )
+    hud.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,53 @@
+"""Benchmark, allocation and Sim parity gates for the variants, run headless.
+
+    python -m pytest tests
+    python -m pytest tests --update-baselines   # after an intended change
+
+Baselines and allocation budgets live next to the tests as JSON. Timings are
+scaled by ``flappybench.hotpaths.calibrate()``, so they carry across machines.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from flappybench import hotpaths
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-baselines", action="store_true",
+                     help="record this run as the new baselines instead of checking against them")
+    parser.addoption("--bench-threshold", type=float,
+                     help=f"allowed slowdown for every path (default {hotpaths.THRESHOLD})")
+
+
+@pytest.fixture(scope="session")
+def updating(request):
+    return request.config.getoption("--update-baselines")
+
+
+@pytest.fixture(scope="session")
+def threshold(request):
+    return request.config.getoption("--bench-threshold")
+
+
+@pytest.fixture(scope="session")
+def calibration():
+    return hotpaths.calibrate()
+
+
+@pytest.fixture(scope="session")
+def measured():
+    """(timings, calls) per variant, measured on first use."""
+    cache = {}
+
+    def get(name):
+        if name not in cache:
+            cache[name] = hotpaths.measure(name)
+        return cache[name]
+    return get
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from flappybench import allocs, probe
+
+BUDGETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "allocations.json")
+FRAMES = 120
+
+
+@pytest.fixture(scope="session")
+def budgets(updating):
+    data = allocs.load(BUDGETS)
+    yield data
+    if updating:
+        allocs.save(BUDGETS, data)
+
+
+@pytest.mark.parametrize("name", list(probe.PROBES))
+def test_allocation_budget(name, budgets, updating):
+    profile = allocs.profile(name, frames=FRAMES)
+    if updating:
+        budgets[name] = allocs.budget(profile)
+        return
+    if name not in budgets:
+        pytest.skip(f"no allocation budget for {name}; run with --update-baselines")
+    problems = allocs.over_budget(profile, budgets[name])
+    assert not problems, f"{name} allocates more per frame: " + "; ".join(problems)
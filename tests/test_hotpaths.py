@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from flappybench import hotpaths
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hotpaths.json")
+
+
+@pytest.fixture(scope="session")
+def baselines(updating, calibration):
+    data = hotpaths.load(BASELINES)
+    yield data
+    if updating:
+        data["calibration_us"] = calibration
+        hotpaths.save(BASELINES, data)
+
+
+@pytest.mark.parametrize("path", hotpaths.PATHS + ("startup",))
+@pytest.mark.parametrize("name", list(hotpaths.ADAPTERS))
+def test_hot_path(name, path, measured, baselines, calibration, updating, threshold):
+    results, calls = measured(name)
+    us = results[path]
+    if updating:
+        baselines["variants"].setdefault(name, {})[path] = us
+        return
+    base = baselines["variants"].get(name, {}).get(path)
+    if base is None:
+        pytest.skip(f"no baseline for {name} {path}; run with --update-baselines")
+    scale = calibration / baselines["calibration_us"]
+    limit = hotpaths.allowed(base, path, scale, threshold)
+    if us > limit and path in calls:
+        us = min(us, hotpaths.best(calls[path]))  # one more try before calling it a regression
+    assert us <= limit, (f"{name} {path} regressed: {hotpaths.fmt(us).strip()}"
+                         f" against {hotpaths.fmt(base * scale).strip()} (limit {hotpaths.fmt(limit).strip()})")
@@ -0,0 +1,192 @@
+"""``Sim`` against the real main.py of every variant.
+
+Each variant is played headless by the autopilot, and the SPACE presses
+each frame saw are replayed through a ``Sim``. The game's gaps and spawn
+times come from its own RNG, so before every step the Sim's pipes are set
+to the game's; everything else — bird y and velocity, pipe movement,
+collisions, scoring and the frame the game ends — has to match frame for
+frame.
+
+``Swarm`` and ``VecSim`` are checked the same way against one ``Sim`` per
+bird or game, and the courses ``reach`` checks against the pipes a ``Sim``
+actually lays out.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from flappybench.autopilot import Autopilot
+from flappybench.harness import Harness
+from flappybench.probe import PROBES
+from flappybench.reach import course
+from flappybench.sim import Pipe, Sim
+from flappybench.soak import VirtualClock, accelerated
+from flappybench.swarm import Swarm, threshold_bots
+from flappybench.variants import VARIANTS, parse
+from flappybench.vecsim import VecSim, threshold
+
+FRAMES = 900
+
+
+def _shape(name, local):
+    """The bird's shape, for the variants whose hitbox depends on it."""
+    if name == "gemini-2.5":
+        return local["bird"].shape
+    if name == "sonnet-3.7":
+        return local["game"].bird.shape
+    return None
+
+
+def play(name, frames=FRAMES, seed=0):
+    """[(presses, State, shape)] per frame of one autopiloted round."""
+    variant = VARIANTS[name]
+    harness = Harness(name)
+    pilot = Autopilot(variant)
+    half = variant.hitboxes["square"][3] / 2
+    rows = []
+
+    def on_frame(frame):
+        state = frame.state
+        was_playing = bool(rows) and rows[-1][1] is not None and rows[-1][1].playing
+        rows.append((frame.presses, state, _shape(name, harness.caller.f_locals) if state else None))
+        if frame.index == 0:
+            harness.press()  # o1 and gemini-2.5 wait for SPACE
+        elif state is not None and state.playing:
+            ahead = state.ahead(1)
+            gap = ahead[0][1:] if ahead else (None, None)
+            if pilot.decide(state.y, state.vel, half, *gap):
+                harness.press()
+        ended = was_playing and state is not None and not state.playing
+        if (ended or frame.index >= frames) and not harness.stopping:
+            harness.stop()
+
+    harness.frame_hooks.append(on_frame)
+    random.seed(seed)
+    with accelerated(VirtualClock()):
+        harness.run()
+    return rows
+
+
+def _sync(sim, pipes):
+    """Gives the Sim the game's pipes, keeping the ones it already has."""
+    have = {p.x: p for p in sim.pipes}
+    synced = []
+    for x, top, bottom in pipes:
+        p = have.get(x) or Pipe(-1, x, top, bottom)
+        p.gap_top, p.gap_bottom = top, bottom
+        synced.append(p)
+    sim.pipes = synced
+
+
+@pytest.mark.parametrize("name", list(PROBES))
+def test_sim_matches_game(name):
+    v = VARIANTS[name]
+    rows = play(name)
+    start = next(i for i, (_, s, _) in enumerate(rows) if s is not None and s.playing)
+    _, first, shape = rows[start]
+    sim = Sim(v, shape=shape)
+    sim.y, sim.vel, sim.score = float(first.y), float(first.vel), first.score
+    _sync(sim, first.pipes)
+    for i, p in enumerate(sim.pipes):
+        if sim.score_line(p) < v.bird_x:
+            p.passed = True
+            sim.passed_indices.add(i)
+
+    for frame in range(start + 1, len(rows)):
+        presses, state, _ = rows[frame]
+        _sync(sim, rows[frame - 1][1].pipes)
+        carried = list(sim.pipes)
+        sim.step(presses > 0)
+        xs = {x for x, _, _ in state.pipes}
+        moved = [p.x for p in carried if p in sim.pipes and p.x not in xs]
+        assert not moved, f"{name} frame {frame}: Sim moved pipes to x={moved}, game has {sorted(xs)}"
+        got = (round(sim.y, 6), round(sim.vel, 6), sim.score, not sim.over)
+        want = (round(float(state.y), 6), round(float(state.vel), 6), state.score, state.playing)
+        assert got == want, f"{name} frame {frame}: Sim (y, vel, score, playing) {got}, game {want}"
+        if not state.playing:
+            break
+    assert frame - start >= 100, f"{name}: only {frame - start} frames compared"
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("name", list(VARIANTS))
+def test_swarm_matches_sim(name, seed, birds=24, frames=900):
+    swarm = Swarm(VARIANTS[name], seed, birds)
+    bots = threshold_bots(swarm, np.random.default_rng(seed))
+    sims = [Sim(VARIANTS[name], seed) for _ in range(birds)]
+    for frame in range(1, frames + 1):
+        flap = bots()
+        swarm.step(flap)
+        for i, sim in enumerate(sims):
+            if not sim.alive:
+                continue
+            sim.step(bool(flap[i]))
+            got = (round(swarm.y[i], 6), round(swarm.vel[i], 6), int(swarm.score[i]), bool(swarm.alive[i]))
+            want = (round(sim.y, 6), round(sim.vel, 6), sim.score, sim.alive)
+            assert got == want, f"{name} seed {seed} bird {i} frame {frame}: swarm {got}, Sim {want}"
+        if not swarm.alive.any():
+            break
+
+
+# VecSim leaves out o1's scoring by list index (see Sim._score), so o1's
+# scores differ; without the quirk everything else has to match
+_NO_INDEX_QUIRK = "o1 without score_by_index"
+_VECSIM_CASES = [
+    pytest.param(name, marks=pytest.mark.xfail(strict=True, reason="VecSim doesn't score by list index"))
+    if "score_by_index" in VARIANTS[name].quirks else name
+    for name in VARIANTS
+] + [_NO_INDEX_QUIRK]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("name", _VECSIM_CASES)
+def test_vecsim_matches_sim(name, seed, games=24, frames=900):
+    if name == _NO_INDEX_QUIRK:
+        o1 = VARIANTS["o1"]
+        variant = o1.with_params(quirks=o1.quirks - {"score_by_index"})
+    else:
+        variant = VARIANTS[name]
+    seeds = seed * 1000 + np.arange(games)
+    vecsim = VecSim(variant, seeds, max_frames=frames)
+    policy = threshold(np.random.default_rng(seed).uniform(-10, 30, games))
+    sims = [Sim(variant, int(s)) for s in seeds]
+    for frame in range(1, frames + 1):
+        flap = policy(vecsim)
+        vecsim.step(flap)
+        for i, sim in enumerate(sims):
+            if not sim.alive:
+                continue
+            sim.step(bool(flap[i]))
+            got = (round(vecsim.y[i], 6), round(vecsim.vel[i], 6), int(vecsim.score[i]), bool(vecsim.alive[i]))
+            want = (round(sim.y, 6), round(sim.vel, 6), sim.score, sim.alive)
+            assert got == want, f"{name} seed {seed} game {i} frame {frame}: VecSim {got}, Sim {want}"
+        if not vecsim.alive.any():
+            break
+
+
+def _sim_spacing(variant, seed, pipes):
+    """Frames between consecutive pipes of a ``Sim``'s course, the way ``reach.course`` counts them."""
+    sim = Sim(variant, seed)
+    spawned = {}  # pipe id -> x it would have at frame 0
+    frame = 0
+    while len(spawned) < pipes:
+        for p in sim.pipes:
+            spawned.setdefault(p.id, p.x + frame * variant.pipe_speed)
+        sim._move_pipes()
+        frame += 1
+    xs = [spawned[i] for i in range(pipes)]
+    gaps = [b - a for a, b in zip(xs, xs[1:])]
+    if variant.spawn == "chain":
+        return [math.ceil(d / variant.pipe_speed) for d in gaps]
+    return [d // variant.pipe_speed for d in gaps]
+
+
+@pytest.mark.parametrize("spec", list(VARIANTS) + ["o1:spawn_distance=(150,300)", "sonnet-3.7:spawn_distance=(300,450)"])
+def test_reach_course_matches_sim(spec, pipes=12):
+    variant = parse(spec)
+    for seed in range(3):
+        _, spacing, _ = course(variant, seed, pipes)
+        assert spacing == _sim_spacing(variant, seed, pipes), f"{spec} seed {seed}"
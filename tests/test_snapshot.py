@@ -0,0 +1,58 @@
+"""The packed snapshot format and the ring buffer the rewinds read from."""
+
+from flappybench.snapshot import MAX_PIPES, RECORD_SIZE, SnapshotRing, pack_into, unpack_from
+
+
+def _fields(snap):
+    return (snap.frame, snap.y, snap.velocity, snap.shape, snap.color, snap.alive,
+            snap.score, snap.best, snap.pipes, snap.extra)
+
+
+def test_snapshot_round_trip():
+    pipes = [
+        (412, 130, 280, (0, 100, 0), False),
+        (-38, 95, 245, (139, 69, 19), True),
+    ]
+    # y and velocity are stored as float32; these are exact in it
+    frame = (1234, 187.5, -7.25, "triangle", (250, 200, 10), True, 17, 42, pipes, 31)
+    buf = bytearray(2 * RECORD_SIZE)
+    pack_into(buf, RECORD_SIZE, *frame)
+    assert _fields(unpack_from(buf, RECORD_SIZE)) == frame
+
+
+def test_snapshot_keeps_max_pipes():
+    pipes = [(600 - 80 * i, 100, 250, (i, i, i), i % 2 == 1) for i in range(MAX_PIPES + 3)]
+    buf = bytearray(RECORD_SIZE)
+    pack_into(buf, 0, 5, 240.0, 0.0, "circle", (1, 2, 3), False, 0, 0, pipes)
+    assert unpack_from(buf, 0).pipes == pipes[:MAX_PIPES]
+
+
+def _push(ring, frame):
+    ring.push(frame, float(frame), 0.5, "square", (1, 2, 3), True, frame // 10, 0,
+              [(frame, 100, 250, (4, 5, 6), False)], frame)
+
+
+def test_rewind_after_wrap():
+    ring = SnapshotRing(seconds=1, fps=10)
+    last = 2 * ring.capacity + 3
+    for frame in range(last + 1):
+        _push(ring, frame)
+    assert len(ring) == ring.capacity
+    for n in (0, 1, 4, ring.capacity - 1):
+        assert ring.peek(n).frame == last - n
+    snap = ring.rewind(4)
+    assert (snap.frame, snap.y, snap.extra, snap.pipes[0][0]) == (last - 4, last - 4, last - 4, last - 4)
+    assert len(ring) == ring.capacity - 4
+    assert ring.peek().frame == last - 4
+
+
+def test_rewind_past_oldest_stops_there():
+    ring = SnapshotRing(seconds=1, fps=10)
+    last = ring.capacity + 6
+    for frame in range(last + 1):
+        _push(ring, frame)
+    assert ring.rewind(10 * ring.capacity).frame == last - ring.capacity + 1
+    assert len(ring) == 1
+    # Pushing after a rewind overwrites the dropped frames
+    _push(ring, 99)
+    assert [ring.peek(n).frame for n in range(2)] == [99, last - ring.capacity + 1]
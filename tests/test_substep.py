@@ -0,0 +1,73 @@
+"""Flaps at their press time: ``integrate`` and ``FixedStep`` at any frame rate."""
+
+import types
+
+import pytest
+
+from flappybench import substep
+from flappybench.substep import FixedStep, integrate, split
+
+# gemini-2.5's physics, the variant FLAPPY_SUBSTEP is for
+GRAVITY = 0.25
+
+
+def flapped(vel):
+    return max(vel - 0.6, -6)
+
+
+def test_flap_at_fraction_zero_is_a_flap_before_the_tick():
+    for y, vel in ((240.0, 0.0), (312.5, 3.75), (100.0, -5.8)):
+        v = flapped(vel) + GRAVITY
+        assert integrate(y, vel, GRAVITY, [0.0], flapped) == (y + v, v)
+        v = flapped(flapped(vel)) + GRAVITY
+        assert integrate(y, vel, GRAVITY, [0.0, 0.0], flapped) == (y + v, v)
+
+
+def test_no_flaps_is_a_whole_tick():
+    assert integrate(240.0, 1.5, GRAVITY, [], flapped) == (240.0 + 1.75, 1.75)
+
+
+def test_flap_at_end_of_tick_is_a_flap_after_it():
+    y, vel = integrate(240.0, 1.5, GRAVITY, [1.0], flapped)
+    assert (y, vel) == (240.0 + 1.75, flapped(1.75))
+
+
+@pytest.mark.parametrize("f", [0.25, 0.5, 0.9, 0.999])
+def test_split_without_flap_is_close_to_a_whole_tick(f):
+    # Splitting the Euler step at f moves the bird g*f*(1 - f) px less than
+    # a whole tick (at most g/4 px at mid-tick, 0.0625 px for gemini-2.5),
+    # shrinking to nothing towards the end of the tick; velocity is the same
+    y, vel = integrate(240.0, 1.5, GRAVITY, [f], lambda v: v)
+    whole_y, whole_vel = integrate(240.0, 1.5, GRAVITY, [], flapped)
+    assert vel == pytest.approx(whole_vel)
+    assert whole_y - y == pytest.approx(GRAVITY * f * (1 - f))
+    assert whole_y - y <= GRAVITY / 4
+
+
+# Bursts of presses, some inside one tick, none on a frame or tick boundary
+PRESSES = [0.105, 0.109, 0.113, 0.402, 0.405, 0.71, 0.9013, 0.957, 1.3104, 1.316, 1.3217, 1.64]
+
+
+def play(fps, monkeypatch, seconds=2.0):
+    """Renders at ``fps`` with presses arriving at PRESSES; returns each tick's (start, y, vel)."""
+    clock = [0.0]
+    monkeypatch.setattr(substep, "time", types.SimpleNamespace(perf_counter=lambda: clock[0]))
+    stepper = FixedStep(rate=60, fps=fps)
+    y, vel = 240.0, 0.0
+    presses, trajectory = [], []
+    for frame in range(round(seconds * fps) + 1):
+        last, clock[0] = clock[0] if frame else -1.0, frame / fps
+        # What TimedInput has picked up by the time the frame starts
+        presses += [t for t in PRESSES if last < t <= clock[0]]
+        for start, end in stepper.ticks():
+            flaps, presses = split(presses, start, end)
+            y, vel = integrate(y, vel, GRAVITY, flaps, flapped)
+            trajectory.append((start, y, vel))
+    return trajectory
+
+
+def test_same_trajectory_at_any_frame_rate(monkeypatch):
+    at_60 = play(60, monkeypatch)
+    assert len(at_60) >= 119
+    for fps in (30, 144):
+        assert play(fps, monkeypatch) == at_60, f"{fps} fps"